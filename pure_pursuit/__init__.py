@@ -0,0 +1,64 @@
+"""
+Pure pursuit for an omnidirectional FTC robot: the path, the robot's kinematics, following the path,
+and (only if it's used) drawing all of it with matplotlib.
+
+Importing the package only loads numpy, the visualization is imported the first time one of its names is used,
+so headless scripts start fast and never touch matplotlib.
+"""
+# --------------- HEADLESS --------------- #
+# the path and its waypoints
+from .path import (Waypoint, Path, PathGeometry, WaypointArray, WaypointView, WAYPOINT_DTYPE, path,
+                   convert_to_list, load_waypoints, save_waypoints)
+
+# the robot physics and running them without a window
+from .kinematics import (RobotModel, STATE_FIELDS, INTEGRATORS, arc_displacement, clothoid_displacement, arc_step,
+                         interpolate_states)
+from .simulation import Simulator, FixedRateLoop
+from .batch import BatchSimulator
+
+# following the path
+from .spline import SplinePath, SplineGeometry
+from .lookahead import LookaheadEngine, SegmentGrid
+from .follower import PurePursuit, BatchPurePursuit
+from .velocity_profile import VelocityProfile
+
+# saving runs and playing them back
+from .recording import TrajectoryRecorder, TrajectoryReader, TrajectoryPlayer
+
+# streaming the state to other processes, only imported when it's first used (asyncio takes a while to import)
+_LAZY_HEADLESS = {"TelemetryBridge": "telemetry", "TelemetryClient": "telemetry"}
+
+# the field's obstacles and checking the robot against them
+from .field import FieldMap, FOOTPRINTS
+
+# autonomous routines compiled into trajectories and cached
+from .routine import Routine, RoutineCache, ROUTINE_FIELDS
+
+# editing waypoints without recalculating the whole path
+from .editing import PathEditor
+
+# --------------- VISUALIZATION --------------- #
+
+# name -> the module it's in, these are only imported when they're first used (they need matplotlib)
+_LAZY = {"Animation": "animate", "Robot": "animate", "updateFrame": "animate",
+         "RobotDrawing": "rendering", "DrawnPath": "rendering", "DrawnField": "rendering",
+         "Trail": "trail"}
+
+
+def __getattr__(name):
+    if name in _LAZY_HEADLESS:
+        from importlib import import_module
+        return getattr(import_module(f".{_LAZY_HEADLESS[name]}", __name__), name)
+    if name in _LAZY:
+        from importlib import import_module
+        return getattr(import_module(f".visualization.{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["Waypoint", "Path", "PathGeometry", "WaypointArray", "WaypointView", "WAYPOINT_DTYPE", "path",
+           "convert_to_list", "load_waypoints", "save_waypoints", "RobotModel", "STATE_FIELDS", "INTEGRATORS",
+           "arc_displacement", "clothoid_displacement", "arc_step", "interpolate_states",
+           "Simulator", "FixedRateLoop", "BatchSimulator", "SplinePath", "SplineGeometry", "LookaheadEngine",
+           "SegmentGrid", "PurePursuit", "BatchPurePursuit", "VelocityProfile", "TrajectoryRecorder",
+           "TrajectoryReader", "TrajectoryPlayer", "FieldMap", "FOOTPRINTS", "Routine", "RoutineCache",
+           "ROUTINE_FIELDS", "PathEditor", *_LAZY_HEADLESS, *_LAZY]
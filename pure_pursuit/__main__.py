@@ -0,0 +1,23 @@
+# --------------- MAIN --------------- #
+# python -m pure_pursuit <command> [arguments], every command is the main() of one of the modules
+import sys
+from importlib import import_module
+
+# command -> the module whose main() runs it
+COMMANDS = {"animate": ".visualization.animate", "simulate": ".simulation", "render": ".visualization.export",
+            "benchmark": ".benchmark", "sweep": ".sweep", "telemetry": ".telemetry", "field": ".field",
+            "routine": ".routine"}
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        exit(f"usage: python -m pure_pursuit {{{','.join(COMMANDS)}}} [arguments]")
+
+    # so each command's argparse sees its own arguments and name
+    command = sys.argv.pop(1)
+    sys.argv[0] = f"pure_pursuit {command}"
+    import_module(COMMANDS[command], "pure_pursuit").main()
+
+
+if __name__ == "__main__":
+    main()
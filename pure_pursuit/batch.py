@@ -0,0 +1,187 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy (this whole file is numpy)
+import numpy as np
+
+# the single robot version and the order the states are stored in
+from .kinematics import RobotModel, STATE_FIELDS, INTEGRATORS, arc_step
+
+# --------------- CLASSES --------------- #
+
+
+class BatchSimulator:
+    """
+    Simulates a lot of robots at once.
+
+    Instead of a list of RobotModel objects, every variable is one numpy array with an entry per robot
+    (struct of arrays), so one step moves all of the robots with the same math as RobotModel.step.
+    """
+
+    # the parameters that can be different for every robot
+    PARAMETERS = ("MAX_VELOCITY", "MAX_ACCELERATION", "MAX_TURN_VELOCITY", "MAX_TURN_ACCELERATION")
+
+    def __init__(self, count: int, x=0.0, y=0.0, heading=0.0, MAX_VELOCITY=20.0, MAX_ACCELERATION=1.0,
+                 MAX_TURN_VELOCITY=3.35, MAX_TURN_ACCELERATION=1.0, velocity=10.0, turn_velocity=3.35,
+                 velocity_angle=0.0, paths: list | None = None, path_ids=None, dt: float = 1 / 200,
+                 controller=None, integrator: str = "euler"):
+        """
+        Every robot argument can be a single number (shared by all of the robots) or an array of length count.
+        Args:
+            count: how many robots there are
+            x, y, heading, velocity, turn_velocity, velocity_angle: initial states like RobotModel
+            MAX_VELOCITY, MAX_ACCELERATION, MAX_TURN_VELOCITY, MAX_TURN_ACCELERATION: the limits of each robot
+            paths: the different paths the robots can follow (a BatchPurePursuit controller follows them)
+            path_ids: which path in paths each robot follows
+            dt: the timestep in seconds
+            controller: something called as controller(batch) before every step to set the acceleration arrays,
+                        if it has a finished(batch) method, robots where it returns True stop being simulated
+            integrator: "euler" or "arc", like RobotModel
+        """
+        if count < 1:
+            raise ValueError("there has to be at least one robot")
+        if dt <= 0:
+            raise ValueError("dt has to be positive")
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"integrator has to be one of {INTEGRATORS}")
+
+        self.count = count
+        self.integrator = integrator
+        self.dt = dt
+        self.controller = controller
+
+        def column(value):
+            # every variable is its own float array, copied so the arrays the caller passed in aren't changed
+            return np.array(np.broadcast_to(np.asarray(value, dtype=float), (count,)))
+
+        # positional variables
+        self.x = column(x)
+        self.y = column(y)
+        self.heading = column(heading)
+
+        # velocities
+        self.velocity = column(velocity)
+        self.turn_velocity = column(turn_velocity)
+        self.velocity_angle = column(velocity_angle)
+
+        # accelerations
+        self.acceleration = np.zeros(count)
+        self.turn_acceleration = np.zeros(count)
+
+        # maximums
+        self.MAX_VELOCITY = column(MAX_VELOCITY)
+        self.MAX_ACCELERATION = column(MAX_ACCELERATION)
+        self.MAX_TURN_VELOCITY = column(MAX_TURN_VELOCITY)
+        self.MAX_TURN_ACCELERATION = column(MAX_TURN_ACCELERATION)
+
+        # paths
+        self.paths = list(paths) if paths is not None else []
+        self.path_ids = np.array(np.broadcast_to(np.asarray(0 if path_ids is None else path_ids, dtype=np.intp),
+                                                 (count,)))
+        if self.paths and (self.path_ids.min() < 0 or self.path_ids.max() >= len(self.paths)):
+            raise IndexError("path_ids has to index into paths")
+
+        # robots which are done don't move anymore
+        self.active = np.ones(count, dtype=bool)
+
+        self.time = 0.0
+
+    @classmethod
+    def from_models(cls, robots: list[RobotModel], **kwargs) -> "BatchSimulator":
+        """Makes a batch with the same states and limits as a list of RobotModels."""
+        names = ("x", "y", "heading", "velocity", "turn_velocity", "velocity_angle") + cls.PARAMETERS
+        values = {name: [getattr(robot, name) for robot in robots] for name in names}
+        kwargs.setdefault("integrator", robots[0].integrator if robots else "euler")
+        return cls(len(robots), **values, **kwargs)
+
+    def get_model(self, index: int) -> RobotModel:
+        """Makes a RobotModel with the state and limits of one of the robots."""
+        robot = RobotModel(**{name: float(getattr(self, name)[index]) for name in self.PARAMETERS},
+                           integrator=self.integrator)
+        robot.set_state(self.get_state()[:, index])
+        return robot
+
+    def get_state(self) -> np.ndarray:
+        """
+        Return:
+            an array of shape (len(STATE_FIELDS), count), a row for each field
+        """
+        return np.stack((np.full(self.count, self.time), self.x, self.y, self.heading, self.velocity,
+                         self.velocity_angle, self.turn_velocity, self.acceleration, self.turn_acceleration))
+
+    def step(self):
+        """Does a single tick for every active robot: the controller then the physics."""
+        if self.controller is not None:
+            self.controller(self)
+
+        # robots which are done get a timestep of 0 so nothing about them changes
+        account_fps = np.where(self.active, RobotModel.FPS * self.dt, 0.0)
+
+        if self.integrator == "arc":
+            dx, dy, velocity, turn_velocity, velocity_angle = arc_step(
+                self.velocity, self.acceleration, self.velocity_angle, self.turn_velocity, self.turn_acceleration,
+                account_fps, self.MAX_VELOCITY, self.MAX_TURN_VELOCITY)
+            self.x += dx
+            self.y += dy
+
+            self.velocity[:] = velocity
+            self.turn_velocity[:] = turn_velocity
+            self.velocity_angle[:] = velocity_angle
+        else:
+            # --- updating position --- #
+
+            radians = np.radians(self.velocity_angle)
+            distance = self.velocity / 100 * account_fps
+            self.x += distance * np.sin(-radians)
+            self.y += distance * np.cos(radians)
+
+            # --- updating velocities --- #
+
+            np.minimum(self.velocity + self.acceleration * account_fps, self.MAX_VELOCITY, out=self.velocity)
+            np.clip(self.turn_velocity + self.turn_acceleration * account_fps,
+                    -self.MAX_TURN_VELOCITY, self.MAX_TURN_VELOCITY, out=self.turn_velocity)
+            self.velocity_angle += self.turn_velocity * account_fps
+
+        # so that the velocity always stays positive
+        backwards = self.velocity < 0
+        self.velocity[backwards] *= -1
+        self.velocity_angle[backwards] += 180
+
+        self.velocity_angle %= 360
+
+        # --- updating accelerations --- #
+
+        self.acceleration[:] = 0
+        self.turn_acceleration[:] = 0
+
+        self.time += self.dt
+
+    def run(self, duration: float, record: bool = False) -> np.ndarray | None:
+        """
+        Simulates every robot for duration seconds, or until the controller says all of them are finished.
+
+        Args:
+            duration: the most seconds to simulate
+            record: if the states of every tick should be returned (this gets big fast with lots of robots)
+
+        Return:
+            an array of shape (ticks + 1, len(STATE_FIELDS), count) starting with the initial states,
+            or None if record is False
+        """
+        steps = int(round(duration / self.dt))
+        finished = getattr(self.controller, "finished", None)
+
+        states = np.empty((steps + 1, len(STATE_FIELDS), self.count)) if record else None
+        if record:
+            states[0] = self.get_state()
+
+        ticks = 0
+        while ticks < steps:
+            if finished is not None:
+                self.active &= ~np.asarray(finished(self), dtype=bool)
+                if not self.active.any():
+                    break
+            self.step()
+            ticks += 1
+            if record:
+                states[ticks] = self.get_state()
+
+        return states[:ticks + 1] if record else None
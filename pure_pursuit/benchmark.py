@@ -0,0 +1,229 @@
+# --------------- DEPENDENCIES --------------- #
+# everything is drawn without a window so the numbers don't depend on the screen
+import matplotlib
+matplotlib.use("Agg")
+
+# because we love numpy
+import numpy as np
+
+# timing and saving the results
+import json
+import platform
+import sys
+import time
+
+# the things being measured
+from .kinematics import RobotModel
+from .simulation import Simulator
+from .batch import BatchSimulator
+from .follower import PurePursuit
+from .path import path, WaypointArray, convert_to_list
+from .spline import SplinePath
+from .velocity_profile import VelocityProfile
+from .visualization.trail import Trail, velocity_colormap
+from .visualization.rendering import DrawnPath, RobotDrawing, simplify
+from .visualization.export import _make_figure
+
+# ---------------- SETTINGS ----------------- #
+
+# everything random comes from this seed and every simulation uses this dt, so runs can be compared
+SEED = 13046
+DT = 1 / 200
+
+# how much slower (as a fraction) a benchmark has to get to count as a regression
+THRESHOLD = 0.15
+
+# ---------------- TIMING ----------------- #
+
+
+def measure(function, number: int = 1, repeat: int = 5) -> dict:
+    """
+    Times a function.
+
+    Args:
+        function: what's being timed, called with no arguments
+        number: how many calls are timed together (for things too quick to time one at a time)
+        repeat: how many times that's done
+
+    Return:
+        the fastest and median seconds per call
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number)
+    return {"best": min(times), "median": float(np.median(times)), "number": number, "repeat": repeat}
+
+
+def dense_path(samples_per_segment: int = 256) -> WaypointArray:
+    """The default path sampled as a spline into thousands of waypoints."""
+    geometry = SplinePath(path, samples_per_segment).geometry
+    return WaypointArray(np.column_stack((geometry.coords, geometry.headings, geometry.speeds)))
+
+
+# ---------------- BENCHMARKS ----------------- #
+
+
+def bench_update() -> dict:
+    """The cost of one physics tick, on its own, with the follower, and per robot in a batch."""
+    results = {}
+
+    robot = RobotModel()
+    results["RobotModel.step"] = measure(lambda: robot.step(DT), number=20000)
+
+    follower = Simulator(RobotModel(velocity=0, turn_velocity=0), DT, PurePursuit(path, speed=8))
+    results["Simulator.step (pure pursuit)"] = measure(follower.step, number=5000)
+
+    rng = np.random.default_rng(SEED)
+    batch = BatchSimulator(1000, x=rng.uniform(-5, 5, 1000), y=rng.uniform(-3, 3, 1000), dt=DT)
+    timing = measure(batch.step, number=200)
+    results["BatchSimulator.step per robot (1000)"] = {key: value / 1000 if key in ("best", "median") else value
+                                                        for key, value in timing.items()}
+    return results
+
+
+def bench_draw(trail_lengths=(0, 1000, 10000, 50000)) -> dict:
+    """
+    The cost of one blitted frame (trail, robot and path drawn over the saved background)
+    as the trail gets longer.
+    """
+    rng = np.random.default_rng(SEED)
+    results = {}
+
+    for is_diffy in (True, False):
+        for length in trail_lengths:
+            fig, ax = _make_figure((8, 6), 100, (-6, 6), (-4, 4))
+            drawn_path = DrawnPath(ax, path, linestyle=(0, (5, 1)), linewidth=1.5, zorder=1)
+            drawing = RobotDrawing(ax, is_diffy=is_diffy)
+            trail = Trail(ax, velocity_colormap(), linewidth=5, zorder=1, animated=True)
+
+            # a random walk so the trail looks like it was driven
+            points = np.cumsum(rng.normal(0, 0.02, (length, 2)), axis=0)
+            trail.add_points(points[:, 0], points[:, 1], rng.uniform(0, 1, length))
+
+            canvas = fig.canvas
+            canvas.draw()
+            background = canvas.copy_from_bbox(ax.bbox)
+            state = {"heading": 0.0}
+
+            def frame():
+                state["heading"] += 1
+                canvas.restore_region(background)
+                trail.add_point(*rng.uniform(-1, 1, 2), 0.5)
+                drawn_path.update()
+                artists = drawn_path.get_artists() + trail.get_artists() + \
+                    drawing.draw(0, 0, state["heading"], state["heading"] * 2)
+                for artist in artists:
+                    ax.draw_artist(artist)
+                canvas.blit(ax.bbox)
+
+            name = "diffy" if is_diffy else "mecanum"
+            results[f"frame ({name}, trail {length})"] = measure(frame, number=20, repeat=3)
+            results[f"RobotDrawing.draw ({name})"] = measure(
+                lambda: drawing.draw(1, 2, 30, 60), number=2000)
+    return results
+
+
+def bench_paths() -> dict:
+    """Path preprocessing and following a whole lap, for the default path and a dense spline of it."""
+    results = {}
+    small, dense = WaypointArray.from_path(path), dense_path()
+
+    results["convert_to_list"] = measure(convert_to_list, number=200)
+    results[f"SplinePath.sample ({len(path)} waypoints)"] = measure(SplinePath(path, 256).sample, number=5)
+
+    for name, waypoints in (("small", small), ("dense", dense)):
+        def geometry():
+            waypoints.changed()
+            return waypoints.geometry
+
+        def profile():
+            return VelocityProfile(waypoints).compute(waypoints.geometry)
+
+        def lap():
+            robot = RobotModel(velocity=0, turn_velocity=0)
+            Simulator(robot, DT, PurePursuit(waypoints, speed=8, laps=1)).run(60, record=False)
+
+        results[f"geometry ({name}, {len(waypoints)} waypoints)"] = measure(geometry, number=10)
+        results[f"VelocityProfile ({name}, {len(waypoints)} waypoints)"] = measure(profile, number=10)
+        results[f"one lap ({name}, {len(waypoints)} waypoints)"] = measure(lap, number=1, repeat=3)
+
+    # what the drawn path does when the view changes: half a pixel at the default zoom (about 60 pixels a unit)
+    points = dense.geometry.closed
+    results[f"simplify (dense, {len(points)} points)"] = measure(lambda: simplify(points, 0.5 / 60), number=10)
+    return results
+
+
+BENCHMARKS = {"update": bench_update, "draw": bench_draw, "paths": bench_paths}
+
+
+# ---------------- RESULTS ----------------- #
+
+
+def run(names=None) -> dict:
+    """Runs the benchmarks (all of them if names is None) and returns the results with what they were run on."""
+    results = {}
+    for name in names or BENCHMARKS:
+        results.update(BENCHMARKS[name]())
+
+    return {"machine": {"python": sys.version.split()[0], "numpy": np.__version__,
+                        "matplotlib": matplotlib.__version__, "platform": platform.platform(),
+                        "processor": platform.processor()},
+            "settings": {"seed": SEED, "dt": DT},
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results}
+
+
+def compare(old: dict, new: dict, threshold: float = THRESHOLD) -> list[str]:
+    """
+    The benchmarks which got more than threshold slower (comparing the fastest times).
+
+    Return:
+        a line describing each regression
+    """
+    regressions = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        change = result["best"] / before["best"] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {before['best'] * 1e6:.1f} us -> {result['best'] * 1e6:.1f} us "
+                               f"({change:+.0%})")
+    return regressions
+
+
+# --------------- MAIN --------------- #
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Times the simulation and drawing, and saves the results as json.")
+    parser.add_argument("--output", default="benchmark.json", help="where the results are saved")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None, help="which benchmarks to run")
+    parser.add_argument("--compare", default=None, help="a previous results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="how much slower counts as a regression (0.15 is 15%%)")
+    args = parser.parse_args()
+
+    results = run(args.only)
+    for name, result in results["results"].items():
+        print(f"{name:<45} {result['best'] * 1e6:>12.1f} us  (median {result['median'] * 1e6:.1f} us)")
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"saved to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), results, args.threshold)
+        for line in regressions:
+            print("slower:", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# timing the edits
+import time
+
+# the waypoints, the spline through them and the speeds along it
+from .path import WaypointArray
+from .spline import SplinePath
+from .velocity_profile import VelocityProfile
+
+# ---------------- EDITOR ----------------- #
+
+
+class PathEditor:
+    """
+    Moves, adds and deletes waypoints while keeping the spline through them and its velocity profile up to date.
+
+    An edit only samples the spline segments next to the waypoint, measures only those segments' lengths
+    (the arc lengths after them are moved along), and only works out the speeds within reach of them
+    (see SplinePath.resample and VelocityProfile.patch), so it costs about the same on a huge path as a small one.
+
+    It can be followed and drawn like any path (it has a geometry), and the profile can be given to PurePursuit.
+    """
+
+    def __init__(self, waypoints, samples_per_segment: int = 32, use_headings: bool = False,
+                 max_velocity: float = 20, max_acceleration: float = 1, max_turn_velocity: float = 3.35):
+        """
+        Args:
+            waypoints: the waypoints being edited (a WaypointArray is edited in place, anything else is copied into one)
+            samples_per_segment: how many samples each spline segment gets
+            use_headings: point the spline in the direction of each waypoint's heading
+            max_velocity, max_acceleration, max_turn_velocity: the robot's maximums for the velocity profile
+        """
+        self.path = waypoints if isinstance(waypoints, WaypointArray) else WaypointArray.from_path(waypoints)
+        self.spline = SplinePath(self.path, samples_per_segment, use_headings)
+        self.profile = VelocityProfile(self.spline, max_velocity, max_acceleration, max_turn_velocity)
+
+        # seconds the last edit took, and if it only recalculated part of the path
+        self.last_edit = 0.0
+        self.last_patched = False
+
+        # everything is worked out once up front so the edits have something to patch
+        self.profile.speeds
+
+    # --- acting like a path --- #
+
+    @property
+    def geometry(self):
+        return self.spline.geometry
+
+    @property
+    def version(self) -> int:
+        return self.path.version
+
+    @property
+    def is_closed(self) -> bool:
+        return self.path.is_closed
+
+    def __len__(self):
+        return len(self.path)
+
+    # --- finding waypoints --- #
+
+    def nearest(self, x: float, y: float) -> tuple[int, float]:
+        """
+        Return:
+            the index of the waypoint closest to (x, y) and how far away it is
+        """
+        distances = np.hypot(self.path.data["x"] - x, self.path.data["y"] - y)
+        index = int(np.argmin(distances))
+        return index, float(distances[index])
+
+    def insertion_index(self, x: float, y: float) -> int:
+        """Where a waypoint at (x, y) goes: just after the waypoint whose part of the spline is closest."""
+        geometry = self.geometry
+        distances = np.hypot(geometry.coords[:, 0] - x, geometry.coords[:, 1] - y)
+        return int(geometry.sources[np.argmin(distances)]) + 1
+
+    # --- editing --- #
+
+    def move(self, index: int, x: float, y: float):
+        """Moves a waypoint."""
+        index = range(len(self.path))[index]
+        self.path.data["x"][index] = x
+        self.path.data["y"][index] = y
+        self.path.changed()
+        self._edited(index, 1, 1)
+
+    def insert(self, index: int, x: float, y: float, heading: float | None = None, speed: float = -1):
+        """
+        Adds a waypoint before index.
+
+        Args:
+            heading: defaults to the heading of the waypoint before it
+        """
+        index = min(max(index, 0), len(self.path))
+        if heading is None:
+            heading = float(self.path.data["heading"][index - 1]) if len(self.path) else 0.0
+        self.path.insert(index, (x, y, heading, speed))
+        self._edited(index, 0, 1)
+
+    def delete(self, index: int):
+        """Deletes a waypoint, a path can't go below 2 waypoints (3 if it's closed)."""
+        if len(self.path) <= (3 if self.path.is_closed else 2):
+            raise ValueError("the path needs more waypoints than that")
+        index = range(len(self.path))[index]
+        del self.path[index]
+        self._edited(index, 1, 0)
+
+    def _edited(self, first: int, removed: int, added: int):
+        """Brings the spline and the profile up to date after the waypoints changed."""
+        start = time.perf_counter()
+        changed = self.spline.resample(first, removed, added)
+        if changed is not None:
+            self.last_patched = self.profile.patch(self.spline.geometry, *changed)
+        else:
+            self.last_patched = False
+            self.profile.speeds
+        self.last_edit = time.perf_counter() - start
@@ -0,0 +1,296 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy (the whole map is one array)
+import numpy as np
+
+# because I'll probably need it
+import math
+
+# loading field files
+import json
+
+# ---------------- FOOTPRINTS ----------------- #
+
+# the (width, length) of everything the robot is drawn with for each drivetrain
+# (the mecanum wheels stick out past the sides of its body)
+FOOTPRINTS = {"diffy": (0.5, 0.5), "mecanum": (0.5, 0.5)}
+
+
+def footprint_points(width: float, length: float, spacing: float) -> np.ndarray:
+    """
+    Points covering a rectangle in the robot's frame (x to the right, y forwards), close enough together
+    that no cell of an occupancy grid with cells spacing * sqrt(2) wide can fit between them.
+
+    Return:
+        (n, 2) points, edges included
+    """
+    xs = np.linspace(-width / 2, width / 2, max(int(math.ceil(width / spacing)) + 1, 2))
+    ys = np.linspace(-length / 2, length / 2, max(int(math.ceil(length / spacing)) + 1, 2))
+    return np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+
+
+def place(points: np.ndarray, x, y, heading) -> np.ndarray:
+    """
+    Rotates and moves robot frame points to one or more poses at once.
+
+    Args:
+        points: (n, 2) points in the robot's frame
+        x, y, heading: numbers for one pose, or arrays of length t for t poses (degrees, counterclockwise)
+
+    Return:
+        (n, 2) for one pose, or (t, n, 2)
+    """
+    radians = np.radians(heading)
+    cos, sin = np.cos(radians), np.sin(radians)
+    # the same rotation the robot is drawn with, for every pose at once
+    px, py = points[:, 0], points[:, 1]
+    world_x = np.multiply.outer(cos, px) - np.multiply.outer(sin, py) + np.expand_dims(x, -1)
+    world_y = np.multiply.outer(sin, px) + np.multiply.outer(cos, py) + np.expand_dims(y, -1)
+    return np.stack((world_x, world_y), axis=-1)
+
+
+# ---------------- FIELD MAP ----------------- #
+
+
+class FieldMap:
+    """
+    The walls and the field elements as an occupancy grid: a boolean array with a cell for every
+    resolution x resolution square of the field, True where something is.
+
+    Checking the robot is turning its footprint into points and looking up their cells, which is the same
+    numpy indexing for one pose or a whole trajectory, so a path can be checked in one go before it's run.
+    Obstacles are filled in a bit bigger than they are (by half a cell's diagonal), so a check can only be
+    too careful, never miss something thinner than a cell. Anything outside the field counts as a wall.
+    """
+
+    def __init__(self, bounds: tuple = (-6, 6, -4, 4), resolution: float = 0.05):
+        """
+        Args:
+            bounds: (left, right, bottom, top) of the field, the walls are just outside
+            resolution: the size of each cell
+        """
+        if resolution <= 0:
+            raise ValueError("resolution has to be positive")
+
+        self.bounds = tuple(float(value) for value in bounds)
+        self.resolution = float(resolution)
+
+        left, right, bottom, top = self.bounds
+        self.shape = (int(math.ceil((right - left) / resolution)), int(math.ceil((top - bottom) / resolution)))
+
+        # indexed [x cell, y cell]
+        self.grid = np.zeros(self.shape, dtype=bool)
+
+        # the centers of the cells, for filling in obstacles
+        self._centers_x = left + (np.arange(self.shape[0]) + 0.5) * resolution
+        self._centers_y = bottom + (np.arange(self.shape[1]) + 0.5) * resolution
+
+        # what was added, so the map can be saved and drawn
+        self.obstacles = []
+
+    # --- building the map --- #
+
+    @classmethod
+    def load(cls, filename) -> "FieldMap":
+        """
+        Reads a field from json, like
+        {"bounds": [-6, 6, -4, 4], "resolution": 0.05, "obstacles": [
+            {"type": "rectangle", "center": [0, 0], "size": [1, 0.5], "angle": 45},
+            {"type": "circle", "center": [2, 1], "radius": 0.3},
+            {"type": "polygon", "points": [[0, 0], [1, 0], [0, 1]]}]}
+        """
+        with open(filename) as file:
+            data = json.load(file)
+        field = cls(data.get("bounds", (-6, 6, -4, 4)), data.get("resolution", 0.05))
+        for obstacle in data.get("obstacles", []):
+            field.add(obstacle)
+        return field
+
+    def save(self, filename):
+        with open(filename, "w") as file:
+            json.dump({"bounds": self.bounds, "resolution": self.resolution, "obstacles": self.obstacles},
+                      file, indent=2)
+
+    def add(self, obstacle: dict):
+        """Adds an obstacle from a dict like the ones in a field file."""
+        kind = obstacle.get("type")
+        if kind == "rectangle":
+            self.add_rectangle(obstacle["center"], obstacle["size"], obstacle.get("angle", 0))
+        elif kind == "circle":
+            self.add_circle(obstacle["center"], obstacle["radius"])
+        elif kind == "polygon":
+            self.add_polygon(obstacle["points"])
+        else:
+            raise ValueError(f"unknown obstacle type {kind!r}")
+
+    def _margin(self) -> float:
+        # half the diagonal of a cell, so every cell an obstacle touches is filled in
+        return self.resolution * math.sqrt(2) / 2
+
+    def add_rectangle(self, center, size, angle: float = 0):
+        """A rectangle of size (width, height) rotated angle degrees counterclockwise around its center."""
+        radians = math.radians(angle)
+        cos, sin = math.cos(radians), math.sin(radians)
+        dx = self._centers_x[:, None] - center[0]
+        dy = self._centers_y[None, :] - center[1]
+
+        # the cell centers in the rectangle's own frame
+        along, across = dx * cos + dy * sin, -dx * sin + dy * cos
+        margin = self._margin()
+        self.grid |= (np.abs(along) <= size[0] / 2 + margin) & (np.abs(across) <= size[1] / 2 + margin)
+        self.obstacles.append({"type": "rectangle", "center": list(center), "size": list(size), "angle": angle})
+
+    def add_circle(self, center, radius: float):
+        dx = self._centers_x[:, None] - center[0]
+        dy = self._centers_y[None, :] - center[1]
+        self.grid |= dx ** 2 + dy ** 2 <= (radius + self._margin()) ** 2
+        self.obstacles.append({"type": "circle", "center": list(center), "radius": radius})
+
+    def add_polygon(self, points):
+        """Any simple polygon, filled in with the even-odd rule plus the cells its edges go through."""
+        points = np.asarray(points, dtype=float)
+        xs, ys = np.meshgrid(self._centers_x, self._centers_y, indexing="ij")
+        inside = np.zeros(self.shape, dtype=bool)
+        near = np.zeros(self.shape, dtype=bool)
+
+        margin = self._margin()
+        for start, end in zip(points, np.roll(points, -1, axis=0)):
+            # crossing test for a ray going right from every cell center at once
+            crosses = (start[1] > ys) != (end[1] > ys)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                at = start[0] + (ys - start[1]) * (end[0] - start[0]) / (end[1] - start[1])
+            inside ^= crosses & (xs < at)
+
+            # cells close to the edge itself
+            vector = end - start
+            length = max(float(vector @ vector), 1e-24)
+            t = np.clip(((xs - start[0]) * vector[0] + (ys - start[1]) * vector[1]) / length, 0, 1)
+            near |= (xs - start[0] - t * vector[0]) ** 2 + (ys - start[1] - t * vector[1]) ** 2 <= margin ** 2
+
+        self.grid |= inside | near
+        self.obstacles.append({"type": "polygon", "points": points.tolist()})
+
+    # --- checking --- #
+
+    def occupied(self, points: np.ndarray) -> np.ndarray:
+        """
+        If each point is on an obstacle or outside the field.
+
+        Args:
+            points: (..., 2) points
+
+        Return:
+            (...) booleans
+        """
+        points = np.asarray(points, dtype=float)
+        left, _, bottom, _ = self.bounds
+        cells_x = np.floor((points[..., 0] - left) / self.resolution).astype(np.intp)
+        cells_y = np.floor((points[..., 1] - bottom) / self.resolution).astype(np.intp)
+
+        outside = (cells_x < 0) | (cells_x >= self.shape[0]) | (cells_y < 0) | (cells_y >= self.shape[1])
+        hit = self.grid[np.clip(cells_x, 0, self.shape[0] - 1), np.clip(cells_y, 0, self.shape[1] - 1)]
+        return outside | hit
+
+    def footprint(self, width: float, length: float) -> np.ndarray:
+        """The points checked for a robot this big, spaced so no cell fits between them."""
+        return footprint_points(width, length, self.resolution / math.sqrt(2))
+
+    def collides(self, x: float, y: float, heading: float, footprint: np.ndarray) -> bool:
+        """
+        If the robot hits anything at one pose, cheap enough to do every tick.
+
+        Args:
+            x, y, heading: the robot's pose
+            footprint: the robot's points from footprint()
+        """
+        return bool(self.occupied(place(footprint, x, y, heading)).any())
+
+    def check_trajectory(self, x, y, heading, footprint: np.ndarray, chunk: int = 4096) -> np.ndarray:
+        """
+        Checks every pose of a trajectory at once.
+
+        Args:
+            x, y, heading: arrays with a value for every pose
+            footprint: the robot's points from footprint()
+            chunk: how many poses are checked together (so huge trajectories don't make huge arrays)
+
+        Return:
+            a boolean for every pose, True where the robot hits something
+        """
+        x, y, heading = (np.asarray(value, dtype=float) for value in (x, y, heading))
+        hits = np.empty(len(x), dtype=bool)
+        for start in range(0, len(x), chunk):
+            stop = start + chunk
+            hits[start:stop] = self.occupied(place(footprint, x[start:stop], y[start:stop],
+                                                   heading[start:stop])).any(axis=1)
+        return hits
+
+    def check_path(self, path, footprint: np.ndarray, spacing: float | None = None) -> np.ndarray:
+        """
+        Checks the robot along a path before it's driven, facing each waypoint's heading.
+
+        Args:
+            path: anything with a geometry
+            footprint: the robot's points from footprint()
+            spacing: how far apart the checked poses are, defaults to the grid's resolution
+
+        Return:
+            (distances along the path, a boolean for each of them)
+        """
+        geometry = path.geometry
+        spacing = spacing or self.resolution
+        distances = np.arange(0, geometry.length + spacing / 2, spacing)
+        segment, _ = geometry.locate(distances)
+        points = geometry.point_at(distances)
+        headings = np.asarray(geometry.headings)[segment % len(geometry.headings)]
+        return distances, self.check_trajectory(points[:, 0], points[:, 1], headings, footprint)
+
+
+# --------------- MAIN --------------- #
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Checks a path against a field before it's driven.")
+    parser.add_argument("field", help="the field file (json, see FieldMap.load)")
+    parser.add_argument("--waypoints", default=None, help="a waypoint file to check instead of the default path")
+    parser.add_argument("--spline", action="store_true", help="check the path smoothed into a spline")
+    parser.add_argument("--mecanum", action="store_true", help="the robot has the mecanum drivetrain")
+    parser.add_argument("--duration", type=float, default=60, help="the most seconds the simulated lap can take")
+    parser.add_argument("--speed", type=float, default=8, help="the speed the lap is driven at")
+    args = parser.parse_args()
+
+    from .path import path, load_waypoints
+    from .spline import SplinePath
+    from .kinematics import RobotModel
+    from .simulation import Simulator
+    from .follower import PurePursuit
+
+    field = FieldMap.load(args.field)
+    route = load_waypoints(args.waypoints) if args.waypoints else path
+    if args.spline:
+        route = SplinePath(route)
+    footprint = field.footprint(*FOOTPRINTS["mecanum" if args.mecanum else "diffy"])
+
+    # the path itself, facing the waypoint headings
+    start = time.perf_counter()
+    distances, hits = field.check_path(route, footprint)
+    print(f"path: {len(distances)} poses checked in {(time.perf_counter() - start) * 1000:.1f} ms, "
+          + (f"first hit {distances[hits.argmax()]:.2f} along the path" if hits.any() else "clear"))
+
+    # what the robot actually drives, which cuts corners
+    first = route.geometry.coords[0]
+    robot = RobotModel(*first, velocity=0, turn_velocity=0, integrator="arc")
+    states = Simulator(robot, dt=1 / 50, controller=PurePursuit(route, speed=args.speed, laps=1)).run(args.duration)
+    start = time.perf_counter()
+    driven = field.check_trajectory(states[:, 1], states[:, 2], states[:, 3], footprint)
+    print(f"driven: {len(states)} poses checked in {(time.perf_counter() - start) * 1000:.1f} ms, "
+          + (f"first hit at {states[driven.argmax(), 0]:.2f} s, ({states[driven.argmax(), 1]:.2f}, "
+             f"{states[driven.argmax(), 2]:.2f})" if driven.any() else "clear"))
+
+    if hits.any() or driven.any():
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
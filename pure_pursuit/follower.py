@@ -0,0 +1,328 @@
+# --------------- DEPENDENCIES --------------- #
+# because I'll probably need it
+import math
+
+# the batch follower steers every robot at once
+import numpy as np
+
+# finding the point to drive towards
+from .lookahead import LookaheadEngine
+from .kinematics import RobotModel
+
+# ---------------- PURE PURSUIT ----------------- #
+
+
+class PurePursuit:
+    """
+    The pure pursuit follower, it steers the robot towards the lookahead point on the path.
+
+    It's a controller for the Simulator: calling it sets the robot's accelerations for the next step.
+    """
+
+    def __init__(self, path, lookahead_distance: float = 0.5, speed: float | None = None, laps: float | None = None,
+                 profile=None, **engine_kwargs):
+        """
+        Args:
+            path: the path being followed (anything with a geometry, like a Path, WaypointArray or SplinePath)
+            lookahead_distance: the radius of the lookahead circle
+            speed: the speed used where the waypoints say -1 (automatic), defaults to the robot's MAX_VELOCITY
+            laps: how many times a closed path is driven before it's finished, None means forever
+            profile: a VelocityProfile of the same path, if it's given its speeds are used instead of speed
+            engine_kwargs: passed along to the LookaheadEngine
+        """
+        self.engine = LookaheadEngine(path, lookahead_distance, **engine_kwargs)
+        self.speed = speed
+        self.laps = laps
+        self.profile = profile
+
+        # the robot's time the last time it was steered, the accelerations are spread over the time between steps
+        self.last_time = None
+
+    def __call__(self, robot):
+        """Sets the robot's acceleration and turn acceleration to go towards the lookahead point."""
+        goal_x, goal_y = self.engine.update(robot.x, robot.y)
+
+        # how many 30 ms frames the next step probably is (as long as the last one, or a frame the first time),
+        # the accelerations are per frame so they're divided by this to close the gap in one step of any size
+        frames = 1.0
+        if self.last_time is not None and robot.time > self.last_time:
+            frames = (robot.time - self.last_time) * robot.FPS
+        self.last_time = robot.time
+
+        # --- steering --- #
+
+        # the angle to the lookahead point, in the same angles as velocity_angle (0 is up, counterclockwise)
+        goal_angle = math.degrees(math.atan2(-(goal_x - robot.x), goal_y - robot.y))
+        alpha = math.radians((goal_angle - robot.velocity_angle + 180) % 360 - 180)
+
+        # the curvature of the arc through the lookahead point, turned into degrees per 30 ms frame
+        curvature = 2 * math.sin(alpha) / self.engine.lookahead_distance
+        goal_turn_velocity = math.degrees(curvature * robot.velocity / 100)
+
+        robot.turn_acceleration = max(-robot.MAX_TURN_ACCELERATION,
+                                      min((goal_turn_velocity - robot.turn_velocity) / frames,
+                                          robot.MAX_TURN_ACCELERATION))
+
+        # --- speed --- #
+
+        # can't go faster than the robot can turn along that arc (like when it's facing the wrong way)
+        speed = self.target_speed(robot)
+        if curvature != 0:
+            speed = min(speed, 100 * math.radians(robot.MAX_TURN_VELOCITY) / abs(curvature))
+
+        robot.acceleration = max(-robot.MAX_ACCELERATION, min((speed - robot.velocity) / frames,
+                                                              robot.MAX_ACCELERATION))
+
+    def target_speed(self, robot) -> float:
+        """The speed the robot should be going at right now."""
+        if self.profile is not None:
+            # already worked out for the whole path, so it's just a lookup
+            return self.profile.speed_at(self.engine.distance, self.engine.segment)
+
+        geometry = self.engine.geometry
+        automatic = self.speed if self.speed is not None else robot.MAX_VELOCITY
+        segment = self.engine.segment % geometry.segment_count
+        start, end = (geometry.speeds[index % len(geometry.speeds)] for index in (segment, segment + 1))
+        start, end = (speed if speed >= 0 else automatic for speed in (start, end))
+
+        # how far along the segment the robot is
+        distance = self.engine.distance % geometry.length if geometry.is_closed else self.engine.distance
+        t = min(max((distance - geometry.arc_length[segment]) / max(geometry.lengths[segment], 1e-12), 0), 1)
+
+        # v^2 changes evenly along the segment like a velocity profile, so it slows down to a waypoint's speed
+        # and speeds up again after it (going by the speed itself it would never quite reach a speed 0 waypoint)
+        speed = math.sqrt(start ** 2 * (1 - t) + end ** 2 * t)
+        # but never all the way to 0, or it would stop on a speed 0 waypoint and never leave
+        return max(speed, robot.MAX_ACCELERATION)
+
+    def finished(self, robot) -> bool:
+        """If the robot is done following the path."""
+        engine = self.engine
+        if engine.geometry is None:
+            return False
+        if engine.finished:
+            return True
+        return self.laps is not None and engine.distance >= self.laps * engine.geometry.length
+
+
+# ---------------- BATCH PURE PURSUIT ----------------- #
+
+
+class BatchPurePursuit:
+    """
+    Pure pursuit for a BatchSimulator, every robot follows batch.paths[batch.path_ids[i]] and one call steers
+    all of them with array math (the steering and speeds are the same as PurePursuit).
+
+    Each robot keeps its own progress hint, so only a small window of segments around it is checked every tick.
+    The lookahead point is lookahead_distance further along the path than the robot's progress, instead of
+    where the lookahead circle crosses the path, which keeps it to one point per robot.
+    """
+
+    def __init__(self, lookahead_distance: float = 0.5, speed: float | None = None, laps: float | None = None,
+                 profiles: list | None = None, window: int = 8, back_segments: int = 2,
+                 relocalize_distance: float | None = None):
+        """
+        Args:
+            lookahead_distance: how far ahead along the path the robots aim
+            speed: the speed used where the waypoints say -1 (automatic), defaults to each robot's MAX_VELOCITY
+            laps: how many times a closed path is driven before it's finished, None means forever
+            profiles: a VelocityProfile for each of the batch's paths (in the same order), used instead of speed
+            window: how many segments ahead of the progress hint are checked
+            back_segments: how many segments behind the progress hint are checked
+            relocalize_distance: how far from the window a robot can be before the whole path is searched,
+                                 defaults to twice the lookahead distance
+        """
+        self.lookahead_distance = lookahead_distance
+        self.speed = speed
+        self.laps = laps
+        self.profiles = profiles
+        self.window = window
+        self.back_segments = back_segments
+        self.relocalize_distance = relocalize_distance if relocalize_distance is not None \
+            else 2 * lookahead_distance
+
+        # the progress hints, one for each robot and not wrapped around for closed paths (like LookaheadEngine)
+        self.segment = None
+        self.distance = None
+        self.cross_track_error = None
+
+        # the geometry each path had last time, a robot whose path changed is found again from scratch
+        self._geometries = None
+
+    def __call__(self, batch):
+        """Sets the acceleration arrays of the batch to go towards every robot's lookahead point."""
+        if not batch.paths:
+            raise ValueError("the batch needs paths to be followed")
+        self._refresh(batch)
+
+        goal = np.empty((batch.count, 2))
+        speed = np.empty(batch.count)
+        for index, robots in self._groups(batch):
+            geometry = self._geometries[index]
+            segment, t = self._update(geometry, robots, batch.x[robots], batch.y[robots])
+
+            distance = self.distance[robots]
+            goal[robots] = geometry.point_at(distance + self.lookahead_distance if geometry.is_closed
+                                             else np.minimum(distance + self.lookahead_distance, geometry.length))
+            speed[robots] = self._target_speed(index, geometry, segment, t, batch.MAX_VELOCITY[robots],
+                                                batch.MAX_ACCELERATION[robots])
+
+        # the accelerations are per 30 ms frame, so they're divided by this to close the gap in one step
+        frames = RobotModel.FPS * batch.dt
+
+        # --- steering --- #
+
+        goal_angle = np.degrees(np.arctan2(-(goal[:, 0] - batch.x), goal[:, 1] - batch.y))
+        alpha = np.radians((goal_angle - batch.velocity_angle + 180) % 360 - 180)
+
+        curvature = 2 * np.sin(alpha) / self.lookahead_distance
+        goal_turn_velocity = np.degrees(curvature * batch.velocity / 100)
+        batch.turn_acceleration[:] = np.clip((goal_turn_velocity - batch.turn_velocity) / frames,
+                                             -batch.MAX_TURN_ACCELERATION, batch.MAX_TURN_ACCELERATION)
+
+        # --- speed --- #
+
+        with np.errstate(divide="ignore"):
+            speed = np.minimum(speed, 100 * np.radians(batch.MAX_TURN_VELOCITY) / np.abs(curvature))
+        batch.acceleration[:] = np.clip((speed - batch.velocity) / frames,
+                                        -batch.MAX_ACCELERATION, batch.MAX_ACCELERATION)
+
+    def finished(self, batch) -> np.ndarray:
+        """Which robots are done following their paths."""
+        if self.distance is None:
+            return np.zeros(batch.count, dtype=bool)
+        done = np.zeros(batch.count, dtype=bool)
+        for index, robots in self._groups(batch):
+            geometry = self._geometries[index]
+            if not geometry.is_closed:
+                done[robots] = self.distance[robots] >= geometry.length - 1e-9
+            elif self.laps is not None:
+                done[robots] = self.distance[robots] >= self.laps * geometry.length
+        return done
+
+    # --- progress --- #
+
+    @staticmethod
+    def _groups(batch):
+        """The index of every path and the robots following it."""
+        for index in np.unique(batch.path_ids):
+            yield int(index), np.flatnonzero(batch.path_ids == index)
+
+    def _refresh(self, batch):
+        """Sets up the progress hints, and forgets them for robots whose path changed."""
+        if self.distance is None or len(self.distance) != batch.count:
+            self.segment = np.zeros(batch.count, dtype=np.intp)
+            self.distance = np.full(batch.count, np.nan)
+            self.cross_track_error = np.zeros(batch.count)
+            self._geometries = [None] * len(batch.paths)
+
+        for index, path in enumerate(batch.paths):
+            geometry = path.geometry
+            if geometry is not self._geometries[index]:
+                if geometry.segment_count == 0:
+                    raise ValueError("the paths need at least two waypoints to be followed")
+                self._geometries[index] = geometry
+                self.distance[batch.path_ids == index] = np.nan
+
+    def _update(self, geometry, robots, x, y) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Moves the progress hints of the robots on one path to them.
+
+        Return:
+            the (wrapped) segment every robot's progress is on and how far along it
+        """
+        points = np.column_stack((x, y))
+        count = geometry.segment_count
+
+        # robots that haven't been found yet (or whose path changed) search the whole path
+        lost = np.isnan(self.distance[robots])
+        if lost.any():
+            self._relocalize(geometry, robots[lost], points[lost])
+
+        offsets = np.arange(-self.back_segments, self.window)
+        indices = self.segment[robots, None] + offsets
+        if not geometry.is_closed:
+            indices = np.clip(indices, 0, count - 1)
+        segment, t, distance = _nearest_on_windows(geometry, points, indices % count)
+
+        # the hint is wrong (the robot got pushed or the path moved), so the whole path is searched
+        far = (distance > self.relocalize_distance) & ~lost
+        if far.any():
+            self._relocalize(geometry, robots[far], points[far])
+            indices[far] = self.segment[robots[far], None] + offsets
+            if not geometry.is_closed:
+                indices = np.clip(indices, 0, count - 1)
+            segment[far], t[far], distance[far] = _nearest_on_windows(geometry, points[far], indices[far] % count)
+
+        # --- progress --- #
+
+        unwrapped = np.take_along_axis(indices, segment[:, None], axis=1)[:, 0]
+        wrapped = unwrapped % count
+        laps = unwrapped // count if geometry.is_closed else 0
+        progress = laps * geometry.length + geometry.arc_length[wrapped] + geometry.lengths[wrapped] * t
+
+        # it only moves forward, like LookaheadEngine
+        forward = progress >= self.distance[robots]
+        self.segment[robots[forward]] = unwrapped[forward]
+        self.distance[robots[forward]] = progress[forward]
+        self.cross_track_error[robots] = distance
+
+        # where the progress hint is now
+        wrapped = self.segment[robots] % count
+        along = self.distance[robots] % geometry.length if geometry.is_closed else self.distance[robots]
+        t = np.clip((along - geometry.arc_length[wrapped]) / np.maximum(geometry.lengths[wrapped], 1e-12), 0, 1)
+        return wrapped, t
+
+    def _relocalize(self, geometry, robots, points):
+        """Finds the nearest segment on the whole path for some robots, keeping the laps they've done."""
+        count = geometry.segment_count
+        # a chunk of robots at a time so the robots by segments arrays stay small
+        chunk = max(1, (1 << 20) // count)
+        for first in range(0, len(robots), chunk):
+            some = slice(first, first + chunk)
+            indices = np.broadcast_to(np.arange(count), (len(points[some]), count))
+            segment, t, _ = _nearest_on_windows(geometry, points[some], indices)
+
+            known = ~np.isnan(self.distance[robots[some]])
+            laps = np.where(known & geometry.is_closed, self.segment[robots[some]] // count, 0)
+            self.segment[robots[some]] = laps * count + segment
+            self.distance[robots[some]] = (laps * geometry.length + geometry.arc_length[segment]
+                                           + geometry.lengths[segment] * t)
+
+    # --- speed --- #
+
+    def _target_speed(self, index, geometry, segment, t, max_velocity, max_acceleration) -> np.ndarray:
+        """The speed each robot should be going at, like PurePursuit.target_speed."""
+        if self.profiles is not None:
+            speeds = self.profiles[index].speeds
+            return speeds[segment] * (1 - t) + speeds[segment + 1] * t
+
+        automatic = self.speed if self.speed is not None else max_velocity
+        speeds = np.asarray(geometry.speeds, dtype=float)
+        start, end = speeds[segment % len(speeds)], speeds[(segment + 1) % len(speeds)]
+        start, end = (np.where(speed >= 0, speed, automatic) for speed in (start, end))
+        return np.maximum(np.sqrt(start ** 2 * (1 - t) + end ** 2 * t), max_acceleration)
+
+
+def _nearest_on_windows(geometry, points, indices) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The closest segment to each point out of its own row of segment indices.
+
+    Args:
+        geometry: the path's geometry
+        points: an (n, 2) array of points
+        indices: an (n, w) array of (wrapped) segment indices for each point
+
+    Return:
+        which column of indices is closest for each point, how far along that segment, and how far away it is
+    """
+    starts, vectors = geometry.starts[indices], geometry.vectors[indices]
+    offsets = points[:, None, :] - starts
+    squared = np.einsum("nwi,nwi->nw", vectors, vectors)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip(np.where(squared > 0, np.einsum("nwi,nwi->nw", offsets, vectors) / squared, 0), 0, 1)
+    gaps = offsets - vectors * t[..., None]
+    distance = np.hypot(gaps[..., 0], gaps[..., 1])
+    nearest = np.argmin(distance, axis=1)
+    rows = np.arange(len(points))
+    return nearest, t[rows, nearest], distance[rows, nearest]
@@ -0,0 +1,335 @@
+# --------------- DEPENDENCIES --------------- #
+# because I'll probably need it
+import math
+import cmath
+
+# the arc integration works on single robots and whole batches the same way
+import numpy as np
+
+# ---------------- STATE ----------------- #
+
+# what is recorded for every tick of a run, in this order
+STATE_FIELDS = ("time", "x", "y", "heading", "velocity", "velocity_angle", "turn_velocity",
+                "acceleration", "turn_acceleration")
+
+
+# the ways a step can be integrated
+# euler: a straight line along the velocity angle, then the angle is turned (the original way, needs small steps)
+# arc: the curve the robot actually drives while its velocity and turn velocity change at a constant rate
+#      (up to their maximums), so it doesn't need small steps
+INTEGRATORS = ("euler", "arc")
+
+# Gauss-Legendre points and weights on [0, 1], for integrating along a curve whose turn velocity is changing
+_NODES, _WEIGHTS = np.polynomial.legendre.leggauss(8)
+_NODES = (_NODES + 1) / 2
+_WEIGHTS = _WEIGHTS / 2
+
+
+def arc_displacement(velocity, acceleration, velocity_angle, turn_velocity, frames):
+    """
+    How far the robot moves while its velocity angle turns at a constant rate and its velocity changes
+    at a constant rate, worked out exactly instead of as a straight line.
+
+    With the direction as the complex number i * e^(i angle), the distance moved is the integral of
+    (v + a t) i e^(i (angle + w t)) from 0 to T, which has a closed form. When it's barely turning,
+    dividing by w loses precision, so the series of the same integral is used instead.
+    Everything can be a numpy array (for batches) or a number.
+
+    Args:
+        velocity: the velocity at the start (100 times the distance per 30 ms frame, like RobotModel.velocity)
+        acceleration: how much the velocity changes per frame
+        velocity_angle: the direction at the start (degrees, 0 is up, counterclockwise)
+        turn_velocity: how many degrees the direction turns per frame
+        frames: how many 30 ms frames the step is
+
+    Return:
+        the change in x and the change in y
+    """
+    if not any(isinstance(value, np.ndarray) for value in (velocity, acceleration, velocity_angle, turn_velocity,
+                                                           frames)):
+        # one robot, plain python is a lot quicker than numpy on single numbers
+        angle, turn = math.radians(velocity_angle), math.radians(turn_velocity)
+        constant, linear = _arc_integrals(turn, frames, abs(turn * frames) < 1e-4, cmath.exp,
+                                          lambda small, series, exact: series if small else exact)
+        moved = 1j * cmath.exp(1j * angle) * (velocity * constant + acceleration * linear) / 100
+        return moved.real, moved.imag
+
+    angle, turn = np.radians(velocity_angle), np.radians(turn_velocity)
+    constant, linear = _arc_integrals(turn, frames, np.abs(turn * frames) < 1e-4, np.exp, np.where)
+    moved = 1j * np.exp(1j * angle) * (velocity * constant + acceleration * linear) / 100
+    return moved.real, moved.imag
+
+
+def _arc_integrals(turn, frames, small, exp, where):
+    """
+    The integrals of e^(i w t) and t e^(i w t) from 0 to T, or their series where w T is small
+    (dividing by w loses precision there).
+    """
+    safe = where(small, 1.0, turn)
+    rotation = exp(1j * turn * frames)
+    constant = where(small, frames + 0.5j * turn * frames ** 2 - turn ** 2 * frames ** 3 / 6,
+                     (rotation - 1) / (1j * safe))
+    linear = where(small, frames ** 2 / 2 + 1j * turn * frames ** 3 / 3 - turn ** 2 * frames ** 4 / 8,
+                   frames * rotation / (1j * safe) + (rotation - 1) / safe ** 2)
+    return constant, linear
+
+
+def clothoid_displacement(velocity, acceleration, velocity_angle, turn_velocity, turn_acceleration, frames):
+    """
+    Like arc_displacement, but the turn velocity also changes at a constant rate, so the path is a clothoid
+    (the curvature changes along it) instead of an arc.
+
+    The integral of (v + a t) i e^(i (angle + w t + c t^2 / 2)) has no closed form (it's a Fresnel integral),
+    so it's integrated with 8 point Gauss-Legendre on pieces that turn at most a radian each. The integrand is
+    smooth, so that's accurate to rounding error. Without any turn acceleration it's arc_displacement.
+
+    Args:
+        turn_acceleration: how much the turn velocity changes per frame
+        everything else: like arc_displacement
+
+    Return:
+        the change in x and the change in y
+    """
+    if not np.any(turn_acceleration):
+        return arc_displacement(velocity, acceleration, velocity_angle, turn_velocity, frames)
+
+    angle, turn = np.radians(velocity_angle), np.radians(turn_velocity)
+    turn_change = np.radians(turn_acceleration)
+    frames = np.asarray(frames, dtype=float)
+
+    # how many pieces, enough that the one that turns the most turns at most a radian per piece
+    turned = np.abs(turn) * frames + np.abs(turn_change) * frames ** 2 / 2
+    pieces = max(int(np.ceil(np.max(turned))), 1)
+
+    # the times of every point of every piece, along a new last axis
+    fractions = ((np.arange(pieces)[:, None] + _NODES) / pieces).ravel()
+    weights = np.tile(_WEIGHTS, pieces) / pieces
+    expand = lambda value: np.expand_dims(np.asarray(value, dtype=float), -1)
+    t = expand(frames) * fractions
+
+    direction = 1j * np.exp(1j * (expand(angle) + expand(turn) * t + expand(turn_change) * t ** 2 / 2))
+    moved = np.sum(weights * (expand(velocity) + expand(acceleration) * t) * direction, axis=-1) \
+        * frames / 100
+    if moved.ndim == 0:
+        return float(moved.real), float(moved.imag)
+    return moved.real, moved.imag
+
+
+def arc_step(velocity, acceleration, velocity_angle, turn_velocity, turn_acceleration, frames,
+             max_velocity, max_turn_velocity):
+    """
+    One step of the arc integrator, for one robot or (with arrays) a whole batch.
+
+    The velocity changes at acceleration until it reaches max_velocity and the turn velocity changes at
+    turn_acceleration until it reaches max_turn_velocity, the same as the euler step's velocities at the end.
+    The step is split where either one hits its maximum, and each piece is driven along its clothoid,
+    so the position doesn't depend on how big the step is.
+
+    Args:
+        velocity, acceleration, velocity_angle, turn_velocity, turn_acceleration: the robot at the start
+        frames: how many 30 ms frames the step is
+        max_velocity, max_turn_velocity: the robot's maximums
+
+    Return:
+        the change in x, the change in y, and the velocity, turn velocity and velocity angle at the end
+    """
+    velocity, acceleration, velocity_angle, turn_velocity, turn_acceleration, frames = (
+        np.asarray(value, dtype=float) for value in (velocity, acceleration, velocity_angle, turn_velocity,
+                                                     turn_acceleration, frames))
+
+    # a turn velocity over the maximum is clamped right away, like the euler step, so it can only reach
+    # the maximum by turn_acceleration (and in the direction of turn_acceleration)
+    turn_velocity = np.clip(turn_velocity, -max_turn_velocity, max_turn_velocity)
+
+    # when each one reaches its maximum (the end of the step if it doesn't)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity_limit = np.where((acceleration > 0) & (velocity + acceleration * frames > max_velocity),
+                                  np.clip((max_velocity - velocity) / acceleration, 0, frames), frames)
+        turn_limit_value = np.where(turn_acceleration > 0, max_turn_velocity, -max_turn_velocity)
+        turn_limit = np.where(np.abs(turn_velocity + turn_acceleration * frames) > max_turn_velocity,
+                              np.clip((turn_limit_value - turn_velocity) / turn_acceleration, 0, frames), frames)
+
+    def angle_at(t):
+        # the velocity angle after t frames, turning at turn_velocity + turn_acceleration t until the maximum
+        speeding_up = np.minimum(t, turn_limit)
+        return (velocity_angle + turn_velocity * speeding_up + turn_acceleration * speeding_up ** 2 / 2
+                + turn_limit_value * (t - speeding_up))
+
+    # --- updating position --- #
+
+    dx, dy = 0.0, 0.0
+    breaks = (0.0, np.minimum(velocity_limit, turn_limit), np.maximum(velocity_limit, turn_limit), frames)
+    for start, end in zip(breaks, breaks[1:]):
+        duration = end - start
+        if not np.any(duration > 0):
+            continue
+        accelerating, turning = start < velocity_limit, start < turn_limit
+        moved = clothoid_displacement(np.where(accelerating, velocity + acceleration * start, max_velocity),
+                                      np.where(accelerating, acceleration, 0.0), angle_at(start),
+                                      np.where(turning, turn_velocity + turn_acceleration * start, turn_limit_value),
+                                      np.where(turning, turn_acceleration, 0.0), duration)
+        dx, dy = dx + moved[0], dy + moved[1]
+
+    # --- updating velocities --- #
+
+    return (dx, dy, np.minimum(velocity + acceleration * frames, max_velocity),
+            np.clip(turn_velocity + turn_acceleration * frames, -max_turn_velocity, max_turn_velocity),
+            angle_at(frames))
+
+
+# --------------- CLASSES --------------- #
+
+class RobotModel:
+    """
+    The headless part of the robot, it only knows about positions, velocities and accelerations.
+    Nothing in here touches matplotlib, so it can be simulated without opening a window.
+    """
+
+    # 1000 milliseconds in a second, and I found the average frame time was around 30 ms
+    # so a velocity of 1 moves the robot 1/100 of a unit every 30 ms
+    FPS = 1000 / 30
+
+    def __init__(self, x: float = 0, y: float = 0, heading: float = 0, MAX_VELOCITY: float = 20,
+                 MAX_ACCELERATION: float = 1, MAX_TURN_VELOCITY: float = 3.35, MAX_TURN_ACCELERATION: float = 1,
+                 velocity: float = 10, turn_velocity: float = 3.35, velocity_angle: float = 0,
+                 integrator: str = "euler"):
+        """
+        Initializes all of the positional, velocity, acceleration and maximum variables.
+        Args:
+            x: initial x position of the robot
+            y: initial y position of the robot
+            heading: initial heading of the robot
+            MAX_VELOCITY: maximum linear velocity
+            MAX_ACCELERATION: maximum linear acceleration
+            MAX_TURN_VELOCITY: maximum rate of change in velocity angle
+            MAX_TURN_ACCELERATION: maximum rate of change in turn velocity
+            velocity: initial linear velocity
+            turn_velocity: initial rate of change in velocity angle
+            velocity_angle: initial direction the robot is moving in (degrees, 0 is straight up)
+            integrator: "euler" or "arc" (see INTEGRATORS), arc follows the curve the robot drives so much
+                        bigger steps can be used
+        """
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"integrator has to be one of {INTEGRATORS}")
+
+        # positional variables
+        self.x = x
+        self.y = y
+        self.heading = heading
+
+        # I'm using polar coordinates for velocity for simplicity
+        # the velocity is 100 times than what is being drawn, this is accounted for when changing position
+        self.velocity = velocity
+        # how fast the velocity angle is changing
+        self.turn_velocity = turn_velocity
+        self.velocity_angle = velocity_angle
+
+        # accelerations
+        self.acceleration = 0
+        self.turn_acceleration = 0
+
+        # maximums
+        self.MAX_VELOCITY = MAX_VELOCITY
+        self.MAX_ACCELERATION = MAX_ACCELERATION
+        self.MAX_TURN_VELOCITY = MAX_TURN_VELOCITY
+        self.MAX_TURN_ACCELERATION = MAX_TURN_ACCELERATION
+
+        # how long the robot has been simulated for in seconds
+        self.time = 0.0
+
+        self.integrator = integrator
+
+    def step(self, dt: float):
+        """
+        Moves the robot forward by dt seconds.
+        The same dt always gives the same result, it never looks at the clock.
+
+        Args:
+            dt: how many seconds to simulate
+        """
+        # scales the velocities (which are per 30 ms frame) to the timestep
+        account_fps = self.FPS * dt
+
+        if self.integrator == "arc":
+            self._arc_step(account_fps)
+        else:
+            self._euler_step(account_fps)
+
+        # going to add velocity and acceleration to this later
+        self.heading += 0
+
+        # so that the velocity always stays positive
+        if self.velocity < 0:
+            self.velocity *= -1
+            self.velocity_angle += 180
+
+        self.velocity_angle %= 360
+
+        # --- updating accelerations --- #
+
+        # the accelerations only last for one step, whatever is controlling the robot sets them again
+        self.acceleration = 0
+        self.turn_acceleration = 0
+
+        self.time += dt
+
+    def _euler_step(self, account_fps: float):
+        """Moves in a straight line along the velocity angle, then updates the velocities and turns."""
+        # --- updating position --- #
+
+        # changing the robot position
+        self.x += self.velocity / 100 * account_fps * math.sin(math.radians(-self.velocity_angle))
+        self.y += self.velocity / 100 * account_fps * math.cos(math.radians(self.velocity_angle))
+
+        # --- updating velocities --- #
+
+        # updating the velocities so that they don't exceed the maximums
+        self.velocity = min(self.velocity + self.acceleration * account_fps, self.MAX_VELOCITY)
+        self.turn_velocity = max(-self.MAX_TURN_VELOCITY,
+                                 min(self.turn_velocity + self.turn_acceleration * account_fps,
+                                     self.MAX_TURN_VELOCITY))
+        # turn velocity is how much the velocity angle changes by
+        self.velocity_angle += self.turn_velocity * account_fps
+
+    def _arc_step(self, account_fps: float):
+        """Drives along the curve for the whole step (see arc_step), so bigger steps stay on course."""
+        dx, dy, velocity, turn_velocity, velocity_angle = arc_step(
+            self.velocity, self.acceleration, self.velocity_angle, self.turn_velocity, self.turn_acceleration,
+            account_fps, self.MAX_VELOCITY, self.MAX_TURN_VELOCITY)
+        self.x += float(dx)
+        self.y += float(dy)
+        self.velocity = float(velocity)
+        self.turn_velocity = float(turn_velocity)
+        self.velocity_angle = float(velocity_angle)
+
+    def get_state(self) -> tuple:
+        """
+        Return:
+            the state of the robot, in the order of STATE_FIELDS
+        """
+        return (self.time, self.x, self.y, self.heading, self.velocity, self.velocity_angle,
+                self.turn_velocity, self.acceleration, self.turn_acceleration)
+
+    def set_state(self, state):
+        """Sets the robot to a state in the order of STATE_FIELDS (like one from get_state)."""
+        (self.time, self.x, self.y, self.heading, self.velocity, self.velocity_angle,
+         self.turn_velocity, self.acceleration, self.turn_acceleration) = (float(value) for value in state)
+
+
+def interpolate_states(previous, current, alpha: float, fields=STATE_FIELDS) -> tuple:
+    """
+    A state partway between two states.
+
+    Args:
+        previous: the first state
+        current: the second state
+        alpha: how far between them (0 is previous, 1 is current)
+        fields: the names of the values in the states
+    """
+    state = [a + (b - a) * alpha for a, b in zip(previous, current)]
+    for index, name in enumerate(fields):
+        if name in ("heading", "velocity_angle"):
+            # the short way around, so going from 359 to 1 degrees doesn't spin the whole way back
+            change = (current[index] - previous[index] + 180) % 360 - 180
+            state[index] = previous[index] + change * alpha
+    return tuple(state)
@@ -0,0 +1,312 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# because I'll probably need it
+import math
+
+# the cached geometry of the path
+from .path import PathGeometry
+
+# ---------------- GEOMETRY ----------------- #
+
+
+def circle_segment_intersections(center, radius: float, starts: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """
+    Where a circle crosses each segment, for all of the segments at once.
+
+    Args:
+        center: the (x, y) center of the circle
+        radius: the radius of the circle
+        starts: (n, 2) array of where the segments start
+        vectors: (n, 2) array of the segments (end - start)
+
+    Return:
+        (n, 2) array of how far along each segment (0 to 1) the two crossings are, smallest first,
+        nan where the circle doesn't cross (tangent crossings count)
+    """
+    offsets = starts - np.asarray(center, dtype=float)
+
+    # solving |start + t * vector - center|^2 = radius^2 for t
+    a = np.einsum("ij,ij->i", vectors, vectors)
+    b = 2 * np.einsum("ij,ij->i", vectors, offsets)
+    c = np.einsum("ij,ij->i", offsets, offsets) - radius ** 2
+    discriminant = b * b - 4 * a * c
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        root = np.sqrt(discriminant)
+        t = np.stack(((-b - root) / (2 * a), (-b + root) / (2 * a)), axis=-1)
+
+    # no crossing (or a zero length segment), or the crossing is past the ends of the segment
+    t[(discriminant < 0) | (a == 0)] = np.nan
+    t[(t < 0) | (t > 1)] = np.nan
+    return t
+
+
+def nearest_on_segments(point, starts: np.ndarray, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The closest point on each segment to a point, for all of the segments at once.
+
+    Return:
+        how far along each segment (0 to 1) the closest point is, and how far away it is
+    """
+    offsets = np.asarray(point, dtype=float) - starts
+    a = np.einsum("ij,ij->i", vectors, vectors)
+    t = np.clip(np.einsum("ij,ij->i", offsets, vectors) / np.where(a > 0, a, 1), 0, 1)
+    difference = offsets - vectors * t[:, None]
+    return t, np.hypot(difference[:, 0], difference[:, 1])
+
+
+class SegmentGrid:
+    """
+    A uniform grid over the segments of a path, for finding the nearest segment without looking at all of them.
+    Only used when the robot has to relocalize, following the path normally uses the progress hint.
+    """
+
+    def __init__(self, geometry: PathGeometry, cell_size: float | None = None):
+        """
+        Args:
+            geometry: the path geometry being indexed
+            cell_size: the size of the grid cells, defaults to about one cell per segment
+        """
+        self.geometry = geometry
+
+        starts, ends = geometry.starts, geometry.starts + geometry.vectors
+        low = np.minimum(starts, ends)
+        high = np.maximum(starts, ends)
+
+        self.origin = low.min(axis=0)
+
+        if cell_size is None:
+            # about one cell per segment, but never smaller than the segments so they don't cover lots of cells
+            width, height = np.maximum(high.max(axis=0) - self.origin, 1e-9)
+            cell_size = max(2 * geometry.length / max(geometry.segment_count, 1),
+                            math.sqrt(width * height / max(geometry.segment_count, 1)))
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+
+        self.shape = (np.floor((high.max(axis=0) - self.origin) / self.cell_size).astype(int) + 1)
+
+        # the range of cells each segment's bounding box covers
+        first = np.floor((low - self.origin) / self.cell_size).astype(int)
+        last = np.floor((high - self.origin) / self.cell_size).astype(int)
+        spans = last - first + 1
+        counts = spans[:, 0] * spans[:, 1]
+
+        # one entry per (segment, cell) pair
+        segments = np.repeat(np.arange(len(starts)), counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = first[segments, 0] + within % spans[segments, 0]
+        cell_y = first[segments, 1] + within // spans[segments, 0]
+        cells = cell_x * self.shape[1] + cell_y
+
+        # sorted by cell so each cell's segments are a slice (like a sparse matrix)
+        order = np.argsort(cells, kind="stable")
+        self.segments = segments[order]
+        self.cell_starts = np.searchsorted(cells[order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def nearest(self, point) -> tuple[int, float, float]:
+        """
+        Finds the segment closest to a point by searching rings of cells outwards from the point.
+
+        Return:
+            the segment index, how far along it (0 to 1) the closest point is, and the distance to it
+        """
+        point = np.asarray(point, dtype=float)
+        cell = np.floor((point - self.origin) / self.cell_size).astype(int)
+
+        best = (-1, 0.0, np.inf)
+
+        # a point outside of the grid can skip the rings that are all outside of it too
+        first_ring = int(max(0, (-cell).max(), (cell - self.shape + 1).max()))
+        last_ring = first_ring + int(self.shape.max())
+        for ring in range(first_ring, last_ring + 1):
+            candidates = self._ring(cell, ring)
+            if len(candidates):
+                t, distance = nearest_on_segments(point, self.geometry.starts[candidates],
+                                                  self.geometry.vectors[candidates])
+                index = int(np.argmin(distance))
+                if distance[index] < best[2]:
+                    best = (int(candidates[index]), float(t[index]), float(distance[index]))
+
+            # everything in the next ring out is at least this far away
+            if best[2] <= ring * self.cell_size:
+                break
+        return best
+
+    def _ring(self, cell, ring: int) -> np.ndarray:
+        """The segments in the square ring of cells ring cells away from cell."""
+        xs = np.arange(cell[0] - ring, cell[0] + ring + 1)
+        ys = np.arange(cell[1] - ring, cell[1] + ring + 1)
+        if ring == 0:
+            ring_x, ring_y = xs, ys
+        else:
+            grid_x, grid_y = np.meshgrid(xs, ys, indexing="ij")
+            edge = (np.abs(grid_x - cell[0]) == ring) | (np.abs(grid_y - cell[1]) == ring)
+            ring_x, ring_y = grid_x[edge], grid_y[edge]
+
+        inside = (ring_x >= 0) & (ring_x < self.shape[0]) & (ring_y >= 0) & (ring_y < self.shape[1])
+        cells = ring_x[inside] * self.shape[1] + ring_y[inside]
+        if len(cells) == 0:
+            return cells
+
+        # each cell's segments are cell_starts[cell]:cell_starts[cell + 1]
+        found = np.concatenate([self.segments[self.cell_starts[cell]:self.cell_starts[cell + 1]] for cell in cells])
+        return np.unique(found)
+
+
+# ---------------- LOOKAHEAD ----------------- #
+
+
+class LookaheadEngine:
+    """
+    Finds the lookahead point for pure pursuit.
+
+    It remembers how far along the path the robot is (the progress hint), so every tick it only
+    looks at the few segments around that, and the work stays the same no matter how long the path is.
+    If the robot ends up far from where the hint says it is, it relocalizes using a SegmentGrid.
+    """
+
+    def __init__(self, path, lookahead_distance: float = 0.5, back_segments: int = 2,
+                 max_window: int = 512, relocalize_distance: float | None = None):
+        """
+        Args:
+            path: the path being followed (anything with a geometry, like a Path, WaypointArray or SplinePath)
+            lookahead_distance: the radius of the lookahead circle
+            back_segments: how many segments behind the progress hint are checked
+            max_window: the most segments that are checked in one tick
+            relocalize_distance: how far from the windowed nearest point the robot can be before
+                                 searching the whole path, defaults to twice the lookahead distance
+        """
+        self.path = path
+        self.lookahead_distance = lookahead_distance
+        self.back_segments = back_segments
+        self.max_window = max_window
+        self.relocalize_distance = relocalize_distance if relocalize_distance is not None \
+            else 2 * lookahead_distance
+
+        self.geometry = None
+        self.grid = None
+
+        # the progress hint, as a segment index which keeps going up for closed paths (it isn't wrapped)
+        self.segment = 0
+        # how far along the path the robot is, also not wrapped, it never goes down
+        self.distance = 0.0
+        # how far the robot is from the path
+        self.cross_track_error = 0.0
+        self.lookahead_point = None
+
+        # set when the robot has to relocalize
+        self._lost = True
+
+    def _refresh(self):
+        """Picks up a new geometry if the path changed."""
+        geometry = self.path.geometry
+        if geometry is not self.geometry:
+            if geometry.segment_count == 0:
+                raise ValueError("the path needs at least two waypoints to be followed")
+            self.geometry = geometry
+            self.grid = None
+            self._lost = True
+
+    def relocalize(self, x: float, y: float):
+        """Finds the nearest segment on the whole path, forgetting the progress hint."""
+        self._refresh()
+        if self.grid is None:
+            self.grid = SegmentGrid(self.geometry)
+
+        segment, t, distance = self.grid.nearest((x, y))
+        laps = self.segment // self.geometry.segment_count if self.geometry.is_closed else 0
+        self.segment = laps * self.geometry.segment_count + segment
+        self.distance = self._unwrapped_arc(np.array([self.segment]), np.array([t]))[0]
+        self.cross_track_error = distance
+        self._lost = False
+
+    def update(self, x: float, y: float) -> np.ndarray:
+        """
+        Moves the progress hint to the robot and finds the lookahead point.
+
+        Args:
+            x: the robot's x position
+            y: the robot's y position
+
+        Return:
+            the (x, y) lookahead point
+        """
+        self._refresh()
+        relocalized = self._lost
+        if relocalized:
+            self.relocalize(x, y)
+
+        indices, starts, vectors, t, distance = self._search(x, y)
+        nearest = int(np.argmin(distance))
+        if distance[nearest] > self.relocalize_distance and not relocalized:
+            # the hint is wrong (the robot got pushed or the path moved), so the whole path is searched
+            self.relocalize(x, y)
+            indices, starts, vectors, t, distance = self._search(x, y)
+            nearest = int(np.argmin(distance))
+
+        # --- progress --- #
+
+        progress = self._unwrapped_arc(indices[nearest:nearest + 1], t[nearest:nearest + 1])[0]
+        if progress >= self.distance:
+            # it only moves forward, so the robot crossing near an earlier part of the path doesn't send it back
+            self.segment = int(indices[nearest])
+            self.distance = progress
+        self.cross_track_error = float(distance[nearest])
+
+        # --- lookahead point --- #
+
+        crossings = circle_segment_intersections((x, y), self.lookahead_distance, starts, vectors)
+        arcs = self._unwrapped_arc(np.repeat(indices, 2), crossings.reshape(-1))
+        arcs[~(arcs > self.distance)] = np.inf
+
+        best = int(np.argmin(arcs))
+        if np.isfinite(arcs[best]):
+            # the first crossing ahead of the robot
+            self.lookahead_point = starts[best // 2] + vectors[best // 2] * crossings.reshape(-1)[best]
+        else:
+            # the robot is too far off the path for the circle to cross it ahead, so aim further along the path
+            self.lookahead_point = self.geometry.point_at(self._clip(self.distance + self.lookahead_distance))
+        return self.lookahead_point
+
+    def _search(self, x: float, y: float) -> tuple:
+        """The segments in the window and the closest point on each of them to the robot."""
+        indices = self._window()
+        wrapped = indices % self.geometry.segment_count
+        starts, vectors = self.geometry.starts[wrapped], self.geometry.vectors[wrapped]
+        t, distance = nearest_on_segments((x, y), starts, vectors)
+        return indices, starts, vectors, t, distance
+
+    @property
+    def finished(self) -> bool:
+        """If the robot got to the end of an open path."""
+        return self.geometry is not None and not self.geometry.is_closed and \
+            self.distance >= self.geometry.length - 1e-9
+
+    def _window(self) -> np.ndarray:
+        """The (unwrapped) indices of the segments checked this tick."""
+        geometry = self.geometry
+        count = geometry.segment_count
+
+        # far enough ahead to cover the whole lookahead circle
+        reach = self.distance + 2 * self.lookahead_distance
+        laps, local = divmod(reach, geometry.length) if geometry.is_closed else (0, min(reach, geometry.length))
+        end = int(laps) * count + int(np.searchsorted(geometry.arc_length, local, side="right"))
+
+        start = self.segment - self.back_segments
+        end = min(max(end, self.segment + 1), start + self.max_window)
+        if not geometry.is_closed:
+            start, end = max(start, 0), min(end, count)
+        else:
+            # a window bigger than the path would check segments twice
+            start = max(start, end - count)
+        return np.arange(start, end)
+
+    def _unwrapped_arc(self, indices: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """How far along the path points are, counting laps for closed paths."""
+        geometry = self.geometry
+        laps, wrapped = np.divmod(indices, geometry.segment_count)
+        return laps * geometry.length + geometry.arc_length[wrapped] + geometry.lengths[wrapped] * t
+
+    def _clip(self, distance: float) -> float:
+        return distance if self.geometry.is_closed else min(distance, self.geometry.length)
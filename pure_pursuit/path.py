@@ -0,0 +1,530 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# so waypoints can tell the paths they're in that they changed, without keeping the paths alive
+import weakref
+
+# for loading and saving paths
+import json
+import os
+
+# ---------------- PATH ----------------- #
+
+# the attributes of a waypoint that change the path when they change
+WAYPOINT_FIELDS = ("x", "y", "heading", "speed")
+
+
+class Waypoint:
+    """
+    This is the waypoint class which is what the robot will be using for its path.
+
+    Each waypoint has its (x, y) pos and a goal heading and speed
+    """
+
+    def __init__(self, x: float = 0, y: float = 0, heading: float = 0, speed: float = -1):
+        """
+        Notes:                                                                        ^
+            heading: goal heading in degrees (might change), 0 degrees is straight up |
+            speed: goal speed, -1 means automatic speed based on the path
+        """
+        # the paths this waypoint is in, they get told when it changes
+        object.__setattr__(self, "_paths", weakref.WeakSet())
+
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.speed = speed
+
+    def __setattr__(self, name, value):
+        # only actually changing a value makes the paths recalculate
+        if name in WAYPOINT_FIELDS and getattr(self, name, None) != value:
+            object.__setattr__(self, name, value)
+            for owner in self._paths:
+                owner.changed()
+        else:
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"Waypoint({self.x!r}, {self.y!r}, heading={self.heading!r}, speed={self.speed!r})"
+
+    def get_coord(self) -> tuple[float, float]:
+        """
+        So you can get the coordinate of a Waypoint
+
+        Return:
+            tuple of the x and y positions of the waypoint (x, y)
+        """
+        return self.x, self.y
+
+
+class PathGeometry:
+    """
+    Everything about the shape of a path that the renderer and the follower need, calculated once.
+    The arrays are read only since they are shared, a new PathGeometry is made when the path changes.
+    """
+
+    def __init__(self, coords: np.ndarray, headings: np.ndarray, speeds: np.ndarray, closed: bool = True,
+                 version: int = 0, measured: tuple | None = None):
+        """
+        Args:
+            coords: (n, 2) array of the waypoint (x, y) positions
+            headings: (n,) array of the waypoint goal headings
+            speeds: (n,) array of the waypoint goal speeds (-1 is automatic)
+            closed: if the path loops back around to the first waypoint
+            version: the version of the path this was calculated from
+            measured: the (vectors, lengths, arc_length) of these coords if they're already known
+                      (like when only part of a path was edited), so they aren't worked out again
+        """
+        self.coords = _read_only(np.asarray(coords, dtype=float).reshape(-1, 2))
+        self.headings = _read_only(np.asarray(headings, dtype=float))
+        self.speeds = _read_only(np.asarray(speeds, dtype=float))
+        self.is_closed = closed
+        self.version = version
+
+        # the points in the order they're connected, the first point is repeated at the end if it's a loop
+        if closed and len(self.coords) != 0:
+            self.closed = _read_only(np.concatenate((self.coords, self.coords[:1])))
+        else:
+            self.closed = self.coords
+
+        # segment i goes from closed[i] to closed[i + 1]
+        self.starts = self.closed[:-1]
+        if measured is not None:
+            self.vectors, self.lengths, self.arc_length = (_read_only(np.asarray(array, dtype=float))
+                                                           for array in measured)
+            self.length = float(self.arc_length[-1])
+            return
+
+        self.vectors = _read_only(np.diff(self.closed, axis=0))
+        self.lengths = _read_only(np.hypot(self.vectors[:, 0], self.vectors[:, 1]))
+
+        # how far along the path the start of each segment is, the last one is the total length
+        self.arc_length = _read_only(np.concatenate(([0.0], np.cumsum(self.lengths))))
+        self.length = float(self.arc_length[-1])
+
+    def __len__(self):
+        return len(self.coords)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.lengths)
+
+    def locate(self, distance):
+        """
+        Finds where a distance along the path is.
+
+        Args:
+            distance: how far along the path (wraps around for closed paths, clipped for open ones), can be an array
+
+        Return:
+            the segment index and how far along that segment (0 to 1) the distance is
+        """
+        if self.length == 0:
+            raise ValueError("the path has no length")
+
+        distance = np.asarray(distance, dtype=float)
+        distance = distance % self.length if self.is_closed else np.clip(distance, 0, self.length)
+
+        # binary search for the segment, zero length segments are skipped over because of side="right"
+        segment = np.clip(np.searchsorted(self.arc_length, distance, side="right") - 1, 0, self.segment_count - 1)
+        t = (distance - self.arc_length[segment]) / np.where(self.lengths[segment] > 0, self.lengths[segment], 1)
+        return segment, np.clip(t, 0, 1)
+
+    def point_at(self, distance) -> np.ndarray:
+        """The (x, y) point (or (n, 2) points) at a distance along the path."""
+        segment, t = self.locate(distance)
+        return self.starts[segment] + self.vectors[segment] * np.expand_dims(t, -1)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Makes an array read only (so the cached geometry can't be changed by accident) and returns it."""
+    array.flags.writeable = False
+    return array
+
+
+class Path:
+    """
+    A list of waypoints which remembers its geometry.
+
+    Every change to the path (or to a waypoint in it) adds one to the version, and the geometry
+    is only recalculated the next time it's asked for after the version changed.
+    """
+
+    def __init__(self, waypoints=(), closed: bool = True):
+        """
+        Args:
+            waypoints: the waypoints of the path, in order
+            closed: if the robot goes back to the first waypoint after the last one
+        """
+        self.waypoints = []
+        self.is_closed = closed
+        self.version = 0
+        self._geometry = None
+
+        self.extend(waypoints)
+
+    def changed(self):
+        """Called when anything about the path changes so the geometry is recalculated."""
+        self.version += 1
+
+    @property
+    def geometry(self) -> PathGeometry:
+        """The geometry of the path, only recalculated if the path changed since last time."""
+        if self._geometry is None or self._geometry.version != self.version:
+            self._geometry = PathGeometry(*self.to_arrays(), closed=self.is_closed, version=self.version)
+        return self._geometry
+
+    def to_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return:
+            the (n, 2) coordinates, (n,) headings and (n,) speeds of the waypoints
+        """
+        values = np.array([[waypoint.x, waypoint.y, waypoint.heading, waypoint.speed]
+                           for waypoint in self.waypoints], dtype=float).reshape(-1, 4)
+        return values[:, :2], values[:, 2], values[:, 3]
+
+    # --- list stuff --- #
+
+    def __len__(self):
+        return len(self.waypoints)
+
+    def __iter__(self):
+        return iter(self.waypoints)
+
+    def __getitem__(self, index):
+        return self.waypoints[index]
+
+    def __setitem__(self, index, waypoint):
+        if isinstance(index, slice):
+            waypoint = list(waypoint)
+        self._release(self.waypoints[index])
+        self.waypoints[index] = waypoint
+        for added in waypoint if isinstance(index, slice) else [waypoint]:
+            added._paths.add(self)
+        self.changed()
+
+    def __delitem__(self, index):
+        self._release(self.waypoints[index])
+        del self.waypoints[index]
+        self.changed()
+
+    def append(self, waypoint: Waypoint):
+        self.insert(len(self), waypoint)
+
+    def insert(self, index: int, waypoint: Waypoint):
+        self.waypoints.insert(index, waypoint)
+        waypoint._paths.add(self)
+        self.changed()
+
+    def extend(self, waypoints):
+        for waypoint in waypoints:
+            self.waypoints.append(waypoint)
+            waypoint._paths.add(self)
+        self.changed()
+
+    def _release(self, removed):
+        """Stops listening to waypoints that aren't in the path anymore."""
+        for waypoint in removed if isinstance(removed, list) else [removed]:
+            # the same waypoint can be in the path more than once
+            if sum(other is waypoint for other in self.waypoints) == 1:
+                waypoint._paths.discard(self)
+
+
+# the layout of one waypoint in a WaypointArray
+WAYPOINT_DTYPE = np.dtype([("x", np.float64), ("y", np.float64), ("heading", np.float64), ("speed", np.float64)])
+
+
+class WaypointView:
+    """
+    What you get when you index a WaypointArray, it acts like a Waypoint but the values live in the array.
+    Changing a value changes the array (and its version).
+    """
+
+    __slots__ = ("_owner", "_index")
+
+    def __init__(self, owner: "WaypointArray", index: int):
+        self._owner = owner
+        self._index = index
+
+    def _get(self, name):
+        return float(self._owner.data[name][self._index])
+
+    def _set(self, name, value):
+        # only actually changing a value makes the path recalculate
+        if self._owner.data[name][self._index] != value:
+            self._owner.data[name][self._index] = value
+            self._owner.changed()
+
+    x = property(lambda self: self._get("x"), lambda self, value: self._set("x", value))
+    y = property(lambda self: self._get("y"), lambda self, value: self._set("y", value))
+    heading = property(lambda self: self._get("heading"), lambda self, value: self._set("heading", value))
+    speed = property(lambda self: self._get("speed"), lambda self, value: self._set("speed", value))
+
+    def __repr__(self):
+        return f"WaypointView({self.x!r}, {self.y!r}, heading={self.heading!r}, speed={self.speed!r})"
+
+    def get_coord(self) -> tuple[float, float]:
+        """Same as Waypoint.get_coord"""
+        return self.x, self.y
+
+
+class WaypointArray(Path):
+    """
+    A path where the waypoints are stored in one numpy structured array (x, y, heading, speed)
+    instead of as thousands of Waypoint objects, for dense paths like sampled splines.
+
+    Indexing it gives a WaypointView, which acts like a Waypoint.
+    """
+
+    def __init__(self, data=None, closed: bool = True):
+        """
+        Args:
+            data: a structured array with WAYPOINT_DTYPE (it's used as is, not copied, so it can be memory mapped),
+                  or anything that can be turned into rows of (x, y[, heading[, speed]]), or Waypoints
+            closed: if the robot goes back to the first waypoint after the last one
+        """
+        self.data = as_waypoint_data(data)
+        self.is_closed = closed
+        self.version = 0
+        self._geometry = None
+
+    @classmethod
+    def from_path(cls, waypoints) -> "WaypointArray":
+        """Makes a WaypointArray with the same waypoints as a Path (or any list of Waypoints)."""
+        closed = getattr(waypoints, "is_closed", True)
+        if isinstance(waypoints, WaypointArray):
+            return cls(waypoints.data.copy(), closed=closed)
+        return cls(np.array([(waypoint.x, waypoint.y, waypoint.heading, waypoint.speed) for waypoint in waypoints],
+                            dtype=WAYPOINT_DTYPE), closed=closed)
+
+    def to_path(self) -> Path:
+        """Makes a normal Path of Waypoint objects (slow for big arrays)."""
+        return Path([Waypoint(*row) for row in self.data.tolist()], closed=self.is_closed)
+
+    def to_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return:
+            the (n, 2) coordinates, (n,) headings and (n,) speeds of the waypoints
+        """
+        return (np.column_stack((self.data["x"], self.data["y"])), np.array(self.data["heading"]),
+                np.array(self.data["speed"]))
+
+    # --- list stuff --- #
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return (WaypointView(self, index) for index in range(len(self.data)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # a copy, so changing it doesn't secretly change this path without changing the version
+            return WaypointArray(self.data[index].copy(), closed=self.is_closed)
+        return WaypointView(self, range(len(self.data))[index])
+
+    def __setitem__(self, index, waypoint):
+        if isinstance(index, slice):
+            self.data[index] = as_waypoint_data(waypoint)
+        else:
+            self.data[index] = as_waypoint_data([waypoint])[0]
+        self.changed()
+
+    def __delitem__(self, index):
+        self.data = np.delete(self.data, index)
+        self.changed()
+
+    def insert(self, index: int, waypoint):
+        self.data = np.insert(self.data, index, as_waypoint_data([waypoint]))
+        self.changed()
+
+    def extend(self, waypoints):
+        self.data = np.concatenate((self.data, as_waypoint_data(waypoints)))
+        self.changed()
+
+
+def as_waypoint_data(values) -> np.ndarray:
+    """
+    Turns waypoints into a structured array with WAYPOINT_DTYPE.
+
+    Args:
+        values: a structured array (returned as is if it already has the right dtype), Waypoints,
+                or rows of (x, y[, heading[, speed]]) where heading defaults to 0 and speed to -1
+
+    Return:
+        a 1D structured array with WAYPOINT_DTYPE
+    """
+    if values is None:
+        return np.zeros(0, dtype=WAYPOINT_DTYPE)
+
+    if isinstance(values, np.ndarray) and values.dtype.names is not None:
+        if values.dtype == WAYPOINT_DTYPE:
+            return values.reshape(-1)
+        data = np.zeros(values.size, dtype=WAYPOINT_DTYPE)
+        data["speed"] = -1
+        for name in WAYPOINT_FIELDS:
+            if name in values.dtype.names:
+                data[name] = values[name].reshape(-1)
+        return data
+
+    if not isinstance(values, np.ndarray):
+        values = [(value.x, value.y, value.heading, value.speed) if hasattr(value, "get_coord") else value
+                  for value in values]
+
+    rows = np.asarray(values, dtype=float)
+    if rows.size == 0:
+        return np.zeros(0, dtype=WAYPOINT_DTYPE)
+    if rows.ndim != 2 or not 2 <= rows.shape[1] <= 4:
+        raise ValueError(f"waypoint rows have to be (x, y[, heading[, speed]]), got an array of shape {rows.shape}")
+
+    data = np.zeros(len(rows), dtype=WAYPOINT_DTYPE)
+    data["speed"] = -1
+    for column, name in enumerate(WAYPOINT_FIELDS[:rows.shape[1]]):
+        data[name] = rows[:, column]
+    return data
+
+
+path = Path([
+    Waypoint(0.0, 0.0),
+    Waypoint(0.571194595265405, -0.4277145118491421),
+    Waypoint(1.1417537280142898, -0.8531042347260006),
+    Waypoint(1.7098876452457967, -1.2696346390611464),
+    Waypoint(2.2705328851607995, -1.6588899151216996),
+    Waypoint(2.8121159420106827, -1.9791445882187304),
+    Waypoint(3.314589274316711, -2.159795566252656),
+    Waypoint(3.7538316863009027, -2.1224619985315876),
+    Waypoint(4.112485112342358, -1.8323249172947023),
+    Waypoint(4.383456805594431, -1.3292669972090994),
+    Waypoint(4.557386228943757, -0.6928302521681386),
+    Waypoint(4.617455513800438, 0.00274597627737883),
+    Waypoint(4.55408382321606, 0.6984486966257434),
+    Waypoint(4.376054025556597, 1.3330664239172116),
+    Waypoint(4.096280073621794, 1.827159263675668),
+    Waypoint(3.719737492364894, 2.097949296701878),
+    Waypoint(3.25277928312066, 2.108933125822431),
+    Waypoint(2.7154386886417314, 1.9004760368018616),
+    Waypoint(2.1347012144725985, 1.552342808106984),
+    Waypoint(1.5324590525923942, 1.134035376721349),
+    Waypoint(0.9214084611203568, 0.6867933269918683),
+    Waypoint(0.30732366808208345, 0.22955002391894264),
+    Waypoint(-0.3075127599907512, -0.2301742560363831),
+    Waypoint(-0.9218413719658775, -0.6882173194028102),
+    Waypoint(-1.5334674079795052, -1.1373288016589413),
+    Waypoint(-2.1365993767877467, -1.5584414896876835),
+    Waypoint(-2.7180981380280307, -1.9086314914221845),
+    Waypoint(-3.2552809639439704, -2.1153141204181285),
+    Waypoint(-3.721102967810494, -2.0979137913841046),
+    Waypoint(-4.096907306768644, -1.8206318841755131),
+    Waypoint(-4.377088212533404, -1.324440752295139),
+    Waypoint(-4.555249804461285, -0.6910016662308593),
+    Waypoint(-4.617336323713965, 0.003734984720118972),
+    Waypoint(-4.555948690867849, 0.7001491248072772),
+    Waypoint(-4.382109193278264, 1.3376838311365633),
+    Waypoint(-4.111620918085742, 1.8386823176628544),
+    Waypoint(-3.7524648889185794, 2.1224985058331005),
+    Waypoint(-3.3123191098095615, 2.153588702898333),
+    Waypoint(-2.80975246649598, 1.9712114570096653),
+    Waypoint(-2.268856462266256, 1.652958931009528),
+    Waypoint(-1.709001159778989, 1.2664395490411673),
+    Waypoint(-1.1413833971013372, 0.8517589252820573),
+    Waypoint(-0.5710732645795573, 0.4272721367616211),
+])
+
+
+def convert_to_list(list_waypoints=path) -> list[tuple[float, float]]:
+    """Converts the list of waypoints to a list of tuples with the waypoint coordinates."""
+    return [waypoint.get_coord() for waypoint in list_waypoints]
+
+
+# ---------------- LOADING AND SAVING ----------------- #
+
+def load_waypoints(filename, mmap: bool = False, closed: bool = True) -> WaypointArray:
+    """
+    Loads a path from a .csv, .json, .npy or .npz file in one go.
+
+    The csv can have a header (x, y, heading, speed in any order) or just be columns in that order,
+    the json can be a list of [x, y, ...] rows, a list of {"x": ..., "y": ...} objects, or an object of columns,
+    the npy can be a structured array with WAYPOINT_DTYPE or an (n, 2 to 4) float array,
+    and the npz needs a "waypoints" array (or just has one array) like the npy.
+
+    Args:
+        filename: the file to load
+        mmap: memory maps a .npy file instead of reading it, so huge paths load instantly (changes stay in memory)
+        closed: if the robot goes back to the first waypoint after the last one
+
+    Return:
+        the loaded WaypointArray
+    """
+    suffix = os.path.splitext(str(filename))[1].lower()
+
+    if suffix == ".npy":
+        # copy on write, so the file is never changed by editing the path
+        return WaypointArray(_structured(np.load(filename, mmap_mode="c" if mmap else None)), closed=closed)
+
+    if suffix == ".npz":
+        # zip files can't be memory mapped
+        with np.load(filename) as archive:
+            key = "waypoints" if "waypoints" in archive.files else archive.files[0]
+            return WaypointArray(_structured(archive[key]), closed=closed)
+
+    if suffix == ".csv":
+        with open(filename) as file:
+            first = file.readline()
+        names = [name.strip().lower() for name in first.split(",")]
+        if set(names) <= set(WAYPOINT_FIELDS) and {"x", "y"} <= set(names):
+            # the header says which column is which
+            rows = np.loadtxt(filename, delimiter=",", skiprows=1, ndmin=2)
+            columns = np.zeros(len(rows), dtype=[(name, np.float64) for name in names])
+            for column, name in enumerate(names):
+                columns[name] = rows[:, column]
+            return WaypointArray(as_waypoint_data(columns), closed=closed)
+        return WaypointArray(as_waypoint_data(np.loadtxt(filename, delimiter=",", ndmin=2)), closed=closed)
+
+    if suffix == ".json":
+        with open(filename) as file:
+            values = json.load(file)
+        if isinstance(values, dict):
+            # an object of columns
+            columns = np.zeros(len(values["x"]), dtype=[(name, np.float64) for name in values])
+            for name, column in values.items():
+                columns[name] = column
+            return WaypointArray(as_waypoint_data(columns), closed=closed)
+        if values and isinstance(values[0], dict):
+            # a list of objects
+            values = [[row.get("x", 0), row.get("y", 0), row.get("heading", 0), row.get("speed", -1)]
+                      for row in values]
+        return WaypointArray(as_waypoint_data(values), closed=closed)
+
+    raise ValueError(f"can't load waypoints from a {suffix or 'file without an extension'}, "
+                     f"use .csv, .json, .npy or .npz")
+
+
+def save_waypoints(filename, waypoints):
+    """
+    Saves a path (a Path, WaypointArray or list of Waypoints) to a .csv, .json, .npy or .npz file,
+    in a way that load_waypoints can read back.
+    """
+    data = waypoints.data if isinstance(waypoints, WaypointArray) else as_waypoint_data(waypoints)
+    suffix = os.path.splitext(str(filename))[1].lower()
+
+    if suffix == ".npy":
+        np.save(filename, data)
+    elif suffix == ".npz":
+        np.savez(filename, waypoints=data)
+    elif suffix == ".csv":
+        np.savetxt(filename, np.column_stack([data[name] for name in WAYPOINT_FIELDS]), delimiter=",",
+                   header=",".join(WAYPOINT_FIELDS), comments="", fmt="%.17g")
+    elif suffix == ".json":
+        with open(filename, "w") as file:
+            json.dump({name: data[name].tolist() for name in WAYPOINT_FIELDS}, file)
+    else:
+        raise ValueError(f"can't save waypoints to a {suffix or 'file without an extension'}, "
+                         f"use .csv, .json, .npy or .npz")
+
+
+def _structured(array: np.ndarray) -> np.ndarray:
+    """Keeps structured arrays as they are (so memory maps stay memory maps) and converts plain float rows."""
+    if array.dtype == WAYPOINT_DTYPE:
+        return array.reshape(-1)
+    return as_waypoint_data(array)
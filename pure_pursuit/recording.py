@@ -0,0 +1,242 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# the header of the file
+import json
+
+# the order the states are stored in, and the clock used for playing back
+from .kinematics import STATE_FIELDS, interpolate_states
+import time
+
+# ---------------- FILE FORMAT ----------------- #
+
+# the file starts with MAGIC, then a json header padded with spaces to HEADER_SIZE bytes, then the chunks.
+# every chunk holds chunk_size rows stored column by column (all the times, then all the xs, etc.)
+# so reading one column only touches that column, and the file only ever grows by whole chunks
+MAGIC = b"PPTRAJ01"
+HEADER_SIZE = 4096
+
+
+def _write_header(file, header: dict):
+    text = json.dumps(header).encode()
+    if len(MAGIC) + len(text) > HEADER_SIZE:
+        raise ValueError("the trajectory metadata is too big for the header")
+    file.seek(0)
+    file.write(MAGIC + text.ljust(HEADER_SIZE - len(MAGIC)))
+
+
+def _read_header(filename) -> dict:
+    with open(filename, "rb") as file:
+        start = file.read(HEADER_SIZE)
+    if not start.startswith(MAGIC):
+        raise ValueError(f"{filename} isn't a trajectory file")
+    return json.loads(start[len(MAGIC):].decode())
+
+
+# ---------------- RECORDING ----------------- #
+
+
+class TrajectoryRecorder:
+    """
+    Writes the state of every tick into a memory mapped file, without keeping anything in python lists.
+
+    The file is made with room for some chunks up front and doubles whenever it's full.
+    It can be used in a with statement, which closes it at the end.
+    """
+
+    def __init__(self, filename, fields=STATE_FIELDS, chunk_size: int = 4096, chunks: int = 16,
+                 metadata: dict | None = None):
+        """
+        Args:
+            filename: where the trajectory is written (it's overwritten)
+            fields: the names of the columns
+            chunk_size: how many rows are in each chunk
+            chunks: how many chunks of room are made at the start
+            metadata: anything else worth remembering about the run (dt, the robot's maximums, etc.)
+        """
+        self.filename = filename
+        self.fields = tuple(fields)
+        self.chunk_size = chunk_size
+        self.metadata = dict(metadata or {})
+        self.rows = 0
+
+        self.file = open(filename, "w+b")
+        self._write_header()
+        self._map(max(chunks, 1))
+
+    def _write_header(self):
+        _write_header(self.file, {"fields": self.fields, "chunk_size": self.chunk_size, "dtype": "<f8",
+                                  "rows": self.rows, "metadata": self.metadata})
+
+    def _map(self, chunks: int):
+        """Makes the file big enough for chunks chunks and maps it."""
+        self.file.truncate(HEADER_SIZE + chunks * len(self.fields) * self.chunk_size * 8)
+        self.file.flush()
+        self.data = np.memmap(self.file, dtype="<f8", mode="r+", offset=HEADER_SIZE,
+                              shape=(chunks, len(self.fields), self.chunk_size))
+
+    def record(self, state):
+        """Adds one row, in the order of the fields."""
+        chunk, index = divmod(self.rows, self.chunk_size)
+        if chunk == len(self.data):
+            self.data.flush()
+            self._map(2 * len(self.data))
+        self.data[chunk, :, index] = state
+        self.rows += 1
+
+    def record_many(self, states: np.ndarray):
+        """Adds a lot of rows at once, like the array returned by Simulator.run."""
+        states = np.asarray(states, dtype=float).reshape(-1, len(self.fields))
+        while len(states):
+            chunk, index = divmod(self.rows, self.chunk_size)
+            if chunk == len(self.data):
+                self.data.flush()
+                self._map(2 * len(self.data))
+            count = min(self.chunk_size - index, len(states))
+            self.data[chunk, :, index:index + count] = states[:count].T
+            self.rows += count
+            states = states[count:]
+
+    def flush(self):
+        """Makes sure everything recorded so far is in the file, so it can be read while still recording."""
+        self.data.flush()
+        self._write_header()
+        self.file.flush()
+
+    def close(self):
+        """Writes the header and cuts off the chunks that were never used."""
+        if self.file.closed:
+            return
+        self.data.flush()
+        used = -(-self.rows // self.chunk_size)
+        del self.data
+        self.file.truncate(HEADER_SIZE + used * len(self.fields) * self.chunk_size * 8)
+        self._write_header()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Reads a trajectory file by memory mapping it, so nothing is loaded until it's used.
+    """
+
+    def __init__(self, filename):
+        header = _read_header(filename)
+        self.filename = filename
+        self.fields = tuple(header["fields"])
+        self.chunk_size = header["chunk_size"]
+        self.metadata = header.get("metadata", {})
+        self.rows = header["rows"]
+
+        chunks = -(-self.rows // self.chunk_size)
+        self.data = np.memmap(filename, dtype=header["dtype"], mode="r", offset=HEADER_SIZE,
+                              shape=(chunks, len(self.fields), self.chunk_size)) if chunks else \
+            np.zeros((0, len(self.fields), self.chunk_size))
+
+    def __len__(self):
+        return self.rows
+
+    def row(self, index: int) -> np.ndarray:
+        """One row (a state in the order of the fields)."""
+        if not -self.rows <= index < self.rows:
+            raise IndexError("row index out of range")
+        chunk, index = divmod(index % self.rows, self.chunk_size)
+        return np.array(self.data[chunk, :, index])
+
+    def rows_between(self, start: int, stop: int) -> np.ndarray:
+        """The rows from start to stop as a (stop - start, fields) array."""
+        start, stop, _ = slice(start, stop).indices(self.rows)
+        first, last = start // self.chunk_size, -(-stop // self.chunk_size)
+        block = self.data[first:last].transpose(0, 2, 1).reshape(-1, len(self.fields))
+        return np.array(block[start - first * self.chunk_size:stop - first * self.chunk_size])
+
+    def column(self, name: str) -> np.ndarray:
+        """A whole column, only that column is read from the file."""
+        return self.data[:, self.fields.index(name), :].reshape(-1)[:self.rows]
+
+
+# ---------------- REPLAY ----------------- #
+
+
+class TrajectoryPlayer:
+    """
+    Plays a recorded trajectory back on a clock, it works like a FixedRateLoop for the animation
+    but the states come from the file instead of the simulation.
+
+    The rows are streamed through with a cursor, so it never has to read the whole file.
+    """
+
+    def __init__(self, reader: TrajectoryReader, clock=time.perf_counter, speed: float = 1.0, loop: bool = False):
+        """
+        Args:
+            reader: the recorded trajectory
+            clock: the function returning the current time in seconds
+            speed: how many times faster than real time it's played
+            loop: start again from the beginning at the end
+        """
+        if len(reader) == 0:
+            raise ValueError("the trajectory is empty")
+
+        self.reader = reader
+        self.clock = clock
+        self.speed = speed
+        self.loop = loop
+
+        # the names of the values in the states
+        self.fields = reader.fields
+
+        self.time_index = reader.fields.index("time")
+        self.first_time = reader.row(0)[self.time_index]
+        self.last_time = reader.row(-1)[self.time_index]
+
+        # the row at or before the clock, and the one after it
+        self.cursor = 0
+        self.before = self.after = reader.row(0)
+        self.alpha = 0.0
+        self.start_time = None
+
+    @property
+    def finished(self) -> bool:
+        return not self.loop and self.cursor == len(self.reader) - 1
+
+    def advance(self) -> float:
+        """
+        Moves the cursor forward to the clock.
+
+        Return:
+            how far (0 to 1) the clock is between the row before it and the row after it
+        """
+        now = self.clock()
+        if self.start_time is None:
+            self.start_time = now
+        playback_time = self.first_time + (now - self.start_time) * self.speed
+
+        if self.loop and playback_time > self.last_time > self.first_time:
+            # back to the start
+            self.start_time = now
+            self.cursor = 0
+            playback_time = self.first_time
+
+        # streaming forward through the rows
+        last = len(self.reader) - 1
+        while self.cursor < last and self.reader.row(self.cursor + 1)[self.time_index] <= playback_time:
+            self.cursor += 1
+
+        self.before = self.reader.row(self.cursor)
+        self.after = self.reader.row(self.cursor + 1) if self.cursor < last else self.before
+
+        start, end = self.before[self.time_index], self.after[self.time_index]
+        self.alpha = min(max((playback_time - start) / (end - start), 0.0), 1.0) if end > start else 0.0
+        return self.alpha
+
+    def interpolated(self, alpha: float | None = None) -> tuple:
+        """The state at the clock, in the order of the fields."""
+        return interpolate_states(self.before, self.after, self.alpha if alpha is None else alpha,
+                                  self.reader.fields)
@@ -0,0 +1,285 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# the compiled trajectories are saved under a hash of everything they're made from
+import hashlib
+import json
+import os
+
+# the paths, smoothing them, and how fast each part can be driven
+from .path import WaypointArray, as_waypoint_data, load_waypoints
+from .spline import SplinePath
+from .velocity_profile import VelocityProfile
+from .kinematics import RobotModel
+
+# the compiled trajectory is a trajectory file, so it's memory mapped when it's loaded and can be played back
+from .recording import TrajectoryRecorder, TrajectoryReader
+
+# ---------------- ROUTINES ----------------- #
+
+# the columns of a compiled trajectory, "path" is which path of the routine the row is on
+ROUTINE_FIELDS = ("time", "x", "y", "heading", "velocity", "velocity_angle", "path")
+
+# bump this when compiling changes so old cached trajectories aren't used
+COMPILE_VERSION = 2
+
+
+class Routine:
+    """
+    An autonomous routine: paths driven one after another, starting and stopping at the ends of each open one.
+    The robot turns between the waypoints' headings as it goes and never goes faster than their speeds.
+    """
+
+    def __init__(self, paths, name: str = "routine", spline: bool = False, samples_per_segment: int = 32,
+                 max_velocity: float = 20, max_acceleration: float = 1, max_turn_velocity: float = 3.35,
+                 dt: float = 1 / 50):
+        """
+        Args:
+            paths: the paths in order (Paths or WaypointArrays, a closed one is driven for one lap)
+            name: what the routine is called
+            spline: smooth every path into a spline
+            samples_per_segment: how many points each spline segment is sampled into
+            max_velocity, max_acceleration, max_turn_velocity: the robot's maximums (like RobotModel)
+            dt: the seconds between the rows of the compiled trajectory
+        """
+        if dt <= 0:
+            raise ValueError("dt has to be positive")
+        if max_acceleration <= 0:
+            raise ValueError("max_acceleration has to be positive")
+        self.paths = list(paths)
+        self.name = name
+        self.spline = spline
+        self.samples_per_segment = samples_per_segment
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.max_turn_velocity = max_turn_velocity
+        self.dt = dt
+
+    @classmethod
+    def load(cls, filename) -> "Routine":
+        """
+        Reads a routine from json, like
+        {"name": "left side", "spline": true, "paths": ["first.csv", {"waypoints": [[0, 0, 0, -1], [1, 2, 90, 5]],
+         "closed": false}]}
+        A path is a waypoint file (relative to the routine file) or the waypoint rows themselves,
+        everything else is passed along to Routine.
+        """
+        with open(filename) as file:
+            settings = json.load(file)
+
+        folder = os.path.dirname(os.path.abspath(filename))
+        paths = []
+        for entry in settings.pop("paths"):
+            if isinstance(entry, str):
+                paths.append(load_waypoints(os.path.join(folder, entry), closed=False))
+            else:
+                paths.append(WaypointArray(entry["waypoints"], closed=entry.get("closed", False)))
+        settings.setdefault("name", os.path.splitext(os.path.basename(filename))[0])
+        return cls(paths, **settings)
+
+    def settings(self) -> dict:
+        """Everything about how the routine is compiled, other than the paths."""
+        return {"spline": self.spline, "samples_per_segment": self.samples_per_segment,
+                "max_velocity": self.max_velocity, "max_acceleration": self.max_acceleration,
+                "max_turn_velocity": self.max_turn_velocity, "dt": self.dt}
+
+    def key(self) -> str:
+        """
+        The hash the compiled trajectory is saved under: the raw waypoints and the settings, so nothing
+        has to be calculated to find out if it's already compiled. The name isn't part of it.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"settings": self.settings(), "closed": [path.is_closed for path in self.paths],
+                                  "version": COMPILE_VERSION}, sort_keys=True).encode())
+        for path in self.paths:
+            data = path.data if isinstance(path, WaypointArray) else as_waypoint_data(path)
+            digest.update(np.ascontiguousarray(data).tobytes())
+            # so the waypoints of two paths can't be split up differently and get the same hash
+            digest.update(b"|")
+        return digest.hexdigest()
+
+    # --- compiling --- #
+
+    def compile(self) -> np.ndarray:
+        """
+        Samples the whole routine on a clock.
+
+        Return:
+            a (rows, len(ROUTINE_FIELDS)) array, a row every dt seconds plus the very end
+        """
+        pieces = []
+        start_time = 0.0
+        for index, path in enumerate(self.paths):
+            piece = self._compile_path(SplinePath(path, self.samples_per_segment) if self.spline else path)
+            if piece is None:
+                continue
+            piece[:, 0] += start_time
+            piece[:, -1] = index
+            # the next path starts where this one stopped
+            start_time = piece[-1, 0]
+            if pieces:
+                piece = piece[1:] if len(piece) > 1 else piece[:0]
+            pieces.append(piece)
+
+        if not pieces:
+            return np.zeros((0, len(ROUTINE_FIELDS)))
+        return np.concatenate(pieces)
+
+    def _compile_path(self, path) -> np.ndarray | None:
+        geometry = path.geometry
+        if len(geometry.coords) < 2 or geometry.length == 0:
+            return None
+
+        # --- speeds along the path --- #
+
+        profile = VelocityProfile(path, self.max_velocity, self.max_acceleration, self.max_turn_velocity,
+                                  start_speed=0, end_speed=0)
+        speeds = profile.speeds
+
+        # the speeds in units per second (velocity / 100 units per 30 ms frame is velocity / 100 * FPS per second)
+        # and MAX_ACCELERATION (velocity per frame) in units per second squared
+        speeds = speeds / 100 * RobotModel.FPS
+        acceleration = self.max_acceleration * RobotModel.FPS ** 2 / 100
+        lengths = geometry.lengths
+
+        # the profile changes v^2 evenly along each segment, so a segment takes 2L / (v0 + v1)
+        # one that starts and ends stopped (like the only segment of a two point path, or next to a speed 0 waypoint)
+        # speeds up for the first half and slows down for the second, which takes 2 sqrt(L / a)
+        total = speeds[:-1] + speeds[1:]
+        stopped = total <= 1e-9
+        with np.errstate(divide="ignore", invalid="ignore"):
+            durations = np.where(stopped, 2 * np.sqrt(lengths / acceleration), 2 * lengths / total)
+        durations[lengths <= 0] = 0
+        times = np.concatenate(([0.0], np.cumsum(durations)))
+
+        # --- headings along the path --- #
+
+        # the waypoints' headings are where each waypoint is (a spline's samples say which waypoint
+        # they came from), and the robot turns the short way between them
+        sources = np.asarray(getattr(geometry, "sources", np.arange(len(geometry.coords))))
+        knots = np.flatnonzero(np.diff(sources, prepend=-1))
+        knot_distances = geometry.arc_length[knots]
+        knot_headings = np.asarray(geometry.headings)[knots]
+        if geometry.is_closed:
+            knot_distances = np.append(knot_distances, geometry.length)
+            knot_headings = np.append(knot_headings, knot_headings[0])
+        knot_headings = np.degrees(np.unwrap(np.radians(knot_headings)))
+
+        # --- sampling on the clock --- #
+
+        clock = np.append(np.arange(0, times[-1], self.dt), times[-1])
+
+        step = np.clip(np.searchsorted(times, clock, side="right") - 1, 0, len(durations) - 1)
+        elapsed = np.minimum(clock - times[step], durations[step])
+        start_speed, end_speed, duration = speeds[step], speeds[step + 1], durations[step]
+
+        # the speed changes evenly over each segment, so the distance along it is a parabola in time
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = np.where(duration > 0, (end_speed - start_speed) / duration, 0)
+        velocity = start_speed + change * elapsed
+        travelled = start_speed * elapsed + change * elapsed ** 2 / 2
+
+        # or it speeds up and slows down again if it starts and ends stopped
+        stopped = stopped[step]
+        left = duration - elapsed
+        first_half = elapsed <= duration / 2
+        velocity = np.where(stopped, acceleration * np.where(first_half, elapsed, left), velocity)
+        travelled = np.where(stopped, np.where(first_half, acceleration * elapsed ** 2 / 2,
+                                               lengths[step] - acceleration * left ** 2 / 2), travelled)
+
+        distance = geometry.arc_length[step] + np.clip(travelled, 0, lengths[step])
+        # a little before the end so a closed path's last point isn't wrapped around to its first segment
+        distance = np.minimum(distance, geometry.length * (1 - 1e-12))
+
+        segment, _ = geometry.locate(distance)
+        vectors = geometry.vectors[segment]
+
+        rows = np.empty((len(clock), len(ROUTINE_FIELDS)))
+        rows[:, 0] = clock
+        rows[:, 1:3] = geometry.point_at(distance)
+        rows[:, 3] = np.interp(distance, knot_distances, knot_headings) % 360
+        rows[:, 4] = velocity * 100 / RobotModel.FPS
+        # 0 is up and counterclockwise is positive, like the robot's velocity_angle
+        rows[:, 5] = np.degrees(np.arctan2(-vectors[:, 0], vectors[:, 1])) % 360
+        return rows
+
+
+# ---------------- CACHE ----------------- #
+
+
+class RoutineCache:
+    """
+    Compiled routines saved as trajectory files named by the routine's hash, so a routine that hasn't changed
+    is never compiled twice. Loading one only memory maps the file, which is what makes switching instant.
+    """
+
+    def __init__(self, folder: str = ".routine_cache"):
+        self.folder = folder
+        # how many routines were compiled and how many came from the cache
+        self.compiled = 0
+        self.hits = 0
+
+    def filename(self, routine: Routine) -> str:
+        return os.path.join(self.folder, routine.key() + ".traj")
+
+    def get(self, routine: Routine, force: bool = False) -> TrajectoryReader:
+        """
+        The compiled trajectory of a routine, compiled and saved first if it isn't in the cache.
+
+        Args:
+            routine: the routine
+            force: compile it again even if it's cached
+        """
+        filename = self.filename(routine)
+        if not force and os.path.exists(filename):
+            self.hits += 1
+            return TrajectoryReader(filename)
+
+        rows = routine.compile()
+        os.makedirs(self.folder, exist_ok=True)
+
+        # written to a temporary file and moved, so a half written trajectory is never read
+        temporary = f"{filename}.{os.getpid()}.tmp"
+        with TrajectoryRecorder(temporary, ROUTINE_FIELDS, chunks=1,
+                                metadata={"name": routine.name, "settings": routine.settings(),
+                                          "paths": len(routine.paths)}) as recorder:
+            recorder.record_many(rows)
+        os.replace(temporary, filename)
+        self.compiled += 1
+        return TrajectoryReader(filename)
+
+    def clear(self):
+        """Deletes every cached trajectory."""
+        if not os.path.isdir(self.folder):
+            return
+        for name in os.listdir(self.folder):
+            if name.endswith(".traj"):
+                os.remove(os.path.join(self.folder, name))
+
+
+# --------------- MAIN --------------- #
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Compiles autonomous routines into trajectories and caches them.")
+    parser.add_argument("routines", nargs="+", help="routine files (json, see Routine.load)")
+    parser.add_argument("--cache", default=".routine_cache", help="where the compiled trajectories are saved")
+    parser.add_argument("--force", action="store_true", help="compile them again even if they're cached")
+    args = parser.parse_args()
+
+    cache = RoutineCache(args.cache)
+    for filename in args.routines:
+        start = time.perf_counter()
+        routine = Routine.load(filename)
+        cached = not args.force and os.path.exists(cache.filename(routine))
+        reader = cache.get(routine, force=args.force)
+        print(f"{routine.name}: {len(reader)} rows, {reader.row(-1)[0]:.2f} s long, "
+              f"{'loaded' if cached else 'compiled'} in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"-> {reader.filename}")
+
+
+if __name__ == "__main__":
+    main()
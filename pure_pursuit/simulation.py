@@ -0,0 +1,192 @@
+# --------------- DEPENDENCIES --------------- #
+# for storing the states of a run
+import numpy as np
+
+# so the headless runner can show off how fast it is
+import time
+
+# the robot being simulated
+from .kinematics import RobotModel, STATE_FIELDS, INTEGRATORS, interpolate_states
+
+# --------------- CLASSES --------------- #
+
+class Simulator:
+    """
+    Runs a RobotModel with a fixed timestep as fast as the computer can go, no window needed.
+    """
+
+    def __init__(self, robot: RobotModel, dt: float = 1 / 200, controller=None, recorder=None):
+        """
+        Args:
+            robot: the robot being simulated
+            dt: the timestep in seconds
+            controller: something called as controller(robot) before every step to set the accelerations,
+                        if it has a finished(robot) method the run stops once that returns True
+            recorder: something with a record(state) method (like a TrajectoryRecorder) which gets every state
+        """
+        if dt <= 0:
+            raise ValueError("dt has to be positive")
+
+        self.robot = robot
+        self.dt = dt
+        self.controller = controller
+        self.recorder = recorder
+
+        if recorder is not None:
+            recorder.record(robot.get_state())
+
+    def step(self):
+        """Does a single tick: the controller then the physics."""
+        if self.controller is not None:
+            self.controller(self.robot)
+        self.robot.step(self.dt)
+        if self.recorder is not None:
+            self.recorder.record(self.robot.get_state())
+
+    def run(self, duration: float, record: bool = True) -> np.ndarray | None:
+        """
+        Simulates for duration seconds, or until the controller says it's finished.
+
+        Args:
+            duration: the most seconds to simulate
+            record: if the state of every tick should be returned
+
+        Return:
+            an array of shape (ticks + 1, len(STATE_FIELDS)) starting with the initial state,
+            or None if record is False
+        """
+        steps = int(round(duration / self.dt))
+        finished = getattr(self.controller, "finished", None)
+
+        states = np.empty((steps + 1, len(STATE_FIELDS))) if record else None
+        if record:
+            states[0] = self.robot.get_state()
+
+        ticks = 0
+        while ticks < steps:
+            if finished is not None and finished(self.robot):
+                break
+            self.step()
+            ticks += 1
+            if record:
+                states[ticks] = self.robot.get_state()
+
+        return states[:ticks + 1] if record else None
+
+
+class FixedRateLoop:
+    """
+    Runs a Simulator on its own clock for something that draws at whatever rate it can (like the animation).
+
+    Every time advance() is called, it does however many fixed steps the clock says are due, so the
+    robot's path only depends on dt and never on how fast the frames are drawn. The drawing gets the state
+    interpolated between the last two steps, and any states in between frames are just never drawn.
+    """
+
+    def __init__(self, simulator: Simulator, clock=time.perf_counter, max_steps: int = 100):
+        """
+        Args:
+            simulator: the simulator being run, its dt is the fixed step
+            clock: the function returning the current time in seconds
+            max_steps: the most steps done in one advance, if it's more behind than that the simulation
+                       slows down (instead of freezing the window), but it still takes the same path
+        """
+        self.simulator = simulator
+        self.clock = clock
+        self.max_steps = max_steps
+
+        # the names of the values in the states
+        self.fields = STATE_FIELDS
+
+        self.previous = simulator.robot.get_state()
+        self.current = self.previous
+
+        # how much time the simulation owes, always less than one step after advance()
+        self.accumulator = 0.0
+        self.last_time = None
+
+        # how many steps the last advance did, and how many times the simulation had to slow down
+        self.steps = 0
+        self.dropped = 0
+
+    def advance(self) -> float:
+        """
+        Catches the simulation up to the clock.
+
+        Return:
+            how far (0 to 1) the clock is between the last two steps
+        """
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        dt = self.simulator.dt
+        self.steps = 0
+        while self.accumulator >= dt:
+            if self.steps == self.max_steps:
+                # too far behind to catch up, the time that's left is forgotten
+                self.accumulator = 0.0
+                self.dropped += 1
+                break
+            self.previous = self.current
+            self.simulator.step()
+            self.current = self.simulator.robot.get_state()
+            self.accumulator -= dt
+            self.steps += 1
+
+        return self.accumulator / dt
+
+    def interpolated(self, alpha: float | None = None) -> tuple:
+        """
+        The state between the last two steps, in the order of STATE_FIELDS.
+
+        Args:
+            alpha: how far between them, defaults to where the clock was at the last advance()
+        """
+        if alpha is None:
+            alpha = self.accumulator / self.simulator.dt
+        return interpolate_states(self.previous, self.current, alpha)
+
+
+# --------------- MAIN --------------- #
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Runs the robot without drawing anything.")
+    parser.add_argument("duration", type=float, nargs="?", default=120, help="seconds to simulate")
+    parser.add_argument("--dt", type=float, default=1 / 200, help="timestep in seconds")
+    parser.add_argument("--follow", action="store_true", help="follow the default path with pure pursuit")
+    parser.add_argument("--lookahead", type=float, default=0.5, help="lookahead distance when following")
+    parser.add_argument("--speed", type=float, default=8, help="speed when following")
+    parser.add_argument("--laps", type=float, default=None, help="laps of the path before stopping")
+    parser.add_argument("--profile", action="store_true", help="use a velocity profile instead of --speed")
+    parser.add_argument("--integrator", choices=INTEGRATORS, default="euler",
+                        help="how each step is integrated (arc stays accurate with a much bigger --dt)")
+    args = parser.parse_args()
+
+    if args.follow:
+        from .follower import PurePursuit
+        from .path import path
+
+        from .velocity_profile import VelocityProfile
+
+        robot = RobotModel(velocity=0, turn_velocity=0, integrator=args.integrator)
+        profile = VelocityProfile.for_robot(path, robot) if args.profile else None
+        controller = PurePursuit(path, args.lookahead, speed=args.speed, laps=args.laps, profile=profile)
+        simulator = Simulator(robot, dt=args.dt, controller=controller)
+    else:
+        simulator = Simulator(RobotModel(integrator=args.integrator), dt=args.dt)
+
+    start = time.perf_counter()
+    states = simulator.run(args.duration)
+    elapsed = time.perf_counter() - start
+
+    print(f"simulated {states[-1, 0]:g} s ({len(states) - 1} ticks) in {elapsed * 1000:.1f} ms")
+    print(f"final state: " + ", ".join(f"{name}={value:.4f}" for name, value in zip(STATE_FIELDS, states[-1])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# the splines are sampled into a normal path geometry so everything else can use them
+from .path import PathGeometry, _read_only
+
+# ---------------- HERMITE ----------------- #
+
+
+def hermite_basis(u: np.ndarray, derivative: int = 0) -> np.ndarray:
+    """
+    The cubic hermite basis functions (or their derivatives) at the parameters u.
+
+    Return:
+        (len(u), 4) array, the weights of (start point, start tangent, end point, end tangent)
+    """
+    u = np.asarray(u, dtype=float)
+    if derivative == 0:
+        return np.stack((2 * u ** 3 - 3 * u ** 2 + 1, u ** 3 - 2 * u ** 2 + u, -2 * u ** 3 + 3 * u ** 2,
+                         u ** 3 - u ** 2), axis=-1)
+    if derivative == 1:
+        return np.stack((6 * u ** 2 - 6 * u, 3 * u ** 2 - 4 * u + 1, -6 * u ** 2 + 6 * u, 3 * u ** 2 - 2 * u), axis=-1)
+    if derivative == 2:
+        return np.stack((12 * u - 6, 6 * u - 4, -12 * u + 6, 6 * u - 2), axis=-1)
+    raise ValueError("only the 0th, 1st and 2nd derivatives are supported")
+
+
+def catmull_rom_tangents(points: np.ndarray, closed: bool = True) -> np.ndarray:
+    """
+    The tangents at each point for a (uniform) Catmull-Rom spline.
+    The ends of an open path use the direction to their only neighbor.
+    """
+    if len(points) < 2:
+        return np.zeros_like(points)
+    if closed:
+        return (np.roll(points, -1, axis=0) - np.roll(points, 1, axis=0)) / 2
+
+    tangents = np.empty_like(points)
+    tangents[1:-1] = (points[2:] - points[:-2]) / 2
+    tangents[0] = points[1] - points[0]
+    tangents[-1] = points[-1] - points[-2]
+    return tangents
+
+
+def catmull_rom_tangents_at(points: np.ndarray, indices: np.ndarray, closed: bool = True) -> np.ndarray:
+    """The same tangents as catmull_rom_tangents, but only at some of the points."""
+    indices = np.asarray(indices)
+    count = len(points)
+    if count < 2:
+        return np.zeros((len(indices), 2))
+    if closed:
+        return (points[(indices + 1) % count] - points[(indices - 1) % count]) / 2
+
+    # the ends only have one neighbor, so their difference isn't halved
+    after, before = points[np.minimum(indices + 1, count - 1)], points[np.maximum(indices - 1, 0)]
+    scale = np.where((indices == 0) | (indices == count - 1), 1.0, 0.5)
+    return (after - before) * scale[:, None]
+
+
+def heading_tangents(tangents: np.ndarray, headings: np.ndarray) -> np.ndarray:
+    """
+    Points the tangents in the direction of the waypoint headings (0 is up, counterclockwise)
+    but keeps their length, so the spline still bends about as much.
+    """
+    radians = np.radians(headings)
+    size = np.hypot(tangents[:, 0], tangents[:, 1])
+    return np.column_stack((-np.sin(radians), np.cos(radians))) * size[:, None]
+
+
+# ---------------- SAMPLED SPLINE ----------------- #
+
+
+class SplineGeometry(PathGeometry):
+    """
+    The geometry of a spline sampled into lots of short segments, plus the tangent and curvature at every sample.
+
+    The samples work as a lookup table from arc length to everything else: finding a distance is a binary search,
+    then the neighboring samples are interpolated.
+    """
+
+    def __init__(self, samples: np.ndarray, tangents: np.ndarray, curvature: np.ndarray, sources: np.ndarray,
+                 headings: np.ndarray, speeds: np.ndarray, closed: bool = True, version: int = 0,
+                 measured: tuple | None = None):
+        """
+        Args:
+            samples: (n, 2) positions sampled along the spline
+            tangents: (n, 2) unit tangents at each sample
+            curvature: (n,) signed curvature at each sample (positive turns counterclockwise)
+            sources: (n,) which waypoint each sample's spline segment starts from
+            headings: (n,) goal heading at each sample
+            speeds: (n,) goal speed at each sample (-1 is automatic)
+            closed: if the path loops back around
+            version: the version of the path this was sampled from
+            measured: the (vectors, lengths, arc_length) of the samples if they're already known (see PathGeometry)
+        """
+        super().__init__(samples, headings, speeds, closed=closed, version=version, measured=measured)
+        self.tangents = _read_only(np.asarray(tangents, dtype=float))
+        self.curvature = _read_only(np.asarray(curvature, dtype=float))
+        self.sources = _read_only(np.asarray(sources))
+
+    def _interpolate(self, values: np.ndarray, distance):
+        """Linearly interpolates per sample values at distances along the path."""
+        segment, t = self.locate(distance)
+        after = (segment + 1) % len(values)
+        t = np.expand_dims(t, -1) if values.ndim == 2 else t
+        return values[segment] * (1 - t) + values[after] * t
+
+    def position_at(self, distance) -> np.ndarray:
+        """The (x, y) position at a distance along the path."""
+        return self.point_at(distance)
+
+    def tangent_at(self, distance) -> np.ndarray:
+        """The unit tangent at a distance along the path."""
+        tangent = self._interpolate(self.tangents, distance)
+        return tangent / np.linalg.norm(tangent, axis=-1, keepdims=True)
+
+    def curvature_at(self, distance):
+        """The curvature at a distance along the path."""
+        return self._interpolate(self.curvature, distance)
+
+
+class SplinePath:
+    """
+    A smooth path through the waypoints of a Path (or WaypointArray), made of cubic hermite segments.
+
+    The spline is sampled once into a SplineGeometry, and only sampled again when the waypoints change,
+    so the follower and the renderer can both read .geometry every tick for free (like a Path).
+    """
+
+    def __init__(self, path, samples_per_segment: int = 32, use_headings: bool = False):
+        """
+        Args:
+            path: the waypoints the spline goes through
+            samples_per_segment: how many samples each segment between two waypoints gets
+            use_headings: point the spline in the direction of each waypoint's heading
+                          instead of the Catmull-Rom tangent (the direction between its neighbors)
+        """
+        if samples_per_segment < 1:
+            raise ValueError("samples_per_segment has to be at least 1")
+
+        self.path = path
+        self.samples_per_segment = samples_per_segment
+        self.use_headings = use_headings
+        self._geometry = None
+
+    @property
+    def version(self) -> int:
+        return self.path.version
+
+    @property
+    def is_closed(self) -> bool:
+        return self.path.is_closed
+
+    @property
+    def geometry(self) -> SplineGeometry:
+        """The sampled spline, only recalculated if the waypoints changed since last time."""
+        if self._geometry is None or self._geometry.version != self.path.version:
+            self._geometry = self.sample()
+        return self._geometry
+
+    def tangents(self, points: np.ndarray, headings: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        """The tangent at each waypoint, or only at the waypoints in indices."""
+        if indices is None:
+            tangents = catmull_rom_tangents(points, self.path.is_closed)
+        else:
+            tangents = catmull_rom_tangents_at(points, indices, self.path.is_closed)
+            headings = headings[indices]
+        return heading_tangents(tangents, headings) if self.use_headings else tangents
+
+    def _evaluate(self, controls: np.ndarray, end: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Samples some segments.
+
+        Args:
+            controls: (segments, 4, 2) the start point, start tangent, end point and end tangent of each segment
+            end: also sample the very end of the last segment (the end of an open path)
+
+        Return:
+            the positions, unit tangents and curvature of the samples
+        """
+        # the end of each segment is the start of the next one, so it's only sampled for the end of an open path
+        u = np.arange(self.samples_per_segment) / self.samples_per_segment
+        positions = np.einsum("kb,sbd->skd", hermite_basis(u), controls).reshape(-1, 2)
+        first = np.einsum("kb,sbd->skd", hermite_basis(u, 1), controls).reshape(-1, 2)
+        second = np.einsum("kb,sbd->skd", hermite_basis(u, 2), controls).reshape(-1, 2)
+
+        if end:
+            last = np.ones(1)
+            positions = np.concatenate((positions, hermite_basis(last) @ controls[-1]))
+            first = np.concatenate((first, hermite_basis(last, 1) @ controls[-1]))
+            second = np.concatenate((second, hermite_basis(last, 2) @ controls[-1]))
+
+        speed = np.hypot(first[:, 0], first[:, 1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            unit = first / speed[:, None]
+            curvature = (first[:, 0] * second[:, 1] - first[:, 1] * second[:, 0]) / speed ** 3
+        # a tangent of zero means the spline stops there (two waypoints on top of each other)
+        unit[speed == 0] = 0
+        curvature[speed == 0] = 0
+        return positions, unit, curvature
+
+    def sample(self) -> SplineGeometry:
+        """Samples every segment of the spline at once."""
+        points, headings, speeds = self.path.to_arrays()
+        closed = self.path.is_closed
+        count = len(points)
+
+        if count < 2:
+            # nothing to interpolate between
+            return SplineGeometry(points, np.zeros_like(points), np.zeros(count), np.arange(count), headings, speeds,
+                                  closed=closed, version=self.path.version)
+
+        tangents = self.tangents(points, headings)
+
+        # segment i goes from waypoint i to waypoint i + 1 (and the last one back to the start if it's closed)
+        starts = np.arange(count if closed else count - 1)
+        ends = (starts + 1) % count
+
+        controls = np.stack((points[starts], tangents[starts], points[ends], tangents[ends]), axis=1)
+        positions, unit, curvature = self._evaluate(controls, end=not closed)
+
+        sources = np.repeat(starts, self.samples_per_segment)
+        if not closed:
+            sources = np.append(sources, count - 1)
+
+        return SplineGeometry(positions, unit, curvature, sources, headings[sources], speeds[sources],
+                              closed=closed, version=self.path.version)
+
+    def resample(self, first: int, removed: int, added: int) -> tuple[int, int, int] | None:
+        """
+        Samples only the segments next to waypoints that were just edited, and splices them (and their lengths)
+        into the last geometry instead of sampling the whole spline again.
+
+        The path has to already be changed: the removed waypoints starting at first were replaced by added
+        new ones (moving a waypoint is 1 and 1, inserting one is 0 and 1, deleting one is 1 and 0).
+
+        Return:
+            the samples that changed as (start, old stop, new stop), or None if the whole spline was sampled
+            (there was nothing to splice into, the path is tiny, or the edit wraps around a closed path's start)
+        """
+        old = self._geometry
+        points, headings, speeds = self.path.to_arrays()
+        closed = self.path.is_closed
+        count, k = len(points), self.samples_per_segment
+        segments = count if closed else count - 1
+        old_segments = segments - added + removed
+
+        # a segment changes if its waypoints or their tangents (which depend on their neighbors) did
+        low, high, old_high = first - 2, first + added + 1, first + removed + 1
+        if closed:
+            whole = low < 1 or high > segments
+        else:
+            low, high, old_high = max(low, 0), min(high, segments), min(old_high, old_segments)
+            whole = segments < 1
+        if old is None or whole or count < 4 or len(old.coords) != old_segments * k + (not closed):
+            self._geometry = self.sample()
+            return None
+
+        # the changed samples, the end of an open path is the last segment's
+        end = not closed and high == segments
+        start, old_stop, new_stop = low * k, old_high * k + end, high * k + end
+
+        changed = np.arange(low, high)
+        tangents = self.tangents(points, headings, np.arange(low, high + 1) % count)
+        controls = np.stack((points[changed], tangents[:-1], points[(changed + 1) % count], tangents[1:]), axis=1)
+        positions, unit, curvature = self._evaluate(controls, end)
+
+        sources = np.repeat(changed, k)
+        if end:
+            sources = np.append(sources, count - 1)
+
+        def splice(before, middle, after):
+            return np.concatenate((before[:start], middle, after[old_stop:]))
+
+        samples = splice(old.coords, positions, old.coords)
+
+        # --- lengths and arc length --- #
+
+        # only the segments touching a changed sample are measured, everything after them is moved along
+        total = len(samples) if closed else len(samples) - 1
+        first_vector = max(start - 1, 0)
+        old_last, new_last = min(old_stop, len(old.lengths)), min(new_stop, total)
+
+        ring = np.concatenate((samples, samples[:1])) if closed else samples
+        vectors = np.diff(ring[first_vector:new_last + 1], axis=0)
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        distances = old.arc_length[first_vector] + np.cumsum(lengths)
+        shift = (distances[-1] if len(distances) else old.arc_length[first_vector]) - old.arc_length[old_last]
+
+        measured = (np.concatenate((old.vectors[:first_vector], vectors, old.vectors[old_last:])),
+                    np.concatenate((old.lengths[:first_vector], lengths, old.lengths[old_last:])),
+                    np.concatenate((old.arc_length[:first_vector + 1], distances,
+                                    old.arc_length[old_last + 1:] + shift)))
+
+        self._geometry = SplineGeometry(samples, splice(old.tangents, unit, old.tangents),
+                                        splice(old.curvature, curvature, old.curvature),
+                                        splice(old.sources, sources, old.sources + (added - removed)),
+                                        splice(old.headings, headings[sources], old.headings),
+                                        splice(old.speeds, speeds[sources], old.speeds),
+                                        closed=closed, version=self.path.version, measured=measured)
+        return start, old_stop, new_stop
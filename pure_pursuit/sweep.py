@@ -0,0 +1,290 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# every configuration is run in its own process, and the results are saved so they're never run twice
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import itertools
+import json
+import math
+import os
+
+# the robot and following the path
+from .kinematics import RobotModel
+from .simulation import Simulator
+from .follower import PurePursuit
+from .velocity_profile import VelocityProfile
+from .path import WaypointArray
+
+# ---------------- SEARCH SPACES ----------------- #
+
+# the settings that go to the RobotModel, everything else goes to the follower
+ROBOT_PARAMETERS = ("MAX_VELOCITY", "MAX_ACCELERATION", "MAX_TURN_VELOCITY", "MAX_TURN_ACCELERATION", "integrator")
+
+# the follower settings and what they are when a sweep doesn't set them
+FOLLOWER_DEFAULTS = {"lookahead_distance": 0.5, "speed": None, "profile": False}
+
+# bump this when the scoring changes so old cached results aren't used
+CACHE_VERSION = 1
+
+
+def grid(space: dict) -> list[dict]:
+    """
+    Every combination of the values in a search space.
+
+    Args:
+        space: parameter name -> list of values (a single value is used for every configuration)
+    """
+    names = list(space)
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in space.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def random_search(space: dict, count: int, seed: int = 0) -> list[dict]:
+    """
+    Random configurations from a search space.
+
+    Args:
+        space: parameter name -> a list to pick from, a (low, high) tuple to pick uniformly between, or a single value
+        count: how many configurations
+        seed: the seed, so the same search gives the same configurations
+    """
+    rng = np.random.default_rng(seed)
+    configs = [{} for _ in range(count)]
+    for name, value in space.items():
+        if isinstance(value, tuple):
+            picks = rng.uniform(value[0], value[1], count).tolist()
+        elif isinstance(value, list):
+            picks = [value[index] for index in rng.integers(len(value), size=count)]
+        else:
+            picks = [value] * count
+        for config, pick in zip(configs, picks):
+            config[name] = pick
+    return configs
+
+
+# ---------------- SCORING ----------------- #
+
+
+def path_data(path) -> tuple[np.ndarray, bool]:
+    """
+    The waypoints of a path as one structured array, which can be sent to another process
+    (Paths of Waypoint objects can't be) and hashed.
+    """
+    geometry = path.geometry
+    return WaypointArray(np.column_stack((geometry.coords, geometry.headings, geometry.speeds))).data, \
+        geometry.is_closed
+
+
+def cache_key(config: dict, data: np.ndarray, closed: bool, dt: float, duration: float) -> str:
+    """The hash a result is saved under: the configuration, the path's waypoints and how it was run."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"config": config, "closed": closed, "dt": dt, "duration": duration,
+                              "version": CACHE_VERSION}, sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(data).tobytes())
+    return digest.hexdigest()
+
+
+def evaluate(config: dict, data: np.ndarray, closed: bool = True, dt: float = 1 / 200,
+             duration: float = 60) -> dict:
+    """
+    Drives one lap of a path with one configuration, without drawing anything.
+
+    Args:
+        config: RobotModel maximums and follower settings (anything not set uses the defaults)
+        data: the path's waypoints as a structured array (see path_data)
+        closed: if the path loops
+        dt: the timestep in seconds
+        duration: the most seconds the lap can take before it counts as not finished
+
+    Return:
+        the lap time (None if it didn't finish), the mean and max cross track error,
+        and the peak acceleration in units per second squared
+    """
+    path = WaypointArray(data, closed=closed)
+    settings = {**FOLLOWER_DEFAULTS, **{name: value for name, value in config.items()
+                                         if name not in ROBOT_PARAMETERS and name != "path"}}
+
+    # starting on the first waypoint, stopped, moving towards the second one
+    geometry = path.geometry
+    direction = geometry.vectors[0]
+    robot = RobotModel(*geometry.coords[0], velocity=0, turn_velocity=0,
+                       velocity_angle=math.degrees(math.atan2(-direction[0], direction[1])),
+                       **{name: value for name, value in config.items() if name in ROBOT_PARAMETERS})
+
+    profile = VelocityProfile.for_robot(path, robot) if settings["profile"] else None
+    controller = PurePursuit(path, settings["lookahead_distance"], speed=settings["speed"], laps=1, profile=profile)
+    simulator = Simulator(robot, dt=dt, controller=controller)
+
+    steps = int(round(duration / dt))
+    positions = np.empty((steps + 1, 2))
+    errors = np.empty(steps)
+    positions[0] = robot.x, robot.y
+
+    ticks = 0
+    while ticks < steps and not controller.finished(robot):
+        simulator.step()
+        positions[ticks + 1] = robot.x, robot.y
+        errors[ticks] = controller.engine.cross_track_error
+        ticks += 1
+
+    # the acceleration from the second difference of the positions (speeding up and turning both count)
+    positions, errors = positions[:ticks + 1], errors[:ticks]
+    acceleration = np.linalg.norm(np.diff(positions, 2, axis=0), axis=1) / dt ** 2 if ticks > 1 else np.zeros(1)
+
+    return {"lap_time": robot.time if controller.finished(robot) else None,
+            "mean_cross_track_error": float(errors.mean()) if ticks else 0.0,
+            "max_cross_track_error": float(errors.max()) if ticks else 0.0,
+            "peak_acceleration": float(acceleration.max())}
+
+
+def score(result: dict, error_weight: float = 10.0) -> float:
+    """
+    One number to sort the results by (lower is better): the lap time plus a penalty for leaving the path.
+    Laps that never finished are the worst.
+    """
+    if result["lap_time"] is None:
+        return math.inf
+    return result["lap_time"] + error_weight * result["mean_cross_track_error"]
+
+
+# ---------------- RUNNING ----------------- #
+
+
+def run_sweep(configs: list[dict], paths: dict, cache: str | None = ".sweep_cache", workers: int | None = None,
+              dt: float = 1 / 200, duration: float = 60) -> list[dict]:
+    """
+    Runs every configuration on a process pool, skipping the ones already in the cache.
+
+    Args:
+        configs: the configurations (from grid or random_search), "path" picks a path by name
+                 and every path is used if it isn't set
+        paths: name -> path (a Path, WaypointArray or SplinePath)
+        cache: the folder the results are saved in, None to not cache anything
+        workers: how many processes, defaults to the number of cpus
+        dt: the timestep in seconds
+        duration: the most seconds a lap can take
+
+    Return:
+        every configuration with its results and score, best first
+    """
+    data = {name: path_data(path) for name, path in paths.items()}
+    if cache is not None:
+        os.makedirs(cache, exist_ok=True)
+
+    # every configuration on every path it's for
+    jobs = []
+    for config in configs:
+        for name in ([config["path"]] if "path" in config else data):
+            run = {**config, "path": name}
+            # the key uses the path's waypoints instead of its name, so renaming a path doesn't run it again
+            key = cache_key(config if "path" not in config else {n: v for n, v in config.items() if n != "path"},
+                            *data[name], dt, duration)
+            jobs.append((run, key))
+
+    results = {}
+    missing = []
+    for run, key in jobs:
+        filename = os.path.join(cache, key + ".json") if cache is not None else None
+        if filename is not None and os.path.exists(filename):
+            with open(filename) as file:
+                results[key] = json.load(file)
+        elif key not in results:
+            results[key] = None
+            missing.append((run, key))
+
+    if missing:
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1) as pool:
+            futures = [(key, pool.submit(evaluate, run, *data[run["path"]], dt, duration)) for run, key in missing]
+            for key, future in futures:
+                results[key] = future.result()
+                if cache is not None:
+                    with open(os.path.join(cache, key + ".json"), "w") as file:
+                        json.dump(results[key], file)
+
+    rows = [{**run, **results[key], "score": score(results[key]), "cached": (run, key) not in missing}
+            for run, key in jobs]
+    return sorted(rows, key=lambda row: row["score"])
+
+
+# --------------- MAIN --------------- #
+
+def _parse_value(text: str):
+    if text in ("None", "True", "False"):
+        return {"None": None, "True": True, "False": False}[text]
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _parse_space(arguments: list[str]) -> dict:
+    """name=1,2,3 is a list of values, name=low:high is a range for random search."""
+    space = {}
+    for argument in arguments:
+        name, _, values = argument.partition("=")
+        if ":" in values:
+            low, high = values.split(":")
+            space[name] = (float(low), float(high))
+        else:
+            space[name] = [_parse_value(value) for value in values.split(",")]
+    return space
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Tries lots of robot and follower settings and scores them.")
+    parser.add_argument("space", nargs="*", default=["MAX_VELOCITY=10,15,20", "lookahead_distance=0.3,0.5,0.8"],
+                        help="name=value,value,... for a list, name=low:high for a range (random search only)")
+    parser.add_argument("--random", type=int, default=None, help="this many random configurations instead of a grid")
+    parser.add_argument("--seed", type=int, default=0, help="the seed for the random search")
+    parser.add_argument("--paths", nargs="+", default=["default"],
+                        help="'default', 'spline' (the default path smoothed) or waypoint files")
+    parser.add_argument("--dt", type=float, default=1 / 200, help="timestep in seconds")
+    parser.add_argument("--duration", type=float, default=60, help="the most seconds a lap can take")
+    parser.add_argument("--workers", type=int, default=None, help="how many processes run at once")
+    parser.add_argument("--cache", default=".sweep_cache", help="where results are cached ('none' to not cache)")
+    parser.add_argument("--output", default=None, help="save every result to this json file")
+    parser.add_argument("--top", type=int, default=10, help="how many of the best results are printed")
+    args = parser.parse_args()
+
+    from .path import path, load_waypoints
+    from .spline import SplinePath
+
+    paths = {}
+    for name in args.paths:
+        paths[name] = path if name == "default" else SplinePath(path) if name == "spline" else load_waypoints(name)
+
+    space = _parse_space(args.space)
+    if args.random is not None:
+        configs = random_search(space, args.random, args.seed)
+    else:
+        if any(isinstance(value, tuple) for value in space.values()):
+            parser.error("ranges (low:high) only work with --random")
+        configs = grid(space)
+
+    start = time.perf_counter()
+    rows = run_sweep(configs, paths, None if args.cache == "none" else args.cache, args.workers, args.dt,
+                     args.duration)
+    cached = sum(row["cached"] for row in rows)
+    print(f"{len(rows)} runs ({cached} cached) in {time.perf_counter() - start:.1f} s")
+
+    for row in rows[:args.top]:
+        settings = ", ".join(f"{name}={value:.3g}" if isinstance(value, float) else f"{name}={value}"
+                             for name, value in row.items() if name not in ("lap_time", "mean_cross_track_error",
+                                                                            "max_cross_track_error",
+                                                                            "peak_acceleration", "score", "cached"))
+        lap = f"{row['lap_time']:.2f} s" if row["lap_time"] is not None else "didn't finish"
+        print(f"{lap:>14}  error {row['mean_cross_track_error']:.3f} (max {row['max_cross_track_error']:.3f})  "
+              f"accel {row['peak_acceleration']:.2f}  {settings}")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(rows, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+# --------------- DEPENDENCIES --------------- #
+# the networking runs on its own asyncio loop in a background thread, so it never blocks the animation
+import asyncio
+import threading
+
+# the queues between the two threads (appending and popping a deque is thread safe)
+from collections import deque
+
+# the messages are lines of json (which can have NaN and Infinity in them)
+import json
+import math
+import time
+
+# the background thread can't raise to anyone, so what goes wrong there is logged
+import logging
+
+# the order the states are sent in
+from .kinematics import STATE_FIELDS
+
+# ---------------- PROTOCOL ----------------- #
+
+# every message is a json object on its own line (a datagram can hold a few lines)
+# the bridge sends {"type": "states", "time": <unix time sent>, "fields": [...], "states": [[...], ...]}
+# and receives {"type": "command", <any of COMMAND_FIELDS>: value, ...}, anything else just says hello
+
+# what an outside process can set on the robot
+COMMAND_FIELDS = ("x", "y", "heading", "velocity", "velocity_angle", "turn_velocity", "acceleration",
+                  "turn_acceleration")
+
+# the robot's maximum each of those can't go past (either way)
+COMMAND_LIMITS = {"velocity": "MAX_VELOCITY", "turn_velocity": "MAX_TURN_VELOCITY",
+                  "acceleration": "MAX_ACCELERATION", "turn_acceleration": "MAX_TURN_ACCELERATION"}
+
+PROTOCOLS = ("udp", "tcp")
+
+# a batch of states has to fit in one datagram
+MAX_DATAGRAM = 60000
+
+logger = logging.getLogger(__name__)
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(data: bytes) -> list[dict]:
+    """Every json object in some data, lines that aren't json objects are skipped."""
+    messages = []
+    for line in data.splitlines():
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict):
+            messages.append(message)
+    return messages
+
+
+# ---------------- BRIDGE ----------------- #
+
+
+class _Datagrams(asyncio.DatagramProtocol):
+    def __init__(self, receive):
+        self.receive = receive
+
+    def datagram_received(self, data, address):
+        self.receive(data, address)
+
+
+class TelemetryBridge:
+    """
+    Streams the robot's state to other processes and takes pose and velocity commands from them,
+    over local UDP or TCP.
+
+    The networking is done by an asyncio loop on a background thread. The animation only ever touches two
+    bounded deques: publish() appends a state to the outbox and apply() empties the inbox, neither of which
+    can block. When a queue is full the oldest entry is dropped (and counted), so a slow or missing listener
+    can't make the animation fall behind. The outbox is sent every interval seconds as batches of states
+    instead of a message per state.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5800, protocol: str = "udp", peers=(),
+                 interval: float = 0.02, queue_size: int = 256, batch_size: int = 64,
+                 max_buffer: int = 1 << 16, peer_timeout: float = 5, max_peers: int = 64):
+        """
+        Args:
+            host: the address the bridge listens on
+            port: the port the bridge listens on (0 picks a free one, see .port after start())
+            protocol: "udp" or "tcp"
+            peers: (host, port) addresses that always get the states over UDP, anyone who sends the bridge
+                   a datagram is added too (until they've been quiet for peer_timeout seconds)
+            interval: how many seconds between sends
+            queue_size: the most states and commands waiting in each direction
+            batch_size: the most states in one message
+            max_buffer: for TCP, a client with more bytes than this waiting to be sent is skipped until it catches up
+            peer_timeout: seconds a UDP peer that said hello keeps getting the states without sending anything else
+            max_peers: the most UDP peers that said hello, the one heard from longest ago is dropped for a new one
+        """
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"protocol has to be one of {PROTOCOLS}")
+
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        # the UDP peers and when they were last heard from, None for the ones given here which never expire
+        self.peers = dict.fromkeys(peers)
+        self.peer_timeout = peer_timeout
+        self.max_peers = max_peers
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+
+        self.outbox = deque(maxlen=queue_size)
+        self.inbox = deque(maxlen=queue_size)
+
+        # counters, for seeing if anything is falling behind
+        self.sent = 0
+        self.received = 0
+        self.dropped_states = 0
+        self.dropped_commands = 0
+        # batches that couldn't be sent (see the log for why)
+        self.errors = 0
+
+        self._thread = None
+        self._loop = None
+        self._stop = None
+        self._ready = threading.Event()
+        self._error = None
+        self._transport = None
+        self._clients = set()
+
+    # --- the animation's side --- #
+
+    def publish(self, state):
+        """Queues a state (in the order of STATE_FIELDS) to be sent, it never waits."""
+        if len(self.outbox) == self.outbox.maxlen:
+            self.dropped_states += 1
+        self.outbox.append([float(value) for value in state])
+
+    def commands(self) -> list[dict]:
+        """Every command received since the last call, oldest first."""
+        commands = []
+        while self.inbox:
+            commands.append(self.inbox.popleft())
+        return commands
+
+    def apply(self, robot) -> int:
+        """
+        Sets the robot's values from the commands received since the last call (newer ones win),
+        clamped to the robot's maximums.
+
+        Return:
+            how many commands there were
+        """
+        commands = self.commands()
+        for command in commands:
+            for name, value in command.items():
+                limit = getattr(robot, COMMAND_LIMITS.get(name, ""), None)
+                if limit is not None:
+                    value = max(-limit, min(value, limit))
+                setattr(robot, name, value)
+        return len(commands)
+
+    # --- starting and stopping --- #
+
+    def start(self) -> "TelemetryBridge":
+        """Starts the background thread and waits until it's listening."""
+        self._thread = threading.Thread(target=asyncio.run, args=(self._main(),), daemon=True,
+                                        name="telemetry")
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        """Sends whatever is left and stops the background thread."""
+        if self._thread is None:
+            return
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- the background thread's side --- #
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = None
+        try:
+            if self.protocol == "udp":
+                self._transport, _ = await self._loop.create_datagram_endpoint(
+                    lambda: _Datagrams(self._receive), local_addr=(self.host, self.port))
+                self.port = self._transport.get_extra_info("sockname")[1]
+            else:
+                server = await asyncio.start_server(self._client, self.host, self.port)
+                self.port = server.sockets[0].getsockname()[1]
+        except OSError as error:
+            self._error = error
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush()
+        finally:
+            if self._transport is not None:
+                self._transport.close()
+            if server is not None:
+                server.close()
+                for writer in list(self._clients):
+                    writer.close()
+                await server.wait_closed()
+
+    def _flush(self):
+        """Sends everything in the outbox, in batches."""
+        self._expire_peers()
+        states = []
+        while self.outbox:
+            states.append(self.outbox.popleft())
+
+        for start in range(0, len(states), self.batch_size):
+            batch = states[start:start + self.batch_size]
+            try:
+                self._send(batch)
+            except (OSError, ValueError) as error:
+                # a batch that can't be sent is dropped, instead of stopping the background thread
+                self.errors += 1
+                logger.warning("telemetry couldn't send %d states: %s", len(batch), error)
+                continue
+            self.sent += len(batch)
+
+    def _send(self, states: list):
+        """Sends one batch of states to everyone listening."""
+        message = encode({"type": "states", "time": time.time(), "fields": STATE_FIELDS, "states": states})
+        if self.protocol == "udp":
+            if len(message) > MAX_DATAGRAM:
+                if len(states) == 1:
+                    raise ValueError("a state is too big for a datagram")
+                # too many states for one datagram, so it's sent in halves
+                self._send(states[:len(states) // 2])
+                self._send(states[len(states) // 2:])
+                return
+            for peer in self.peers:
+                self._transport.sendto(message, peer)
+        else:
+            for writer in self._clients:
+                # a client that can't keep up misses batches instead of making the buffer grow forever
+                if writer.transport.get_write_buffer_size() < self.max_buffer:
+                    writer.write(message)
+
+    def _expire_peers(self):
+        """Forgets the UDP peers that haven't been heard from in peer_timeout seconds."""
+        cutoff = time.monotonic() - self.peer_timeout
+        for peer in [peer for peer, heard in self.peers.items() if heard is not None and heard < cutoff]:
+            del self.peers[peer]
+
+    def _heard_from(self, address):
+        if address in self.peers and self.peers[address] is None:
+            return
+        # moved to the end, so the peers that said hello are in the order they were last heard from
+        self.peers.pop(address, None)
+        self.peers[address] = time.monotonic()
+
+        heard = [peer for peer, time_heard in self.peers.items() if time_heard is not None]
+        for peer in heard[:max(len(heard) - self.max_peers, 0)]:
+            del self.peers[peer]
+
+    def _receive(self, data: bytes, address=None):
+        if address is not None:
+            # whoever sends the bridge anything gets the states back
+            self._heard_from(address)
+
+        for message in decode(data):
+            if message.get("type") != "command":
+                continue
+            # a NaN or an infinity would be stuck in the robot's pose forever, so they're dropped
+            command = {name: float(value) for name, value in message.items()
+                       if name in COMMAND_FIELDS and isinstance(value, (int, float)) and math.isfinite(value)}
+            if not command:
+                continue
+            if len(self.inbox) == self.inbox.maxlen:
+                self.dropped_commands += 1
+            self.inbox.append(command)
+            self.received += 1
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.add(writer)
+        try:
+            while line := await reader.readline():
+                self._receive(line)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+# ---------------- CLIENT ----------------- #
+
+
+class TelemetryClient:
+    """
+    The other end of a TelemetryBridge, for a dashboard or a stand-in robot process.
+    It's all asyncio, so it's used from inside a running loop.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5800, protocol: str = "udp", queue_size: int = 64,
+                 keepalive: float = 1):
+        """
+        Args:
+            host: where the bridge is
+            port: the bridge's port
+            protocol: "udp" or "tcp", the same as the bridge
+            queue_size: the most batches of states waiting to be read, the oldest are dropped
+            keepalive: for UDP, seconds between hellos so the bridge doesn't forget about us
+                       (keep it under the bridge's peer_timeout)
+        """
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"protocol has to be one of {PROTOCOLS}")
+        self.address = (host, port)
+        self.protocol = protocol
+        self.batches = asyncio.Queue(queue_size)
+        self.dropped = 0
+        self.keepalive = keepalive
+        self._transport = None
+        self._writer = None
+        self._reading = None
+        self._hellos = None
+
+    async def connect(self):
+        loop = asyncio.get_running_loop()
+        if self.protocol == "udp":
+            self._transport, _ = await loop.create_datagram_endpoint(lambda: _Datagrams(self._receive),
+                                                                     remote_addr=self.address)
+            # so the bridge knows where to send the states, and keeps sending them
+            self._transport.sendto(encode({"type": "hello"}))
+            self._hellos = asyncio.ensure_future(self._hello())
+        else:
+            reader, self._writer = await asyncio.open_connection(*self.address)
+            self._reading = asyncio.ensure_future(self._read(reader))
+        return self
+
+    def send(self, **command):
+        """Sends a command, like send(x=1, y=2, heading=90)."""
+        message = encode({"type": "command", **command})
+        if self._transport is not None:
+            self._transport.sendto(message)
+        else:
+            self._writer.write(message)
+
+    async def _hello(self):
+        while True:
+            await asyncio.sleep(self.keepalive)
+            self._transport.sendto(encode({"type": "hello"}))
+
+    async def states(self):
+        """Waits for the next batch of states, the batch is a dict like the message the bridge sent."""
+        return await self.batches.get()
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+        if self._writer is not None:
+            self._writer.close()
+        for task in (self._reading, self._hellos):
+            if task is not None:
+                task.cancel()
+
+    def _receive(self, data: bytes, address=None):
+        for message in decode(data):
+            if message.get("type") != "states":
+                continue
+            message["received"] = time.time()
+            if self.batches.full():
+                self.batches.get_nowait()
+                self.dropped += 1
+            self.batches.put_nowait(message)
+
+    async def _read(self, reader: asyncio.StreamReader):
+        while line := await reader.readline():
+            self._receive(line)
+
+
+# --------------- MAIN --------------- #
+
+async def _listen(args):
+    """Prints how many states arrive a second and how late they are, and drives a stand-in robot if asked."""
+    client = await TelemetryClient(args.host, args.port, args.protocol).connect()
+
+    stand_in = None
+    if args.stand_in:
+        # a robot following the default path in real time, like odometry coming from a real robot
+        from .kinematics import RobotModel
+        from .follower import PurePursuit
+        from .path import path
+        robot = RobotModel(velocity=0, turn_velocity=0, integrator="arc")
+        stand_in = (robot, PurePursuit(path, speed=8))
+
+    count, latency, last_report, last_step = 0, 0.0, time.perf_counter(), time.perf_counter()
+    try:
+        while True:
+            try:
+                batch = await asyncio.wait_for(client.states(), 1 / args.rate)
+                count += len(batch["states"])
+                latency += (batch["received"] - batch["time"]) * len(batch["states"])
+            except asyncio.TimeoutError:
+                pass
+
+            now = time.perf_counter()
+            if stand_in is not None and now - last_step >= 1 / args.rate:
+                robot, controller = stand_in
+                controller(robot)
+                robot.step(now - last_step)
+                client.send(x=robot.x, y=robot.y, heading=robot.heading, velocity=robot.velocity,
+                            velocity_angle=robot.velocity_angle, turn_velocity=robot.turn_velocity)
+                last_step = now
+
+            if now - last_report >= 1:
+                print(f"{count / (now - last_report):.0f} states/s, "
+                      f"latency {latency / count * 1000 if count else 0:.2f} ms, dropped {client.dropped}")
+                count, latency, last_report = 0, 0.0, now
+    finally:
+        client.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Listens to the animation's telemetry (python main.py --telemetry)"
+                                                 " and can send it a stand-in robot's pose.")
+    parser.add_argument("--host", default="127.0.0.1", help="where the animation is")
+    parser.add_argument("--port", type=int, default=5800, help="the animation's telemetry port")
+    parser.add_argument("--protocol", choices=PROTOCOLS, default="udp", help="the same as the animation")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="follow the path with a simulated robot here and send its pose as commands")
+    parser.add_argument("--rate", type=float, default=50, help="how many times a second the stand-in sends its pose")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_listen(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# for the units of the robot's velocities
+from .kinematics import RobotModel
+
+# ---------------- CURVATURE ----------------- #
+
+
+def estimate_curvature(geometry) -> np.ndarray:
+    """
+    The curvature at every point of a path.
+    Spline geometries already know it, for straight segments it's how much the path turns at each corner
+    divided by the length around the corner.
+    """
+    if hasattr(geometry, "curvature"):
+        return np.asarray(geometry.curvature)
+
+    count = len(geometry.coords)
+    if count < 3:
+        return np.zeros(count)
+
+    vectors = geometry.vectors
+    if geometry.is_closed:
+        before, after = np.roll(vectors, 1, axis=0), vectors
+        lengths = (np.roll(geometry.lengths, 1) + geometry.lengths) / 2
+    else:
+        before, after = vectors[:-1], vectors[1:]
+        lengths = (geometry.lengths[:-1] + geometry.lengths[1:]) / 2
+
+    turn = np.arctan2(before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0], np.einsum("ij,ij->i", before, after))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        curvature = np.where(lengths > 0, turn / lengths, 0)
+
+    # the ends of an open path don't turn
+    return curvature if geometry.is_closed else np.concatenate(([0.0], curvature, [0.0]))
+
+
+# ---------------- PROFILE ----------------- #
+
+
+def limit_acceleration(squared: np.ndarray, arc_length: np.ndarray, rate: float, closed: bool) -> np.ndarray:
+    """
+    The forward and backward passes, done with running minimums instead of a loop.
+
+    Speeding up from point j to point i means v_i^2 <= v_j^2 + rate * (s_i - s_j), so the fastest
+    v_i^2 is the minimum of that over every earlier j, which is rate * s_i + the running minimum of
+    (v_j^2 - rate * s_j). Slowing down is the same thing backwards.
+
+    Args:
+        squared: the highest speed at each point, squared
+        arc_length: how far along the path each point is
+        rate: how much the squared speed can change per unit of distance
+        closed: if the path loops, in which case the points before the start are the end of the last lap
+
+    Return:
+        the highest squared speeds which can be reached and slowed down from
+    """
+    # without the repeated first point at the end for closed paths
+    count = len(squared) - 1
+    if closed:
+        # three laps in a row so the middle one sees what's on either side of it
+        length = arc_length[-1]
+        squared = np.tile(squared[:-1], 3)
+        arc_length = np.concatenate((arc_length[:-1] - length, arc_length[:-1], arc_length[:-1] + length))
+
+    forward = rate * arc_length + np.minimum.accumulate(squared - rate * arc_length)
+    backward = -rate * arc_length + np.minimum.accumulate((forward + rate * arc_length)[::-1])[::-1]
+    limited = np.minimum(forward, backward)
+
+    if closed:
+        middle = limited[count:2 * count]
+        return np.append(middle, middle[0])
+    return limited
+
+
+class VelocityProfile:
+    """
+    The target speed at every point of a path, worked out before the robot starts moving.
+
+    It's limited by how fast the robot can turn on the curves, by the speeds set on the waypoints,
+    and by MAX_ACCELERATION for speeding up and slowing down. Like the path geometry, it's only
+    calculated again when the path changes.
+    """
+
+    def __init__(self, path, max_velocity: float = 20, max_acceleration: float = 1, max_turn_velocity: float = 3.35,
+                 turn_margin: float = 0.8, start_speed: float | None = None, end_speed: float = 0):
+        """
+        Args:
+            path: the path (anything with a geometry, like a Path, WaypointArray or SplinePath)
+            max_velocity: the fastest the robot can go (same units as RobotModel.velocity)
+            max_acceleration: how fast the robot can speed up and slow down (like RobotModel.MAX_ACCELERATION)
+            max_turn_velocity: how fast the robot can turn (like RobotModel.MAX_TURN_VELOCITY)
+            turn_margin: the fraction of max_turn_velocity the curves are planned with, so the follower has room to correct
+            start_speed: the speed at the start of an open path, None means it doesn't matter
+            end_speed: the speed at the end of an open path
+        """
+        self.path = path
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.max_turn_velocity = max_turn_velocity
+        self.turn_margin = turn_margin
+        self.start_speed = start_speed
+        self.end_speed = end_speed
+
+        self._geometry = None
+        self._speeds = None
+        self._limits = None
+
+    @classmethod
+    def for_robot(cls, path, robot: RobotModel, **kwargs) -> "VelocityProfile":
+        """A profile using the maximums of a robot."""
+        return cls(path, robot.MAX_VELOCITY, robot.MAX_ACCELERATION, robot.MAX_TURN_VELOCITY, **kwargs)
+
+    @property
+    def speeds(self) -> np.ndarray:
+        """The target speed at every point of the path's geometry, recalculated only if the path changed."""
+        geometry = self.path.geometry
+        if geometry is not self._geometry:
+            limits = self.limits(geometry)
+            self._use(geometry, limits, self.compute(geometry, limits))
+        return self._speeds
+
+    def _use(self, geometry, limits: np.ndarray, speeds: np.ndarray):
+        speeds.flags.writeable = False
+        self._geometry, self._limits, self._speeds = geometry, limits, speeds
+
+    @property
+    def reach(self) -> float:
+        """
+        The furthest a change to the path can change the speeds: the distance it takes to speed up from
+        a stop to max_velocity. Anything further away is already limited by something closer.
+        """
+        return self.max_velocity ** 2 / (200 * self.max_acceleration)
+
+    def _point_limits(self, curvature: np.ndarray, speeds: np.ndarray) -> np.ndarray:
+        """The highest speed at some points from their curvature and their waypoints' speeds."""
+        # the robot turns (degrees per 30 ms frame) = degrees(curvature * velocity / 100)
+        # so the fastest it can go around a curve is 100 * radians(max turn velocity) / curvature
+        curvature = np.abs(curvature)
+        turn_rate = np.radians(self.max_turn_velocity * self.turn_margin) * 100
+        with np.errstate(divide="ignore"):
+            limit = np.minimum(np.where(curvature > 0, turn_rate / curvature, np.inf), self.max_velocity)
+
+        # the waypoints' own speeds
+        return np.where(speeds >= 0, np.minimum(limit, speeds), limit)
+
+    def limits(self, geometry) -> np.ndarray:
+        """
+        The highest speed at each point of geometry.closed from the curves, the waypoints and the ends of the path,
+        before the acceleration limits, squared.
+        """
+        if len(geometry.coords) == 0:
+            return np.zeros(0)
+
+        limit = self._point_limits(estimate_curvature(geometry), np.asarray(geometry.speeds))
+        if geometry.is_closed:
+            limit = np.append(limit, limit[0])
+        else:
+            if self.start_speed is not None:
+                limit[0] = min(limit[0], self.start_speed)
+            limit[-1] = min(limit[-1], self.end_speed)
+        return limit ** 2
+
+    def compute(self, geometry, limits: np.ndarray | None = None) -> np.ndarray:
+        """
+        Works out the speeds for a geometry, everything is done on whole arrays at once.
+
+        Args:
+            geometry: the path's geometry
+            limits: the geometry's limits if they were already worked out
+
+        Return:
+            the target speed at each point of geometry.closed
+        """
+        if len(geometry.coords) == 0:
+            return np.zeros(0)
+        squared = self.limits(geometry) if limits is None else limits
+
+        # speeding up by a (per frame) while going v / 100 per frame means d(v^2)/ds = 200 * a
+        squared = limit_acceleration(squared, geometry.arc_length, 200 * self.max_acceleration, geometry.is_closed)
+        return np.sqrt(np.maximum(squared, 0))
+
+    def patch(self, geometry, start: int, old_stop: int, new_stop: int) -> bool:
+        """
+        Updates the speeds for a new geometry of the path where only some points changed (like after
+        SplinePath.resample), instead of working out the whole path again.
+
+        Only the points within reach of the changed ones get new speeds, worked out from the limits
+        within reach of those, so the speeds come out the same as compute() would give.
+
+        Args:
+            geometry: the new geometry (it has to have curvature, like a SplineGeometry)
+            start, old_stop, new_stop: the points from start to old_stop were replaced by the ones from start to new_stop
+
+        Return:
+            if it was patched, False means the whole profile was worked out again
+        """
+        closed = geometry.is_closed
+        length = geometry.length
+        arc_length = geometry.arc_length
+        reach = self.reach
+
+        low = arc_length[min(start, len(arc_length) - 1)]
+        high = arc_length[min(new_stop, len(arc_length) - 1)]
+        if self._limits is None or not hasattr(geometry, "curvature") or \
+                len(self._limits) - old_stop != len(arc_length) - new_stop or \
+                (closed and high - low + 4 * reach >= length):
+            # nothing to patch, or the change reaches all the way around the path anyway
+            limits = self.limits(geometry)
+            self._use(geometry, limits, self.compute(geometry, limits))
+            return False
+
+        # the limits of the points that changed
+        changed = np.arange(start, new_stop)
+        limit = self._point_limits(np.asarray(geometry.curvature)[changed], np.asarray(geometry.speeds)[changed])
+        if not closed:
+            if start == 0 and len(limit) and self.start_speed is not None:
+                limit[0] = min(limit[0], self.start_speed)
+            if new_stop == len(geometry.closed) and len(limit):
+                limit[-1] = min(limit[-1], self.end_speed)
+
+        limits = np.concatenate((self._limits[:start], limit ** 2, self._limits[old_stop:]))
+        speeds = np.concatenate((self._speeds[:start], np.zeros(len(limit)), self._speeds[old_stop:]))
+
+        # the points between two distances, which keep going around a closed path
+        points = len(geometry.coords) if closed else len(arc_length)
+
+        def between(first: float, last: float) -> tuple[np.ndarray, np.ndarray]:
+            if not closed:
+                first, last = max(first, 0), min(last, length)
+            laps_first, first = divmod(first, length) if closed else (0, first)
+            laps_last, last = divmod(last, length) if closed else (0, last)
+            indices = np.arange(int(laps_first) * points + np.searchsorted(arc_length[:points], first, side="left"),
+                                int(laps_last) * points + np.searchsorted(arc_length[:points], last, side="right"))
+            wrapped = indices % points
+            return wrapped, arc_length[wrapped] + indices // points * length
+
+        # the points which can be affected, and every limit that can affect them
+        indices, distances = between(low - 2 * reach, high + 2 * reach)
+        squared = limit_acceleration(limits[indices], distances, 200 * self.max_acceleration, closed=False)
+        window = (distances >= low - reach) & (distances <= high + reach)
+        speeds[indices[window]] = np.sqrt(np.maximum(squared[window], 0))
+        if closed:
+            # the first point is repeated at the end
+            speeds[-1] = speeds[0]
+
+        self._use(geometry, limits, speeds)
+        return True
+
+    def speed_at(self, distance, segment: int | None = None) -> float:
+        """
+        The target speed at a distance along the path.
+
+        Args:
+            distance: how far along the path (wraps around for closed paths)
+            segment: the segment the distance is on if it's already known (like the follower's progress hint),
+                     which skips the binary search
+        """
+        speeds = self.speeds
+        geometry = self._geometry
+        if segment is None:
+            segment, t = geometry.locate(distance)
+        else:
+            segment %= geometry.segment_count
+            offset = distance % geometry.length if geometry.is_closed else distance
+            t = min(max((offset - geometry.arc_length[segment]) / max(geometry.lengths[segment], 1e-12), 0), 1)
+        return float(speeds[segment] * (1 - t) + speeds[segment + 1] * t)
@@ -0,0 +1,24 @@
+"""
+Everything that draws with matplotlib: the animation window, the robot, trail and path artists,
+rendering runs to videos offline, and the frame profiler.
+
+Nothing is imported until it's used, so importing pyplot for the window doesn't slow down offline rendering
+and the other way around.
+"""
+# name -> the module it's in
+_LAZY = {"Animation": "animate", "BlitAnimation": "animate", "Robot": "animate", "Buttons": "animate",
+         "updateFrame": "animate",
+         "RobotDrawing": "rendering", "DrawnPath": "rendering", "DrawnField": "rendering", "BodyTemplate": "rendering",
+         "Trail": "trail", "velocity_colormap": "trail", "WaypointEditing": "editing",
+         "render": "export", "render_range": "export",
+         "FrameProfiler": "profiling", "ProfilerOverlay": "profiling"}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = list(_LAZY)
@@ -0,0 +1,554 @@
+# --------------- DEPENDENCIES --------------- #
+# showing the animation with matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.widgets import Button
+
+# because we love numpy
+import numpy as np
+
+# For actions executed when a button is pressed
+from functools import partial
+
+# because I'll probably need it
+import math
+
+# the trail behind the robot
+from .trail import Trail, velocity_colormap
+
+# the path and the robot drawn on the plot
+from .rendering import DrawnPath, DrawnField, RobotDrawing
+
+# the robot physics without any of the drawing
+from ..kinematics import RobotModel, INTEGRATORS, STATE_FIELDS
+from ..simulation import Simulator, FixedRateLoop
+
+# saving runs and playing them back
+from ..recording import TrajectoryRecorder, TrajectoryReader, TrajectoryPlayer
+
+# timing every part of the frames
+from .profiling import FrameProfiler, ProfilerOverlay
+import atexit
+
+# streaming the state to other processes
+from ..telemetry import TelemetryBridge, PROTOCOLS
+
+# the obstacles on the field
+from ..field import FieldMap, FOOTPRINTS
+
+# autonomous routines, compiled once and loaded from the cache after that
+from ..routine import Routine, RoutineCache
+
+# editing the path on the plot and following it
+from ..editing import PathEditor
+from ..follower import PurePursuit
+from .editing import WaypointEditing
+
+# so that the fps doesn't matter
+import time
+
+# this was in the previous version
+# idk why
+# might be useful ¯\_(ツ)_/¯
+# I probably should have done comments
+# plt.rcParams['animation.writer'] = 'ffmpeg'
+
+# ---------------- PATH ----------------- #
+
+# the waypoints, the default path, and the path's cached geometry are in pure_pursuit/path.py
+from ..path import WaypointArray, path
+
+# --------------- CLASSES --------------- #
+
+class Buttons:
+    """
+    The auto/manual button in the corner.
+    In auto the robot follows the path, in manual it's left to drive itself.
+    """
+    def __init__(self, fig, on_change=None):
+        """
+        Args:
+            fig: the figure the button goes on
+            on_change: called with is_auto whenever it's pressed
+        """
+        self.is_auto = False
+        self.on_change = on_change
+
+        # bottom left corner
+        self.ax = fig.add_axes((0.01, 0.01, 0.1, 0.05))
+        self.button = Button(self.ax, "Manual")
+        self.button.on_clicked(self.auto_manual)
+
+    def auto_manual(self, event=None):
+        self.is_auto = not self.is_auto
+        self.button.label.set_text("Auto" if self.is_auto else "Manual")
+        if self.on_change is not None:
+            self.on_change(self.is_auto)
+
+
+class BlitAnimation:
+    """
+    Calls a frame function on a timer and blits the artists it returns over the background,
+    like FuncAnimation(blit=True).
+
+    The background is saved every time the whole figure is drawn (the draw_event), so anything that changes
+    what's in the background (like the path after an edit) only has to call fig.canvas.draw().
+    """
+
+    def __init__(self, fig, func, interval: int = 10, profiler: FrameProfiler | None = None):
+        """
+        Args:
+            fig: the figure being animated
+            func: called with the frame number, returns the artists that changed (they're made animated,
+                  so they're left out of the background)
+            interval: milliseconds between frames
+            profiler: if it's given, the blit is marked as its own phase
+        """
+        self.fig = fig
+        self.func = func
+        self.profiler = profiler
+        self.frame = 0
+
+        self.background = None
+        self.artists = ()
+
+        canvas = fig.canvas
+        self.connections = [canvas.mpl_connect("draw_event", self.on_draw),
+                            canvas.mpl_connect("close_event", lambda event: self.stop())]
+        self.timer = canvas.new_timer(interval=interval)
+        self.timer.add_callback(self.step)
+        self.timer.start()
+
+    def on_draw(self, event):
+        """The figure was drawn, so that's the new background, and the animated artists go back on top."""
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def step(self):
+        """Draws the next frame."""
+        self.artists = tuple(self.func(self.frame))
+        self.frame += 1
+        for artist in self.artists:
+            artist.set_animated(True)
+
+        canvas = self.fig.canvas
+        if self.background is None:
+            # the first frame draws everything, which saves the background
+            canvas.draw()
+        else:
+            canvas.restore_region(self.background)
+            self._draw_artists()
+            canvas.blit(self.fig.bbox)
+
+        if self.profiler is not None:
+            self.profiler.mark("blit")
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def stop(self):
+        self.timer.stop()
+        for connection in self.connections:
+            self.fig.canvas.mpl_disconnect(connection)
+
+
+class Animation:
+    def __init__(self, sim_rate: float | None = None, record: str | None = None, replay: str | None = None,
+                 replay_speed: float = 1.0, profile: bool = False, profile_to: str | None = None,
+                 integrator: str = "euler", telemetry=None, field: FieldMap | None = None,
+                 routine: Routine | None = None, routine_cache: str = ".routine_cache", edit: bool = False):
+        """
+        Args:
+            sim_rate: if it's given, the robot is simulated this many times a second on its own clock
+                      and the frames just show where it is, otherwise it moves once every frame
+            record: a file to record every state of the robot to (see recording.py)
+            replay: a recorded file to play back instead of simulating anything
+            replay_speed: how many times faster than real time the replay is played
+            profile: time every part of each frame and show it on the plot
+            profile_to: time every part of each frame and save it to this file at exit
+            integrator: how the robot's steps are integrated, "euler" or "arc" (see kinematics.py)
+            telemetry: a TelemetryBridge to stream the robot's state to and take commands from (see telemetry.py),
+                       the commands are ignored while a replay or routine is playing
+            field: a FieldMap with obstacles to draw and check the robot against (see field.py)
+            routine: an autonomous routine to play instead of simulating (see routine.py)
+            routine_cache: where compiled routines are saved
+            edit: smooth the path into a spline that can be edited with the mouse, with a button for
+                  the robot to follow it (see WaypointEditing)
+        """
+        # --- displaying plot stuff --- #
+
+        self.fig, self.ax = plt.subplots(subplot_kw={'aspect': 1})
+
+        # gets rid of the axis labeling
+        plt.xticks([])
+        plt.yticks([])
+
+        # 'scaled' means its locked at that scale, and its 1 to 1 (cirlces are circles)
+        plt.axis('scaled')
+        plt.xlim(-6, 6)
+        plt.ylim(-4, 4)
+
+        # so that it fills the screen
+        self.fig.tight_layout()
+
+        # --- drawing stuff --- #
+
+        # the robot -_-
+        self.robot = Robot(self.ax, integrator=integrator)
+
+        # a routine is compiled (or loaded from the cache) first, so its path can be drawn
+        compiled = RoutineCache(routine_cache).get(routine) if routine is not None else None
+        shown = path if compiled is None else \
+            WaypointArray(np.column_stack((compiled.column("x"), compiled.column("y"))), closed=False)
+
+        # the path being edited is a spline through a copy of the waypoints, only the part around
+        # an edit is recalculated
+        self.editor = None
+        if edit and compiled is None:
+            self.editor = PathEditor(path, max_velocity=self.robot.MAX_VELOCITY,
+                                     max_acceleration=self.robot.MAX_ACCELERATION,
+                                     max_turn_velocity=self.robot.MAX_TURN_VELOCITY)
+            shown = self.editor
+
+        # the path the robot is following drawn
+        # it's simplified to the zoom and drawn into the background, and only recalculated when the path
+        # or the view changes
+
+        self.drawn_path = DrawnPath(self.ax, shown, static=True, linestyle=(0, (5, 1)),
+                                    color=(0, 0, 0, 0.35), dash_capstyle='butt', dash_joinstyle="round", linewidth=1.5,
+                                    zorder=1)
+        self.drawn_path.on_change = self.refresh_background
+
+        # made in display()
+        self.anim = None
+
+        # every state of the robot can be saved to a file
+        self.recorder = None
+        if record is not None and replay is None and routine is None:
+            self.recorder = TrajectoryRecorder(record, metadata={"sim_rate": sim_rate,
+                                                                 "MAX_VELOCITY": self.robot.MAX_VELOCITY})
+
+        # what moves the robot: nothing (it moves itself every frame), a separate physics loop,
+        # or a recording (a compiled routine is one too)
+        self.loop = None
+        if compiled is not None:
+            self.loop = TrajectoryPlayer(compiled, speed=replay_speed)
+        elif replay is not None:
+            self.loop = TrajectoryPlayer(TrajectoryReader(replay), speed=replay_speed)
+        elif sim_rate is not None:
+            self.loop = FixedRateLoop(Simulator(self.robot, dt=1 / sim_rate, recorder=self.recorder))
+        else:
+            self.robot.recorder = self.recorder
+
+        self.alpha = 0.5 #0.33333
+        # for the color of the line at different velocities
+        self.cmap = velocity_colormap(self.alpha)
+
+        # the trail of how the robot has moved
+        # the trig is so the trail comes out of the back of the robot
+        # max_length=None keeps the whole trail, set it (and maybe ring=True) to cap the work per frame
+        self.trail = Trail(self.ax, self.cmap,
+                           x=self.robot.x - 0.25 * math.sin(math.radians(-self.robot.heading)),
+                           y=self.robot.y - 0.25 * math.cos(math.radians(-self.robot.heading)),
+                           max_length=None, linewidth=5, zorder=1, animated=True)
+
+        # dragging, adding and deleting waypoints, and the auto/manual button
+        self.editing = None
+        self.buttons = None
+        if self.editor is not None:
+            self.editing = WaypointEditing(self.ax, self.editor, self.drawn_path, on_background=self.refresh_background)
+            self.buttons = Buttons(self.fig, on_change=self.set_auto)
+
+        # streaming the state to other processes, it's started in display()
+        self.telemetry = telemetry
+
+        # the obstacles, the robot gets outlined in red when it hits one
+        self.drawn_field = None
+        if field is not None:
+            self.drawn_field = DrawnField(self.ax, field, FOOTPRINTS["diffy" if self.robot.is_diffy else "mecanum"])
+
+        # --- profiling --- #
+
+        self.profiler = FrameProfiler() if profile or profile_to is not None else None
+        self.overlay = ProfilerOverlay(self.ax, self.profiler) if profile else None
+        if profile_to is not None:
+            atexit.register(self.profiler.dump, profile_to)
+
+    def refresh_background(self):
+        """
+        Redraws everything that isn't animated (like the path after it changed), the animation saves
+        that as the background it blits onto when it sees the draw.
+        """
+        self.fig.canvas.draw()
+
+    def set_auto(self, is_auto: bool):
+        """Makes the robot follow the edited path (from wherever it is), or leaves it to drive itself."""
+        controller = PurePursuit(self.editor, profile=self.editor.profile) if is_auto else None
+        self.robot.controller = controller
+        if hasattr(self.loop, "simulator"):
+            self.loop.simulator.controller = controller
+        # the button's label is in the background
+        self.refresh_background()
+
+    def display(self):
+        # This is how we display the animation, where it basically updates every frame
+        frame = partial(updateFrame, ax=self.ax, robot=self.robot, trail=self.trail, drawn_path=self.drawn_path,
+                        loop=self.loop, profiler=self.profiler, overlay=self.overlay, telemetry=self.telemetry,
+                        drawn_field=self.drawn_field, editing=self.editing)
+        self.anim = BlitAnimation(self.fig, frame, interval=10, profiler=self.profiler)
+        if self.telemetry is not None:
+            self.telemetry.start()
+
+        # showing the plot
+        plt.show()
+
+        if self.telemetry is not None:
+            self.telemetry.stop()
+
+        # the recording is finished when the window is closed
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+class Robot(RobotModel):
+    """
+    A Robot class which will hold all of the positional variables and
+    other information about the robot, it also updates and drawing the robot
+
+    The physics are in RobotModel (kinematics.py), this adds the drawing and the wall clock.
+    """
+    def __init__(self, ax, x: float = 0, y: float = 0, heading: float = 0, MAX_VELOCITY: float = 20,
+                 MAX_ACCELERATION: float = 1, MAX_TURN_VELOCITY: float = 3.35, MAX_TURN_ACCELERATION: float = 1,
+                 scaling: float = 1, isdiffy: bool = True, using_dt: bool = True, integrator: str = "euler"):
+        """
+        Initializes all of the positional, velocity, acceleration, maximum, and draw shape variables.
+        Args:
+            ax: the axis on which the robot is drawn
+            x: initial x position of the robot
+            y: initial y position of the robot
+            heading: initial heading of the robot
+            MAX_VELOCITY: maximum linear velocity
+            MAX_ACCELERATION: maximum linear acceleration
+            MAX_TURN_VELOCITY: maximum rate of change in velocity angle
+            scaling: how much bigger or smaller the robot is drawn
+            isdiffy: if the robot is drawn with a differential swerve or mecanum drivetrain
+            using_dt: it makes the robots velocity independent of the fps
+                      it also adds error to robots movements because of floating-point operations
+            integrator: "euler" or "arc", arc follows the curve the robot drives so a slow frame doesn't throw the robot off
+        """
+        # --- instance variables --- #
+
+        # positional, velocity, acceleration and maximum variables
+        super().__init__(x, y, heading, MAX_VELOCITY, MAX_ACCELERATION, MAX_TURN_VELOCITY, MAX_TURN_ACCELERATION,
+                         integrator=integrator)
+
+        # the plot axis
+        self.ax = ax
+
+        # for drawing
+        # to scale the robot shown by a factor of scaling
+        self.scaling = scaling
+        self.is_diffy = isdiffy
+
+        # --- drawing variables --- #
+
+        # initializes the variables used to draw the robot
+        self.init_ui()
+
+        self.using_dt = using_dt
+
+        # so that the robot moves at a constant speed regardless of the fps
+        self.last_time = time.time()
+
+        # if it's set, every state is recorded to it (a TrajectoryRecorder)
+        self.recorder = None
+
+        # if it's set, it's called before every step to steer the robot (like a PurePursuit)
+        self.controller = None
+
+    def init_ui(self):
+        """
+        Initializes the objects used to display the robot on the plot.
+        The shapes of both drivetrains are made once in the robot's own frame (see rendering.py),
+        every frame they're just rotated and moved to where the robot is.
+        """
+        self.drawing = RobotDrawing(self.ax, self.scaling, self.is_diffy)
+
+    # --- Helpers --- #
+    # --- Drawing and Updates --- #
+    def update(self):
+        """
+        Updates the position and heading, velocities, and accelerations
+        This function does not draw the robot, the draw function does that.
+        This function is called by the draw function before drawing the robot.
+        """
+        # also we're just going to call it a feature: the small amount of error
+        # compounded from floating-point operations
+
+        # it 'imitates' real life
+
+        # if using_dt is True, then the step is however long the last frame took,
+        # otherwise every frame counts as exactly one 30 ms step
+        now = time.time()
+        if self.controller is not None:
+            self.controller(self)
+        self.step(now - self.last_time if self.using_dt else 1 / self.FPS)
+
+        if self.recorder is not None:
+            self.recorder.record(self.get_state())
+
+        # --- updating timer for dt --- #
+
+        # getting the current time
+        self.last_time = now
+
+    def draw(self, ax):
+        """
+        Calls the update function, and draws the robot, either with a mecanum or differential swerve drivetrain.
+        It updates all the shapes positions and attributes.
+        The is_diffy variable controls if a differential swerve or mecanum drivetrain is drawn.
+
+        Args:
+            ax: the axis the robot is drawn on
+        """
+        self.update()
+
+        if not self.is_diffy:
+            # draws the mecanum drivetrain
+            return self.draw_mecanum()
+        else:
+            # draws the differential swerve drivetrain
+            return self.draw_diffy()
+
+    def draw_mecanum(self):
+        """
+        Specifically draws the mecanum drivetrain
+        This function is called by the general draw() function when the is_diffy variable is False.
+        """
+        return self.drawing.draw(self.x, self.y, self.heading, self.velocity_angle, is_diffy=False)
+
+    def draw_diffy(self):
+        """
+        Specifically draws the differential swerve drivetrain.
+        This function is called by the general draw() function when the variable is_diffy is True.
+        """
+        return self.drawing.draw(self.x, self.y, self.heading, self.velocity_angle, is_diffy=True)
+
+
+# do I really need a comment?
+def updateFrame(frame, ax, robot: Robot, trail: Trail, drawn_path: DrawnPath, loop=None,
+                profiler: FrameProfiler | None = None, overlay: ProfilerOverlay | None = None, telemetry=None,
+                drawn_field: DrawnField | None = None, editing: WaypointEditing | None = None):
+    if profiler is not None:
+        profiler.start()
+
+    if telemetry is not None:
+        # poses and velocities sent from outside replace the simulated ones before the physics run,
+        # a replay or routine only plays back what's in the file so the commands are thrown away
+        if loop is None:
+            telemetry.apply(robot)
+        elif hasattr(loop, "simulator"):
+            telemetry.apply(loop.simulator.robot)
+        else:
+            telemetry.commands()
+
+    if loop is not None:
+        # the physics catch up on their own clock (or the recording is played up to it),
+        # and the robot is drawn between the two states around it
+        loop.advance()
+        state = dict(zip(loop.fields, loop.interpolated()))
+        x, y, heading = state["x"], state["y"], state.get("heading", 0)
+        velocity, velocity_angle = state.get("velocity", 0), state.get("velocity_angle", 0)
+    else:
+        # the robot moves itself once every frame
+        robot.update()
+        x, y, heading, velocity, velocity_angle = robot.x, robot.y, robot.heading, robot.velocity, robot.velocity_angle
+        state = None
+
+    if telemetry is not None:
+        # it never waits, the state is just queued for the telemetry thread
+        telemetry.publish(robot.get_state() if state is None else
+                          [state.get(name, 0.0) for name in STATE_FIELDS])
+
+    if profiler is not None:
+        profiler.mark("physics")
+        if hasattr(loop, "dropped"):
+            # the steps the physics couldn't catch up on, so it's fallen behind real time
+            profiler.count("dropped steps", loop.dropped)
+
+    # updating the robot trail, only the newest segment gets added
+    # the trig is so that the trail comes out of the back of the robot
+    trail.add_point(x - 0.25 * math.sin(math.radians(-heading)),
+                    y - 0.25 * math.cos(math.radians(-heading)),
+                    velocity / robot.MAX_VELOCITY)
+
+    if profiler is not None:
+        profiler.mark("trail")
+
+    # only does anything if the path was changed
+    drawn_path.update()
+
+    if loop is not None:
+        artists = robot.drawing.draw(x, y, heading, velocity_angle, robot.is_diffy)
+    else:
+        # the robot draws itself (it was already updated)
+        artists = robot.draw_diffy() if robot.is_diffy else robot.draw_mecanum()
+    artists = drawn_path.get_artists() + trail.get_artists() + artists
+
+    if drawn_field is not None:
+        # one lookup of the robot's footprint in the field's grid
+        drawn_field.update(x, y, heading)
+        artists += drawn_field.get_artists()
+
+    if editing is not None:
+        # the waypoints, only while one is being dragged
+        artists += editing.get_artists()
+
+    if profiler is not None:
+        profiler.mark("draw")
+    if overlay is not None:
+        artists += overlay.update()
+    return artists
+
+
+# --------------- MAIN --------------- #
+
+# calls the functions which actually does stuff
+# the function is literally useless, but I hold onto my c++ roots
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shows the robot moving.")
+    parser.add_argument("--sim-rate", type=float, default=None,
+                        help="simulate this many times a second separately from the drawing (like 200)")
+    parser.add_argument("--record", default=None, help="record every state of the robot to this file")
+    parser.add_argument("--replay", default=None, help="play back a recorded file instead of simulating")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="how fast the replay (or routine) is played")
+    parser.add_argument("--profile", action="store_true", help="show how long each part of the frames takes")
+    parser.add_argument("--profile-to", default=None, help="save the frame timings to this file at exit")
+    parser.add_argument("--integrator", choices=INTEGRATORS, default="euler", help="how the robot's steps are integrated")
+    parser.add_argument("--telemetry", choices=PROTOCOLS, default=None,
+                        help="stream the state and take commands over udp or tcp (see python -m pure_pursuit telemetry)")
+    parser.add_argument("--telemetry-port", type=int, default=5800, help="the port the telemetry listens on")
+    parser.add_argument("--field", default=None, help="a field file with obstacles to check the robot against")
+    parser.add_argument("--routine", default=None, help="play an autonomous routine file (json, see routine.py)")
+    parser.add_argument("--routine-cache", default=".routine_cache", help="where compiled routines are saved")
+    parser.add_argument("--edit", action="store_true",
+                        help="edit the path with the mouse: drag waypoints, double click to add, right click to delete")
+    args = parser.parse_args()
+
+    animation = Animation(sim_rate=args.sim_rate, record=args.record, replay=args.replay,
+                          replay_speed=args.replay_speed, profile=args.profile, profile_to=args.profile_to,
+                          integrator=args.integrator,
+                          telemetry=TelemetryBridge(port=args.telemetry_port, protocol=args.telemetry)
+                          if args.telemetry is not None else None,
+                          field=FieldMap.load(args.field) if args.field is not None else None,
+                          routine=Routine.load(args.routine) if args.routine is not None else None,
+                          routine_cache=args.routine_cache, edit=args.edit)
+    animation.display()
+    plt.close()
+
+
+# kinda rhymes
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# --------------- DEPENDENCIES --------------- #
+# the waypoints are drawn as markers on a line
+from matplotlib.lines import Line2D
+
+# because we love numpy
+import numpy as np
+
+# ---------------- EDITING ----------------- #
+
+
+class WaypointEditing:
+    """
+    Editing a PathEditor's waypoints with the mouse: drag a waypoint to move it, double click to add one,
+    and right click one to delete it. Nothing happens while the toolbar is zooming or panning.
+
+    The waypoints and the path are normally in the background. While a waypoint is being dragged they're
+    animated instead, so every move shows up on the next frame without redrawing the whole plot.
+    """
+
+    def __init__(self, ax, editor, drawn_path, on_background=None, pick_radius: float = 8, **marker_kwargs):
+        """
+        Args:
+            ax: the axis the path is drawn on
+            editor: the PathEditor being edited
+            drawn_path: the DrawnPath showing the editor's path
+            on_background: called when what's in the background changed, so it can be redrawn
+            pick_radius: how many pixels away from a waypoint a click can be and still grab it
+            marker_kwargs: passed along to the Line2D of the waypoints (color, markersize, etc.)
+        """
+        self.ax = ax
+        self.editor = editor
+        self.drawn_path = drawn_path
+        self.on_background = on_background
+        self.pick_radius = pick_radius
+
+        # the waypoint being dragged
+        self.dragging = None
+
+        marker_kwargs = {"marker": "o", "markersize": 4, "color": (0, 0, 0, 0.5), "zorder": 1, **marker_kwargs}
+        self.markers = Line2D([], [], linestyle="none", **marker_kwargs)
+        ax.add_line(self.markers)
+        self.update_markers()
+
+        canvas = ax.figure.canvas
+        self.connections = [canvas.mpl_connect("button_press_event", self.on_press),
+                            canvas.mpl_connect("motion_notify_event", self.on_motion),
+                            canvas.mpl_connect("button_release_event", self.on_release)]
+
+    def update_markers(self):
+        data = self.editor.path.data
+        self.markers.set_data(data["x"], data["y"])
+
+    def _active(self, event) -> bool:
+        """If the event is a click on the plot itself (not a button, and not while zooming or panning)."""
+        toolbar = getattr(self.ax.figure.canvas, "toolbar", None)
+        return event.inaxes is self.ax and event.xdata is not None and not getattr(toolbar, "mode", "")
+
+    def pick(self, event) -> int | None:
+        """The waypoint under the mouse, if there is one."""
+        data = self.editor.path.data
+        pixels = self.ax.transData.transform(np.column_stack((data["x"], data["y"])))
+        distances = np.hypot(pixels[:, 0] - event.x, pixels[:, 1] - event.y)
+        index = int(np.argmin(distances))
+        return index if distances[index] <= self.pick_radius else None
+
+    def _animate(self, animated: bool):
+        """Moves the path and the waypoints out of the background (or back into it)."""
+        self.drawn_path.set_static(not animated)
+        self.markers.set_animated(animated)
+        if self.on_background is not None:
+            self.on_background()
+
+    # --- mouse --- #
+
+    def on_press(self, event):
+        if not self._active(event):
+            return
+        index = self.pick(event)
+
+        if event.button == 1 and index is not None:
+            self.dragging = index
+            self._animate(True)
+        elif event.button == 1 and event.dblclick:
+            self.editor.insert(self.editor.insertion_index(event.xdata, event.ydata), event.xdata, event.ydata)
+            self.update_markers()
+        elif event.button == 3 and index is not None:
+            try:
+                self.editor.delete(index)
+            except ValueError:
+                # too few waypoints left
+                return
+            self.update_markers()
+
+    def on_motion(self, event):
+        if self.dragging is None or event.inaxes is not self.ax or event.xdata is None:
+            return
+        self.editor.move(self.dragging, event.xdata, event.ydata)
+        self.update_markers()
+
+    def on_release(self, event):
+        if self.dragging is None:
+            return
+        self.dragging = None
+        self._animate(False)
+
+    def get_artists(self) -> tuple:
+        """The artists that need to be redrawn each frame (only while dragging)."""
+        return (self.markers,) if self.dragging is not None else ()
@@ -0,0 +1,228 @@
+# --------------- DEPENDENCIES --------------- #
+# drawing without a window, every worker has its own figure
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# because we love numpy
+import numpy as np
+
+# because I'll probably need it
+import math
+
+# the frames are split between processes, then put together by ffmpeg
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import subprocess
+import tempfile
+
+# the same drawing as the animation
+from .trail import Trail, velocity_colormap
+from .rendering import DrawnPath, RobotDrawing
+
+# the runs being rendered
+from ..recording import TrajectoryRecorder, TrajectoryReader
+from ..kinematics import interpolate_states
+
+# ---------------- FRAMES ----------------- #
+
+# anything else is written as a folder of pngs
+VIDEO_SUFFIXES = (".mp4", ".mkv", ".mov", ".webm", ".gif")
+
+
+class StaticPath:
+    """A path that never changes, so a worker process can draw it without the original Path (or its Waypoints)."""
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+        self.version = geometry.version
+        self.is_closed = geometry.is_closed
+
+
+def sample_states(reader: TrajectoryReader, times: np.ndarray) -> dict:
+    """
+    The states at a lot of times at once, interpolated between the recorded rows.
+
+    Return:
+        a dict of field name -> array with a value for every time
+    """
+    recorded = np.asarray(reader.column("time"))
+    after = np.clip(np.searchsorted(recorded, times, side="right"), 1, len(recorded) - 1)
+    before = after - 1
+
+    start, end = recorded[before], recorded[after]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        alpha = np.clip(np.where(end > start, (times - start) / (end - start), 0), 0, 1)
+
+    columns = [np.asarray(reader.column(name)) for name in reader.fields]
+    state = interpolate_states([column[before] for column in columns], [column[after] for column in columns],
+                               alpha, reader.fields)
+    return dict(zip(reader.fields, state))
+
+
+def frame_times(reader: TrajectoryReader, fps: float, speed: float = 1.0) -> np.ndarray:
+    """The time in the recording that every frame shows."""
+    time = reader.column("time")
+    first, last = float(time[0]), float(time[-1])
+    return first + np.arange(int((last - first) / speed * fps) + 1) * speed / fps
+
+
+def _trail_points(states: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Where the trail is for each state, the trig is so the trail comes out of the back of the robot."""
+    heading = np.radians(-states.get("heading", 0))
+    return states["x"] - 0.25 * np.sin(heading), states["y"] - 0.25 * np.cos(heading)
+
+
+def _make_figure(size: tuple[float, float], dpi: float, xlim: tuple, ylim: tuple):
+    """The same plot as the animation, but on its own Agg canvas."""
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(aspect=1)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    fig.tight_layout()
+    return fig, ax
+
+
+def render_range(filename, start: int, stop: int, folder, path, fps: float = 30, speed: float = 1.0,
+                 size: tuple[float, float] = (8, 6), dpi: float = 100, xlim: tuple = (-6, 6), ylim: tuple = (-4, 4),
+                 scaling: float = 1, is_diffy: bool = True, max_velocity: float | None = None) -> int:
+    """
+    Renders the frames from start to stop of a recording as pngs, this is what every worker process runs.
+
+    The trail before the first frame is added all at once, so any range can be rendered without the ones before it.
+
+    Return:
+        how many frames were written
+    """
+    reader = TrajectoryReader(filename)
+    times = frame_times(reader, fps, speed)[:stop]
+    states = sample_states(reader, times)
+    if max_velocity is None:
+        max_velocity = reader.metadata.get("MAX_VELOCITY", 20)
+
+    fig, ax = _make_figure(size, dpi, xlim, ylim)
+    DrawnPath(ax, path, static=True, linestyle=(0, (5, 1)), color=(0, 0, 0, 0.35), dash_capstyle='butt',
+              dash_joinstyle="round", linewidth=1.5, zorder=1)
+    drawing = RobotDrawing(ax, scaling, is_diffy)
+    for artist in (drawing.shapes, drawing.lines):
+        artist.set_animated(False)
+
+    xs, ys = _trail_points(states)
+    values = states.get("velocity", np.zeros(len(times))) / max_velocity
+    trail = Trail(ax, velocity_colormap(), x=xs[0], y=ys[0], linewidth=5, zorder=1)
+    trail.add_points(xs[:start], ys[:start], values[:start])
+
+    velocity_angle = states.get("velocity_angle", np.zeros(len(times)))
+    heading = states.get("heading", np.zeros(len(times)))
+    for frame in range(start, len(times)):
+        trail.add_point(xs[frame], ys[frame], values[frame])
+        drawing.draw(states["x"][frame], states["y"][frame], heading[frame], velocity_angle[frame])
+        fig.savefig(os.path.join(folder, f"frame_{frame:06d}.png"))
+    return len(times) - start
+
+
+# ---------------- EXPORT ----------------- #
+
+
+def render(filename, output, path, fps: float = 30, speed: float = 1.0, workers: int | None = None,
+           encoder: str = "ffmpeg", **render_kwargs) -> int:
+    """
+    Renders a whole recording, split into ranges of frames across a process pool.
+
+    Args:
+        filename: the recorded trajectory (see recording.py)
+        output: a video file (.mp4, .gif, etc.) which is encoded with the encoder, or a folder for the pngs
+        path: the path drawn under the robot (anything with a geometry)
+        fps: frames per second of the output
+        speed: how many times faster than real time the recording is played
+        workers: how many processes render at the same time, defaults to the number of cpus
+        encoder: the ffmpeg executable used for videos
+        render_kwargs: passed along to render_range (size, dpi, scaling, is_diffy, etc.)
+
+    Return:
+        how many frames were rendered
+    """
+    output = os.fspath(output)
+    is_video = output.lower().endswith(VIDEO_SUFFIXES)
+    if is_video and shutil.which(encoder) is None:
+        raise RuntimeError(f"{encoder} wasn't found, render to a folder of pngs instead")
+
+    count = len(frame_times(TrajectoryReader(filename), fps, speed))
+    workers = workers or os.cpu_count() or 1
+
+    # a few ranges per worker so one slow range doesn't hold everything up
+    bounds = np.linspace(0, count, min(count, 4 * workers) + 1).astype(int)
+
+    # the workers get a copy of the geometry instead of the path and its waypoints
+    path = StaticPath(path.geometry)
+
+    folder = tempfile.mkdtemp(prefix="frames_") if is_video else output
+    os.makedirs(folder, exist_ok=True)
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            jobs = [pool.submit(render_range, filename, start, stop, folder, path, fps, speed, **render_kwargs)
+                    for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+            rendered = sum(job.result() for job in jobs)
+
+        if is_video:
+            subprocess.run([encoder, "-y", "-loglevel", "error", "-framerate", f"{fps:g}",
+                            "-i", os.path.join(folder, "frame_%06d.png"), "-pix_fmt", "yuv420p",
+                            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", output], check=True)
+    finally:
+        if is_video:
+            shutil.rmtree(folder, ignore_errors=True)
+    return rendered
+
+
+def simulate(filename, duration: float, path, dt: float = 1 / 200, speed: float = 8, laps: float | None = None,
+             profile: bool = False):
+    """Follows a path headlessly and records it, so it can be rendered."""
+    from ..follower import PurePursuit
+    from ..kinematics import RobotModel
+    from ..simulation import Simulator
+    from ..velocity_profile import VelocityProfile
+
+    robot = RobotModel(velocity=0, turn_velocity=0)
+    controller = PurePursuit(path, speed=speed, laps=laps,
+                             profile=VelocityProfile.for_robot(path, robot) if profile else None)
+    with TrajectoryRecorder(filename, metadata={"dt": dt, "MAX_VELOCITY": robot.MAX_VELOCITY}) as recorder:
+        Simulator(robot, dt=dt, controller=controller, recorder=recorder).run(duration, record=False)
+
+
+# --------------- MAIN --------------- #
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Renders a run to a video or a folder of pngs, without a window.")
+    parser.add_argument("output", help="a video file (like run.mp4) or a folder for the pngs")
+    parser.add_argument("--replay", default=None, help="a recorded run to render")
+    parser.add_argument("--simulate", type=float, default=30,
+                        help="seconds of following the default path to simulate when there's no --replay")
+    parser.add_argument("--fps", type=float, default=30, help="frames per second of the output")
+    parser.add_argument("--speed", type=float, default=1.0, help="how many times faster than real time")
+    parser.add_argument("--workers", type=int, default=None, help="how many processes render at once")
+    parser.add_argument("--dpi", type=float, default=100, help="resolution of the frames")
+    parser.add_argument("--mecanum", action="store_true", help="draw the mecanum drivetrain")
+    args = parser.parse_args()
+
+    from ..path import path
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as folder:
+        filename = args.replay
+        if filename is None:
+            filename = os.path.join(folder, "run.traj")
+            simulate(filename, args.simulate, path)
+
+        frames = render(filename, args.output, path, fps=args.fps, speed=args.speed, workers=args.workers,
+                        dpi=args.dpi, is_diffy=not args.mecanum)
+    print(f"rendered {frames} frames in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# --------------- DEPENDENCIES --------------- #
+# because we love numpy
+import numpy as np
+
+# the counters and saving them
+from time import perf_counter_ns
+import json
+
+# ---------------- PROFILER ----------------- #
+
+# the parts of a frame that are timed, in the order they happen
+PHASES = ("physics", "trail", "draw", "blit")
+
+
+class FrameProfiler:
+    """
+    Times each phase of every frame with perf_counter_ns, which is about as cheap as a timer gets.
+
+    The last window frames are kept in a numpy ring buffer (a row per frame, a column per phase plus the whole
+    frame), so the percentiles are only worked out when something asks for them, never per frame.
+    The frame function marks its own phases, and the animation (BlitAnimation) marks the blit after it.
+    """
+
+    def __init__(self, phases=PHASES, window: int = 300):
+        """
+        Args:
+            phases: the names of the phases, in the order they're marked
+            window: how many of the latest frames the percentiles are worked out from
+        """
+        self.phases = tuple(phases)
+        self.columns = {name: index for index, name in enumerate(self.phases)}
+
+        # nanoseconds, the last column is the time from the start of one frame to the start of the next
+        # there's a row for the frame in progress on top of the window of finished ones
+        self.window = window
+        self.times = np.zeros((window + 1, len(self.phases) + 1), dtype=np.int64)
+        self.totals = np.zeros(len(self.phases) + 1, dtype=np.int64)
+        self.worst = np.zeros(len(self.phases) + 1, dtype=np.int64)
+        self.frames = 0
+
+        # other numbers worth keeping (like the steps the physics dropped)
+        self.counters = {}
+
+        self._frame_start = None
+        self._last = None
+
+    def start(self):
+        """Called at the start of every frame."""
+        now = perf_counter_ns()
+        if self._frame_start is not None:
+            # the frame before this one is done
+            row = self.times[self.frames % len(self.times)]
+            row[-1] = now - self._frame_start
+            self.totals += row
+            np.maximum(self.worst, row, out=self.worst)
+            self.frames += 1
+            self.times[self.frames % len(self.times)] = 0
+        self._frame_start = self._last = now
+
+    def mark(self, phase: str):
+        """Called at the end of a phase, it's timed from the end of the phase before it."""
+        if self._last is None:
+            return
+        now = perf_counter_ns()
+        self.times[self.frames % len(self.times), self.columns[phase]] += now - self._last
+        self._last = now
+
+    def count(self, name: str, value):
+        """Keeps the latest value of a counter."""
+        self.counters[name] = value
+
+    def percentiles(self, q=(50, 90, 99)) -> dict:
+        """
+        Return:
+            phase name (and "frame") -> the percentiles in milliseconds over the window
+        """
+        if self.frames == 0:
+            return {}
+        if self.frames < len(self.times):
+            filled = self.times[:self.frames]
+        else:
+            # every row but the one of the frame in progress, which isn't done yet
+            filled = np.delete(self.times, self.frames % len(self.times), axis=0)
+        values = np.percentile(filled, q, axis=0) / 1e6
+        return {name: dict(zip((f"p{point}" for point in q), values[:, index].tolist()))
+                for index, name in enumerate(self.phases + ("frame",))}
+
+    def summary(self) -> dict:
+        """Everything worth saving, in milliseconds."""
+        names = self.phases + ("frame",)
+        frames = max(self.frames, 1)
+        percentiles = self.percentiles()
+        frame = percentiles.get("frame", {}).get("p50", 0)
+        return {"frames": self.frames,
+                "window": self.window,
+                "fps": 1000 / frame if frame else None,
+                "percentiles": percentiles,
+                "mean": {name: total / frames / 1e6 for name, total in zip(names, self.totals.tolist())},
+                "max": {name: worst / 1e6 for name, worst in zip(names, self.worst.tolist())},
+                "counters": self.counters}
+
+    def dump(self, filename):
+        """Saves the summary as json."""
+        with open(filename, "w") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def report(self) -> str:
+        """The percentiles as a small table, for the overlay."""
+        lines = [f"{'':8}{'p50':>7}{'p90':>7}{'p99':>7} ms"]
+        for name, values in self.percentiles().items():
+            lines.append(f"{name:8}" + "".join(f"{value:7.2f}" for value in values.values()))
+        lines += [f"{name}: {value}" for name, value in self.counters.items()]
+        return "\n".join(lines)
+
+
+# ---------------- DISPLAY ----------------- #
+
+
+class ProfilerOverlay:
+    """The profiler's percentiles written in the corner of the plot, only refreshed every few frames."""
+
+    def __init__(self, ax, profiler: FrameProfiler, refresh: int = 15):
+        """
+        Args:
+            ax: the axis it's drawn on
+            profiler: the profiler being shown
+            refresh: how many frames between updates of the text
+        """
+        self.profiler = profiler
+        self.refresh = refresh
+        self.text = ax.text(0.01, 0.99, "", transform=ax.transAxes, va="top", ha="left", family="monospace",
+                            fontsize=7, animated=True, zorder=5,
+                            bbox={"facecolor": "white", "alpha": 0.7, "edgecolor": "none"})
+
+    def update(self) -> tuple:
+        """
+        Return:
+            the artists that need to be redrawn
+        """
+        if self.profiler.frames % self.refresh == 0:
+            self.text.set_text(self.profiler.report())
+        return self.text,
+
@@ -0,0 +1,375 @@
+# --------------- DEPENDENCIES --------------- #
+# the path is drawn as a line, the robot with collections of shapes
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
+
+# because we love numpy
+import numpy as np
+
+# because I'll probably need it
+import math
+
+# for scaling the robot templates
+import copy
+
+# ---------------- DRAWING ----------------- #
+
+
+def simplify(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker: the points that have to be kept so the line never moves more than tolerance away.
+
+    Every range is split at its point furthest from the line between its ends (found with numpy for the
+    whole range at once) until everything in between is within tolerance.
+
+    Return:
+        the indexes of the points that are kept, in order
+    """
+    count = len(points)
+    if count < 3 or tolerance <= 0:
+        return np.arange(count)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    ranges = [(0, count - 1)]
+    while ranges:
+        start, end = ranges.pop()
+        if end - start < 2:
+            continue
+
+        offsets = points[start + 1:end] - points[start]
+        direction = points[end] - points[start]
+        length = math.hypot(*direction)
+        if length > 0:
+            distances = np.abs(direction[0] * offsets[:, 1] - direction[1] * offsets[:, 0]) / length
+        else:
+            # the ends are on top of each other (like a closed path), so it's the distance to that point
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+
+        furthest = int(np.argmax(distances))
+        if distances[furthest] > tolerance:
+            middle = start + 1 + furthest
+            keep[middle] = True
+            ranges += [(start, middle), (middle, end)]
+
+    return np.flatnonzero(keep)
+
+
+class DrawnPath:
+    """
+    The dashed line showing the path the robot is following.
+
+    It reads the path's cached geometry and draws a simplified version of it, with only as many points as can
+    be seen at the current zoom (tolerance pixels). That's only worked out again when the path or the view changes,
+    so a path that doesn't change costs nothing per frame, even with tens of thousands of points.
+
+    A static path isn't animated, so it's drawn once into the background the animation blits on top of,
+    instead of every frame. When it does change, on_change is called so the background can be redrawn.
+    """
+
+    def __init__(self, ax, path, tolerance: float = 0.5, static: bool = False, **line_kwargs):
+        """
+        Args:
+            ax: the axis the path is drawn on
+            path: the path being drawn (a Path, WaypointArray or SplinePath, anything with a geometry)
+            tolerance: how many pixels the simplified line can be off by, 0 draws every point
+            static: draw the path into the background instead of every frame
+            line_kwargs: passed along to the Line2D (color, linestyle, etc.)
+        """
+        self.ax = ax
+        self.path = path
+        self.tolerance = tolerance
+        self.static = static
+
+        # called when a static path changed, so whatever draws the background can redraw it
+        self.on_change = None
+
+        # the version of the path and the view that are currently drawn
+        self.version = None
+        self.view = None
+
+        self.line = Line2D([], [], animated=not static, **line_kwargs)
+        ax.add_line(self.line)
+
+        self.update()
+
+    def _view(self) -> tuple:
+        """What the simplification depends on: the axis limits and how big the axis is on the screen."""
+        return self.ax.get_xlim(), self.ax.get_ylim(), tuple(self.ax.bbox.bounds)
+
+    def update(self) -> bool:
+        """
+        Updates the line if the path or the view changed.
+
+        Return:
+            if the line was changed
+        """
+        geometry = self.path.geometry
+        view = self._view()
+        if geometry.version == self.version and view == self.view:
+            return False
+
+        points = geometry.closed
+        if self.tolerance > 0:
+            # the tolerance in pixels turned into plot units
+            (x_low, x_high), (y_low, y_high), (_, _, width, height) = view
+            pixels = min(width / max(abs(x_high - x_low), 1e-12), height / max(abs(y_high - y_low), 1e-12))
+            points = points[simplify(points, self.tolerance / max(pixels, 1e-12))]
+
+        self.line.set_data(points[:, 0], points[:, 1])
+        redraw = self.static and self.version is not None
+        self.version = geometry.version
+        self.view = view
+
+        if redraw and self.on_change is not None:
+            self.on_change()
+        return True
+
+    def set_static(self, static: bool):
+        """Switches between drawing the path into the background and drawing it every frame (like while it's edited)."""
+        self.static = static
+        self.line.set_animated(not static)
+
+    def get_artists(self) -> tuple:
+        """The artists that need to be redrawn each frame (none if the path is in the background)."""
+        return () if self.static else (self.line,)
+
+
+# ---------------- ROBOT ----------------- #
+
+# how many points every shape of the robot has, so they all fit in one (shapes, points, 2) array
+SHAPE_POINTS = 24
+
+
+def _polar(radius: float, degrees: float) -> tuple[float, float]:
+    """A point in the robot's frame from how far and what angle from the center (0 degrees is to the right)."""
+    return radius * math.cos(math.radians(degrees)), radius * math.sin(math.radians(degrees))
+
+
+def _pad(points) -> np.ndarray:
+    """Repeats the last point of a shape until it has SHAPE_POINTS points."""
+    points = np.asarray(points, dtype=float)
+    return np.concatenate((points, np.repeat(points[-1:], SHAPE_POINTS - len(points), axis=0)))
+
+
+def _rectangle(center, width: float, height: float) -> np.ndarray:
+    x, y = center
+    return _pad([(x - width / 2, y - height / 2), (x + width / 2, y - height / 2),
+                 (x + width / 2, y + height / 2), (x - width / 2, y + height / 2)])
+
+
+def _circle(center, radius: float) -> np.ndarray:
+    angles = np.linspace(0, 2 * np.pi, SHAPE_POINTS, endpoint=False)
+    return np.column_stack((center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)))
+
+
+def _rollers(center, width: float, height: float, count: int, slope: float) -> np.ndarray:
+    """Diagonal lines across a mecanum wheel (cut off at the top and bottom of the wheel)."""
+    x, y = center
+    middles = y - height / 2 + (np.arange(count) + 0.5) * height / count
+    starts = np.column_stack((np.full(count, x - width / 2), middles - slope * width / 2))
+    ends = np.column_stack((np.full(count, x + width / 2), middles + slope * width / 2))
+
+    # the part of each line that's inside the wheel
+    with np.errstate(divide="ignore", invalid="ignore"):
+        low = (y - height / 2 - starts[:, 1]) / (ends[:, 1] - starts[:, 1])
+        high = (y + height / 2 - starts[:, 1]) / (ends[:, 1] - starts[:, 1])
+    first = np.clip(np.minimum(low, high), 0, 1)[:, None]
+    last = np.clip(np.maximum(low, high), 0, 1)[:, None]
+    return np.stack((starts + (ends - starts) * first, starts + (ends - starts) * last), axis=1)
+
+
+class BodyTemplate:
+    """
+    The shapes of a drivetrain in the robot's own frame (x to the right, y forwards, robot center at (0, 0)).
+
+    The shapes are made once, then every frame they are all rotated and moved to the robot at the same time.
+    Spinning shapes (swerve wheels) point in the direction the robot is moving instead of the way it's facing.
+    """
+
+    def __init__(self, shapes: list[tuple], lines: np.ndarray | None = None):
+        """
+        Args:
+            shapes: (points, facecolor, edgecolor, linewidth, spin center or None) for every shape, in drawing order
+            lines: (n, 2, 2) line segments drawn on top of the shapes
+        """
+        self.points = np.stack([shape[0] for shape in shapes])
+        self.facecolors = [shape[1] for shape in shapes]
+        self.edgecolors = [shape[2] for shape in shapes]
+        self.linewidths = [shape[3] for shape in shapes]
+
+        # the spinning shapes are kept around their own centers so they can be rotated separately
+        self.spinning = np.array([shape[4] is not None for shape in shapes])
+        self.centers = np.array([shape[4] if shape[4] is not None else (0.0, 0.0) for shape in shapes], dtype=float)
+        self.points[self.spinning] -= self.centers[self.spinning][:, None]
+
+        self.lines = np.zeros((0, 2, 2)) if lines is None else np.asarray(lines, dtype=float)
+
+    def scaled(self, scaling: float) -> "BodyTemplate":
+        """A copy of the template scaled up or down."""
+        template = copy.copy(self)
+        template.points = self.points * scaling
+        template.centers = self.centers * scaling
+        template.lines = self.lines * scaling
+        return template
+
+
+def diffy_template() -> BodyTemplate:
+    """The differential swerve drivetrain."""
+    # r=right, l=left, f=front, b=back
+    hole_fr, hole_br = _polar(0.24234531148, 45), _polar(0.24234531148, 315)
+    hole_fl, hole_bl = _polar(0.23234531148, 133), _polar(0.23234531148, 226)
+    eye_r, eye_l = _polar(0.09848857801, 24), _polar(0.08762257748, 156)
+
+    shapes = [(_rectangle((0, 0), 0.5, 0.5), 'darkslategrey', 'darkslategrey', 1, None),
+              (_pad([_polar(0.24, 90), _polar(0.18172781845, 82), _polar(0.18172781845, 98)]),
+               'firebrick', 'firebrick', 1, None)]
+    shapes += [(_circle(hole, 0.055), 'darkgrey', 'darkgrey', 1, None) for hole in (hole_fr, hole_br, hole_fl, hole_bl)]
+    shapes += [(_rectangle(hole, 0.05, 0.1), 'black', 'black', 1, hole) for hole in (hole_fr, hole_br, hole_fl, hole_bl)]
+    shapes += [(_circle(eye, 0.05), 'white', 'white', 1, None) for eye in (eye_r, eye_l)]
+    shapes += [(_circle(eye, 0.02), 'black', 'black', 1, None) for eye in (eye_r, eye_l)]
+    shapes += [(_circle((0, 0), 0.01), 'black', 'black', 1, None)]
+    return BodyTemplate(shapes)
+
+
+def mecanum_template() -> BodyTemplate:
+    """The mecanum drivetrain."""
+    # r=right, l=left, f=front, b=back, the rollers of diagonal wheels go the same way
+    wheels = [((0.2, 0.15), 1), ((0.2, -0.15), -1), ((-0.2, 0.15), -1), ((-0.2, -0.15), 1)]
+    eye_r, eye_l = _polar(0.19235384061, 64), _polar(0.19235384061, 110)
+
+    shapes = [(_rectangle((0, 0), 0.3, 0.5), 'darkslategrey', 'darkslategrey', 1, None)]
+    shapes += [(_rectangle(center, 0.1, 0.2), 'none', 'black', 0.1, None) for center, _ in wheels]
+    shapes += [(_circle(eye, 0.05), 'white', 'white', 1, None) for eye in (eye_r, eye_l)]
+    shapes += [(_circle(eye, 0.02), 'black', 'black', 1, None) for eye in (eye_r, eye_l)]
+    shapes += [(_circle((0, 0), 0.01), 'black', 'black', 1, None)]
+
+    lines = np.concatenate([_rollers(center, 0.1, 0.2, 8, slope) for center, slope in wheels])
+    return BodyTemplate(shapes, lines)
+
+
+class RobotDrawing:
+    """
+    Draws the robot with one PolyCollection for all of its shapes and one LineCollection for the mecanum rollers,
+    instead of a patch for every part.
+    """
+
+    def __init__(self, ax, scaling: float = 1, is_diffy: bool = True, zorder: float = 2):
+        """
+        Args:
+            ax: the axis the robot is drawn on
+            scaling: how much bigger or smaller the robot is drawn
+            is_diffy: if the robot is drawn with a differential swerve or mecanum drivetrain
+            zorder: what the robot is drawn on top of
+        """
+        self.templates = {True: diffy_template().scaled(scaling), False: mecanum_template().scaled(scaling)}
+        self.is_diffy = None
+
+        self.shapes = PolyCollection([], animated=True, zorder=zorder)
+        self.lines = LineCollection([], color='black', linewidth=0.3, animated=True, zorder=zorder)
+        ax.add_collection(self.shapes)
+        ax.add_collection(self.lines)
+
+        self._use(is_diffy)
+
+    def _use(self, is_diffy: bool):
+        """Switches drivetrains, which is the only time the colors change."""
+        template = self.templates[is_diffy]
+        self.shapes.set_facecolor(template.facecolors)
+        self.shapes.set_edgecolor(template.edgecolors)
+        self.shapes.set_linewidth(template.linewidths)
+
+        # where the moved shapes are written every frame
+        self.points = np.empty_like(template.points)
+        self.line_points = np.empty_like(template.lines)
+        self.is_diffy = is_diffy
+
+    def draw(self, x: float, y: float, heading: float, velocity_angle: float, is_diffy: bool | None = None) -> tuple:
+        """
+        Moves every shape of the robot to its pose with one rotation.
+
+        Args:
+            x: the robot's x position
+            y: the robot's y position
+            heading: the way the robot is facing (degrees, counterclockwise)
+            velocity_angle: the way the robot is moving, the swerve wheels point this way
+            is_diffy: switches the drivetrain if it's given
+
+        Return:
+            the artists that need to be redrawn
+        """
+        if is_diffy is not None and is_diffy != self.is_diffy:
+            self._use(is_diffy)
+        template = self.templates[self.is_diffy]
+
+        rotation = _rotation(heading)
+        position = np.array((x, y))
+
+        # p' = p R^T + position, for every point at once
+        np.matmul(template.points, rotation.T, out=self.points)
+        self.points += position
+
+        spinning = template.spinning
+        if spinning.any():
+            # the swerve wheels spin around their own centers, which move with the body
+            centers = template.centers[spinning] @ rotation.T + position
+            self.points[spinning] = template.points[spinning] @ _rotation(velocity_angle).T + centers[:, None]
+
+        self.shapes.set_verts(self.points, closed=True)
+
+        if len(template.lines):
+            np.matmul(template.lines, rotation.T, out=self.line_points)
+            self.line_points += position
+        self.lines.set_segments(self.line_points)
+
+        return self.shapes, self.lines
+
+
+class DrawnField:
+    """
+    The obstacles of a FieldMap (see field.py), drawn once into the background, and an outline around the
+    robot that only shows up while it's hitting something.
+    """
+
+    def __init__(self, ax, field, footprint: tuple = (0.5, 0.5), zorder: float = 0.5):
+        """
+        Args:
+            ax: the axis the field is drawn on
+            field: the FieldMap
+            footprint: the (width, length) of the robot that's checked
+            zorder: what the obstacles are drawn on top of
+        """
+        self.field = field
+        self.points = field.footprint(*footprint)
+        self.hitting = False
+
+        left, right, bottom, top = field.bounds
+        # the grid is indexed [x, y], imshow wants [row, column] from the bottom
+        self.image = ax.imshow(field.grid.T, origin="lower", extent=(left, left + field.shape[0] * field.resolution,
+                                                                     bottom, bottom + field.shape[1] * field.resolution),
+                               cmap="Greys", vmin=0, vmax=2.5, interpolation="nearest", zorder=zorder)
+
+        width, length = footprint
+        self.corners = np.array(((-width, -length), (width, -length), (width, length), (-width, length),
+                                 (-width, -length))) / 2
+        self.outline, = ax.plot([], [], color="red", linewidth=1.5, animated=True, visible=False, zorder=3)
+
+    def update(self, x: float, y: float, heading: float) -> bool:
+        """Checks the robot against the field and moves the outline, returns if it's hitting anything."""
+        self.hitting = self.field.collides(x, y, heading, self.points)
+        self.outline.set_visible(self.hitting)
+        if self.hitting:
+            corners = self.corners @ _rotation(heading).T + (x, y)
+            self.outline.set_data(corners[:, 0], corners[:, 1])
+        return self.hitting
+
+    def get_artists(self) -> tuple:
+        return (self.outline,)
+
+
+def _rotation(degrees: float) -> np.ndarray:
+    """The 2D counterclockwise rotation matrix."""
+    radians = math.radians(degrees)
+    cos, sin = math.cos(radians), math.sin(radians)
+    return np.array(((cos, -sin), (sin, cos)))
@@ -0,0 +1,212 @@
+# --------------- DEPENDENCIES --------------- #
+# the trail is drawn as a collection of line segments
+from matplotlib.collections import LineCollection
+from matplotlib.path import Path
+from matplotlib.colors import LinearSegmentedColormap
+
+# because we love numpy
+import numpy as np
+
+# ---------------- TRAIL ----------------- #
+
+
+def velocity_colormap(alpha: float = 0.5) -> LinearSegmentedColormap:
+    """The red to yellow to green colormap the trail is colored with (slow to fast)."""
+    return LinearSegmentedColormap.from_list("velocity gradient", [(1, 0.16, 0, alpha), (1, 0.79, 0, alpha),
+                                                                   (0.47, 1, 0, alpha)])
+
+
+class Trail:
+    """
+    The trail that the robot leaves behind it, colored by how fast the robot was going.
+
+    All the segments and colors live in preallocated numpy arrays, so adding a point to
+    the trail only writes the one new segment instead of rebuilding the whole trail every frame.
+    The collection draws straight from a copy of the color array that is kept up to date the same way,
+    so nothing is copied per frame either.
+    """
+
+    def __init__(self, ax, cmap, x: float = 0, y: float = 0, max_length: int | None = None,
+                 ring: bool = False, capacity: int = 1024, **line_kwargs):
+        """
+        Args:
+            ax: the axis the trail is drawn on
+            cmap: the colormap used to color the trail based on the velocity (0 to 1)
+            x: x position of where the trail starts
+            y: y position of where the trail starts
+            max_length: the most segments the trail will hold, None means it never forgets
+            ring: when max_length is set, overwrite the oldest segment in place instead of
+                  shifting the trail over (cheaper, but the draw order of overlapping segments rotates)
+            capacity: how many segments are preallocated when max_length is None,
+                      the arrays double whenever they run out of room
+            line_kwargs: passed along to the LineCollection (linewidth, zorder, etc.)
+        """
+        if max_length is not None and max_length < 1:
+            raise ValueError("max_length has to be at least 1")
+        if ring and max_length is None:
+            raise ValueError("ring mode needs a max_length")
+
+        self.max_length = max_length
+        self.ring = ring
+
+        # the colors are looked up in a table instead of calling the colormap every frame
+        self.lut = cmap(np.linspace(0, 1, cmap.N))
+
+        # bounded trails get twice the room so the oldest half can be dropped all at once
+        if max_length is None:
+            size = capacity
+        elif ring:
+            size = max_length
+        else:
+            size = 2 * max_length
+
+        # (N, 2, 2) -> N segments of 2 points of (x, y)
+        self.segments = np.empty((size, 2, 2))
+        self.colors = np.zeros((size, 4))
+
+        # the live segments are self.segments[start:end] (except in ring mode, where it's all of them once full)
+        self.start = 0
+        self.end = 0
+
+        # the last point of the trail, the next segment starts here
+        self.last = np.array((x, y), dtype=float)
+
+        self.collection = LineCollection([], **line_kwargs)
+        ax.add_collection(self.collection)
+
+        # the slot of the collection's first path, the slots before it were forgotten and taken out of it
+        self.base = 0
+        self._share_colors()
+
+    def __len__(self):
+        # in ring mode start is the oldest slot, not the beginning of the live segments
+        return self.end if self.ring else self.end - self.start
+
+    def reset(self, x: float, y: float):
+        """Clears the trail and starts it again from (x, y)."""
+        self.start = 0
+        self.end = 0
+        self.base = 0
+        self.last[:] = (x, y)
+        self.collection.get_paths().clear()
+        self._share_colors()
+
+    def add_point(self, x: float, y: float, value: float):
+        """
+        Adds a segment from the last point to (x, y), this is the only work done per frame.
+
+        Args:
+            x: x position of the new point
+            y: y position of the new point
+            value: where the segment's color is on the colormap, from 0 to 1 (values outside are clipped)
+        """
+        index = min(max(int(value * (len(self.lut) - 1)), 0), len(self.lut) - 1)
+        self.collection.stale = True
+
+        if self.ring and self.end == self.max_length:
+            # ring mode: the slot after the newest one is the oldest one, so it gets overwritten
+            slot = self.start
+            self.start = (self.start + 1) % self.max_length
+            self._write(slot, x, y, index)
+            self.collection.get_paths()[slot] = Path(self.segments[slot])
+            return
+
+        if self.end == len(self.segments):
+            self._make_room()
+
+        self._write(self.end, x, y, index)
+        self.end += 1
+        self.collection.get_paths().append(Path(self.segments[self.end - 1]))
+
+        if self.max_length is not None and not self.ring and self.end - self.start > self.max_length:
+            self._forget()
+
+    def add_points(self, xs, ys, values):
+        """
+        Adds a lot of points at once, like when a trail is rebuilt partway through a recording.
+
+        Args:
+            xs: x positions of the new points
+            ys: y positions of the new points
+            values: where each segment's color is on the colormap, from 0 to 1
+        """
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        if len(xs) == 0:
+            return
+        if self.max_length is not None:
+            # the bounded trails drop segments as they go, so it's done one at a time
+            for x, y, value in zip(xs, ys, np.broadcast_to(values, xs.shape)):
+                self.add_point(x, y, value)
+            return
+
+        count = len(xs)
+        while self.end + count > len(self.segments):
+            self._make_room()
+
+        points = np.column_stack((xs, ys))
+        new = slice(self.end, self.end + count)
+        self.segments[new, 0] = np.concatenate((self.last[None], points[:-1]))
+        self.segments[new, 1] = points
+        indexes = np.clip((np.asarray(values, dtype=float) * (len(self.lut) - 1)).astype(int), 0, len(self.lut) - 1)
+        self.colors[new] = self.lut[indexes]
+        self.shown[new.start - self.base:new.stop - self.base] = self.colors[new]
+        self.last[:] = points[-1]
+
+        self.collection.get_paths().extend(Path(segment) for segment in self.segments[new])
+        self.end += count
+        self.collection.stale = True
+
+    def _write(self, slot: int, x: float, y: float, index: int):
+        """Writes one segment and its color into the arrays."""
+        self.segments[slot, 0] = self.last
+        self.segments[slot, 1] = (x, y)
+        self.colors[slot] = self.shown[slot - self.base] = self.lut[index]
+        self.last[:] = (x, y)
+
+    def _forget(self):
+        """Forgets the oldest segment of a bounded trail."""
+        # it's made see-through until enough have built up to take them out of the collection together,
+        # taking them out one at a time would shift every path and color over every frame
+        self.shown[self.start - self.base, 3] = 0
+        self.start += 1
+        if self.start - self.base >= max(self.max_length // 8, 1):
+            del self.collection.get_paths()[:self.start - self.base]
+            self.base = self.start
+            self._share_colors()
+
+    def _share_colors(self):
+        """
+        Gives the collection the colors from the base slot to the end of the arrays, and keeps the array it made
+        out of them (get_edgecolor is that array, not a copy), so new colors are written straight into it.
+        The colors past the last path aren't drawn. The paths list is edited in place the same way,
+        test_collection_arrays_are_shared fails if a matplotlib version stops handing out the real ones.
+        """
+        self.collection.set_color(self.colors[self.base:])
+        # this settles how the collection is colored, or else its first draw would make the colors again
+        self.collection.update_scalarmappable()
+        self.shown = self.collection.get_edgecolor()
+
+    def _make_room(self):
+        """Called when the end of the arrays is reached."""
+        if self.max_length is None:
+            # unbounded: doubling the arrays so growing stays O(1) on average
+            self.segments = np.concatenate((self.segments, np.empty_like(self.segments)))
+            self.colors = np.concatenate((self.colors, np.zeros_like(self.colors)))
+            self._share_colors()
+            return
+
+        # bounded: sliding the live half back to the front of the arrays
+        count = self.end - self.start
+        self.segments[:count] = self.segments[self.start:self.end]
+        self.colors[:count] = self.colors[self.start:self.end]
+        self.start = 0
+        self.end = count
+        self.base = 0
+
+        # the paths pointed into the old slots so they have to point to the new ones
+        self.collection.get_paths()[:] = [Path(segment) for segment in self.segments[:count]]
+        self._share_colors()
+
+    def get_artists(self) -> tuple:
+        """The artists that need to be redrawn each frame."""
+        return self.collection,
@@ -0,0 +1,56 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from pure_pursuit import Routine, WaypointArray
+from pure_pursuit.visualization import animate
+
+
+class FakeTelemetry:
+    """Hands out one command that teleports whatever it's applied to."""
+
+    def __init__(self):
+        self.applied_to = []
+        self.thrown_away = 0
+        self.published = []
+
+    def apply(self, robot):
+        self.applied_to.append(robot)
+        robot.x = 100
+        return 1
+
+    def commands(self):
+        self.thrown_away += 1
+        return [{"x": 100}]
+
+    def publish(self, state):
+        self.published.append(state)
+
+
+def frame(animation, telemetry):
+    return animate.updateFrame(0, animation.ax, animation.robot, animation.trail, animation.drawn_path,
+                               loop=animation.loop, telemetry=telemetry)
+
+
+def test_telemetry_moves_the_simulated_robot():
+    animation = animate.Animation()
+    telemetry = FakeTelemetry()
+    frame(animation, telemetry)
+    assert telemetry.applied_to == [animation.robot]
+    plt.close(animation.fig)
+
+
+def test_telemetry_is_ignored_by_routines(tmp_path):
+    routine = Routine([WaypointArray([[0, 0, 0, -1], [1, 1, 0, -1]], closed=False)])
+    animation = animate.Animation(routine=routine, routine_cache=str(tmp_path))
+    telemetry = FakeTelemetry()
+    frame(animation, telemetry)
+
+    # the commands are drained without touching the robot, and the published state is the routine's
+    assert telemetry.applied_to == [] and telemetry.thrown_away == 1
+    assert animation.robot.x != 100
+    assert np.allclose(telemetry.published[-1][1:3], animation.loop.interpolated()[1:3])
+    plt.close(animation.fig)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from pure_pursuit import BatchPurePursuit, BatchSimulator, PurePursuit, RobotModel, Simulator, WaypointArray
+from pure_pursuit.path import path as default_path
+
+
+def test_robots_follow_their_own_paths():
+    open_path = WaypointArray([[0, 0, 0, -1], [0, 2, 0, -1], [2, 3, 0, 0], [3, 5, 0, -1]], closed=False)
+    paths = [default_path, open_path]
+    batch = BatchSimulator(4, velocity=0, turn_velocity=0, paths=paths, path_ids=[0, 1, 1, 0], dt=1 / 200,
+                           controller=BatchPurePursuit(speed=8, laps=1))
+    batch.run(60)
+    assert batch.controller.finished(batch).all()
+
+    # they end up where a single robot following the same path does, at about the same time
+    for index, path in enumerate(paths):
+        robot = RobotModel(velocity=0, turn_velocity=0)
+        states = Simulator(robot, dt=1 / 200, controller=PurePursuit(path, 0.5, speed=8, laps=1)).run(60)
+        for robot_index in np.flatnonzero(batch.path_ids == index):
+            assert np.hypot(*(states[-1, 1:3] - (batch.x[robot_index], batch.y[robot_index]))) < 0.1
+
+
+def test_robots_far_from_the_path_find_it():
+    rng = np.random.default_rng(0)
+    batch = BatchSimulator(50, x=rng.uniform(-5, 5, 50), y=rng.uniform(-3, 3, 50), velocity=0, turn_velocity=0,
+                           paths=[default_path], dt=1 / 100, controller=BatchPurePursuit(speed=8))
+    batch.run(10)
+    assert (batch.controller.cross_track_error < 0.2).all()
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from pure_pursuit import PathEditor, SplinePath, VelocityProfile, WaypointArray
+
+FIELDS = ("coords", "tangents", "curvature", "sources", "headings", "speeds", "vectors", "lengths", "arc_length",
+          "closed")
+
+
+def random_waypoints(rng, count, closed):
+    points = np.cumsum(rng.normal(size=(count, 2)), axis=0)
+    return WaypointArray(np.column_stack((points, rng.uniform(0, 360, count), rng.choice([-1, -1, -1, 5], count))),
+                         closed=closed)
+
+
+def assert_fresh(editor):
+    """The editor's spline and speeds are what working everything out again from scratch gives."""
+    fresh = SplinePath(editor.path, editor.spline.samples_per_segment, editor.spline.use_headings).sample()
+    geometry = editor.geometry
+    for name in FIELDS:
+        np.testing.assert_allclose(getattr(geometry, name), getattr(fresh, name), atol=1e-9, err_msg=name)
+
+    profile = VelocityProfile(editor.spline, editor.profile.max_velocity, editor.profile.max_acceleration,
+                              editor.profile.max_turn_velocity)
+    np.testing.assert_allclose(editor.profile.speeds, profile.compute(fresh), atol=1e-9)
+
+
+def edit(editor, rng, index):
+    operation = rng.integers(3)
+    x, y = editor.path.data["x"][index] + rng.normal(), editor.path.data["y"][index] + rng.normal()
+    if operation == 0:
+        editor.move(index, x, y)
+    elif operation == 1:
+        editor.insert(index, x, y)
+    elif len(editor) > 6:
+        editor.delete(index)
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("use_headings", [False, True])
+def test_random_edits_match_recompute(closed, use_headings):
+    rng = np.random.default_rng(22)
+    editor = PathEditor(random_waypoints(rng, 40, closed), samples_per_segment=8, use_headings=use_headings)
+    patched = 0
+    for _ in range(150):
+        edit(editor, rng, int(rng.integers(len(editor))))
+        patched += editor.last_patched
+        assert_fresh(editor)
+    # most of them shouldn't have needed the whole path worked out again
+    assert patched > 75
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("index", [0, 1, -2, -1])
+def test_edits_at_the_ends(closed, index):
+    # the first and last waypoints of an open path, and where a closed one wraps around
+    rng = np.random.default_rng([index % 4, closed])
+    editor = PathEditor(random_waypoints(rng, 20, closed), samples_per_segment=8)
+    for _ in range(20):
+        edit(editor, rng, index % len(editor))
+        assert_fresh(editor)
@@ -0,0 +1,32 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+from pure_pursuit import FieldMap, FOOTPRINTS
+from pure_pursuit.visualization.rendering import diffy_template, mecanum_template
+
+
+@pytest.mark.parametrize("drivetrain, template", [("diffy", diffy_template), ("mecanum", mecanum_template)])
+def test_footprint_covers_drawing(drivetrain, template):
+    # the spinning shapes are kept around their own centers
+    template = template()
+    points = (template.points + template.centers[:, None]).reshape(-1, 2)
+    width, length = FOOTPRINTS[drivetrain]
+    assert np.abs(points[:, 0]).max() <= width / 2 + 1e-9
+    assert np.abs(points[:, 1]).max() <= length / 2 + 1e-9
+
+
+@pytest.mark.parametrize("side", [1, -1])
+def test_mecanum_wheels_hit(side):
+    # the obstacle is past the mecanum body but where its wheels are
+    field = FieldMap()
+    field.add_circle((0.22 * side, 0), 0.01)
+    footprint = field.footprint(*FOOTPRINTS["mecanum"])
+
+    y = np.linspace(-2, 2, 81)
+    hits = field.check_trajectory(np.zeros_like(y), y, np.zeros_like(y), footprint)
+    assert hits.any() and not hits[0] and not hits[-1]
+    assert field.collides(0, 0, 0, footprint)
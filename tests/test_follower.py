@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from pure_pursuit import PurePursuit, RobotModel, Simulator, VelocityProfile, WaypointArray
+from pure_pursuit.path import path as default_path
+
+
+def follow(waypoints, use_profile=False, dt=1 / 200, duration=60):
+    robot = RobotModel(velocity=0, turn_velocity=0)
+    profile = VelocityProfile.for_robot(waypoints, robot) if use_profile else None
+    controller = PurePursuit(waypoints, 0.5, speed=8, laps=1, profile=profile)
+    states = Simulator(robot, dt=dt, controller=controller).run(duration)
+    return controller.finished(robot), states
+
+
+@pytest.mark.parametrize("use_profile", [False, True])
+def test_speed_zero_waypoint_is_passed(use_profile):
+    waypoints = WaypointArray.from_path(default_path)
+    waypoints.data["speed"][18] = 0
+    finished, states = follow(waypoints, use_profile)
+    assert finished
+
+    # it slows right down at the waypoint
+    near = np.hypot(states[:, 1] - waypoints.data["x"][18], states[:, 2] - waypoints.data["y"][18]) < 0.1
+    assert states[near, 4].min() < 2
+
+
+def test_slows_down_along_segment():
+    waypoints = WaypointArray([[0, 0, 0, 10], [0, 4, 0, 2]], closed=False)
+    robot = RobotModel(velocity=0, turn_velocity=0)
+    controller = PurePursuit(waypoints, 0.5)
+    controller.engine.update(0, 2)
+    # halfway along, v^2 is halfway between the two speeds'
+    assert np.isclose(controller.target_speed(robot), np.sqrt((10 ** 2 + 2 ** 2) / 2), atol=0.5)
+
+
+@pytest.mark.parametrize("integrator", ["euler", "arc"])
+def test_lap_time_does_not_depend_on_dt(integrator):
+    def lap_time(dt):
+        robot = RobotModel(velocity=0, turn_velocity=0, integrator=integrator)
+        controller = PurePursuit(default_path, 0.5, speed=8, laps=1)
+        states = Simulator(robot, dt=dt, controller=controller).run(60)
+        assert controller.finished(robot)
+        return states[-1, 0]
+
+    small = lap_time(0.005)
+    assert abs(lap_time(0.1) - small) < 0.12 * small
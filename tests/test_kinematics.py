@@ -0,0 +1,73 @@
+import numpy as np
+
+from pure_pursuit import BatchSimulator, RobotModel, arc_step, clothoid_displacement
+
+
+def drive(integrator, dt, duration=3.0, acceleration=0.3, turn_acceleration=0.02):
+    robot = RobotModel(velocity=2, turn_velocity=0.5, integrator=integrator)
+    for _ in range(int(round(duration / dt))):
+        robot.acceleration = acceleration
+        robot.turn_acceleration = turn_acceleration
+        robot.step(dt)
+    return np.array(robot.get_state()[1:])
+
+
+def test_clothoid_matches_numerical_integral():
+    velocity, acceleration, angle, turn, turn_acceleration, frames = 2, 0.3, 10, 0.5, 0.02, 30
+    t = np.linspace(0, frames, 400001)
+    radians = np.radians(angle + turn * t + turn_acceleration * t ** 2 / 2)
+    speed = (velocity + acceleration * t) / 100
+    expected = np.trapezoid(-speed * np.sin(radians), t), np.trapezoid(speed * np.cos(radians), t)
+    assert np.allclose(clothoid_displacement(velocity, acceleration, angle, turn, turn_acceleration, frames),
+                       expected, atol=1e-9)
+
+
+def test_arc_does_not_depend_on_dt():
+    # turning faster and faster and speeding up until the maximum velocity
+    small = drive("arc", 0.005)
+    for dt in (0.03, 0.1, 0.5):
+        assert np.allclose(drive("arc", dt), small, atol=1e-9)
+    # and it's where euler ends up with tiny steps
+    assert np.allclose(drive("euler", 1e-4)[:2], small[:2], atol=1e-3)
+
+
+def test_arc_hits_turn_limit_mid_step():
+    dx, dy, velocity, turn_velocity, angle = arc_step(10, 0, 0, 3, 1, 2, 20, 3.35)
+    # turns at 3 + t until 0.35 frames in, then at 3.35
+    assert turn_velocity == 3.35
+    assert np.isclose(angle, 3 * 0.35 + 0.35 ** 2 / 2 + 3.35 * 1.65)
+    halves = arc_step(10, 0, 0, 3, 1, 1, 20, 3.35)
+    rest = arc_step(halves[2], 0, halves[4], halves[3], 1, 1, 20, 3.35)
+    assert np.allclose((halves[0] + rest[0], halves[1] + rest[1], rest[4]), (dx, dy, angle))
+
+
+def test_batch_matches_models():
+    models = [RobotModel(x=i, velocity=3 + i, turn_velocity=0.2 * i - 1, integrator="arc") for i in range(5)]
+    batch = BatchSimulator.from_models([RobotModel(x=i, velocity=3 + i, turn_velocity=0.2 * i - 1, integrator="arc")
+                                        for i in range(5)], dt=0.05)
+    accelerations = np.linspace(-1, 1, 5)
+    for _ in range(100):
+        batch.acceleration[:] = accelerations
+        batch.turn_acceleration[:] = accelerations / 3
+        batch.step()
+        for model, acceleration in zip(models, accelerations):
+            model.acceleration = acceleration
+            model.turn_acceleration = acceleration / 3
+            model.step(0.05)
+    for index, model in enumerate(models):
+        assert np.allclose(model.get_state(), batch.get_state()[:, index])
+
+
+def test_over_limit_turn_velocity_is_clamped():
+    # set from outside (like a telemetry command) above the maximum, both ways, with no turn acceleration
+    for turn_velocity in (10, -10):
+        ends = {}
+        for integrator, dt in (("arc", 0.25), ("euler", 1e-4)):
+            robot = RobotModel(velocity=5, turn_velocity=turn_velocity, integrator=integrator)
+            for _ in range(int(round(1 / dt))):
+                robot.acceleration = robot.turn_acceleration = 0
+                robot.step(dt)
+            ends[integrator] = np.array(robot.get_state()[1:])
+        assert np.isclose(ends["arc"][5], np.sign(turn_velocity) * 3.35)
+        assert np.allclose(ends["arc"][:2], ends["euler"][:2], atol=1e-3)
+        assert np.isclose(ends["arc"][4], ends["euler"][4], atol=0.1)
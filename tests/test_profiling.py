@@ -0,0 +1,29 @@
+import pytest
+
+from pure_pursuit.visualization import profiling
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake perf_counter_ns that only moves when it's told to."""
+    now = [0]
+    monkeypatch.setattr(profiling, "perf_counter_ns", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize("frames", [3, 4, 5, 11])
+def test_percentiles_only_use_finished_frames(clock, frames):
+    profiler = profiling.FrameProfiler(window=4)
+    for _ in range(frames):
+        profiler.start()
+        for phase in profiling.PHASES:
+            clock[0] += 1_000_000
+            profiler.mark(phase)
+    # the last frame is still in progress
+    assert profiler.frames == frames - 1
+
+    percentiles = profiler.percentiles(q=(0, 50, 100))
+    for phase in profiling.PHASES:
+        assert percentiles[phase] == {"p0": 1.0, "p50": 1.0, "p100": 1.0}
+    assert percentiles["frame"]["p0"] == 4.0
+    assert profiler.summary()["window"] == 4
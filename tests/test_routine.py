@@ -0,0 +1,47 @@
+import numpy as np
+
+from pure_pursuit import Routine, WaypointArray
+from pure_pursuit.kinematics import RobotModel
+
+
+def travelled(rows):
+    """How far the robot went between rows, next to how far the velocity column says it went."""
+    distances = np.hypot(*np.diff(rows[:, 1:3], axis=0).T)
+    expected = (rows[1:, 4] + rows[:-1, 4]) / 2 / 100 * RobotModel.FPS * np.diff(rows[:, 0])
+    return distances, expected
+
+
+def test_two_point_path():
+    rows = Routine([WaypointArray([[0, 0, 0, -1], [1, 0, 0, -1]], closed=False)]).compile()
+
+    # speeds up as fast as it can and slows down again: 2 sqrt(L / a) seconds
+    acceleration = RobotModel.FPS ** 2 / 100
+    assert np.isclose(rows[-1, 0], 2 * np.sqrt(1 / acceleration))
+    assert rows[0, 4] == 0 and rows[-1, 4] < 1e-9
+    assert np.allclose(rows[-1, 1:3], (1, 0))
+    assert rows[:, 4].max() <= 20
+
+    distances, expected = travelled(rows)
+    assert np.allclose(distances, expected, atol=1e-3)
+
+
+def test_stops_at_speed_zero_waypoint():
+    waypoints = [[0, 0, 0, -1], [1, 0, 0, 0], [2, 1, 0, -1], [3, 0, 0, -1]]
+    for spline in (False, True):
+        rows = Routine([WaypointArray(waypoints, closed=False)], spline=spline).compile()
+        assert np.isfinite(rows).all()
+        assert rows[-1, 0] < 30
+        assert np.allclose(rows[-1, 1:3], (3, 0))
+
+        # it stops on the waypoint
+        stopped = np.flatnonzero(np.hypot(rows[:, 1] - 1, rows[:, 2]) < 1e-2)
+        assert len(stopped) and rows[stopped, 4].min() < 0.5
+
+
+def test_only_stopping_points():
+    # every waypoint is speed 0, so every segment starts and ends stopped
+    rows = Routine([WaypointArray([[0, 0, 0, 0], [1, 0, 0, 0], [1, 1, 0, 0]], closed=False)]).compile()
+    assert np.isfinite(rows).all()
+    assert np.allclose(rows[-1, 1:3], (1, 1))
+    distances, expected = travelled(rows)
+    assert np.allclose(distances, expected, atol=1e-3)
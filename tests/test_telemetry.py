@@ -0,0 +1,121 @@
+import asyncio
+import subprocess
+import sys
+
+from pure_pursuit import RobotModel, telemetry
+from pure_pursuit.telemetry import TelemetryBridge, TelemetryClient
+
+
+class FakeTransport:
+    def __init__(self, fail_for=()):
+        self.sent = []
+        self.fail_for = fail_for
+
+    def sendto(self, message, peer):
+        if peer in self.fail_for:
+            raise OSError("unreachable")
+        self.sent.append((message, peer))
+
+
+def bridge_with(transport, **kwargs):
+    bridge = TelemetryBridge(**kwargs)
+    bridge._transport = transport
+    return bridge
+
+
+def test_oversized_batches_are_split(monkeypatch):
+    monkeypatch.setattr(telemetry, "MAX_DATAGRAM", 1500)
+    transport = FakeTransport()
+    bridge = bridge_with(transport, peers=[("127.0.0.1", 1)], batch_size=64)
+    for index in range(100):
+        bridge.publish([index] * 9)
+    bridge._flush()
+
+    assert bridge.sent == 100 and bridge.errors == 0
+    assert all(len(message) <= 1500 for message, _ in transport.sent)
+    received = [state for message, _ in transport.sent for batch in telemetry.decode(message)
+                for state in batch["states"]]
+    assert [state[0] for state in received] == list(range(100))
+
+
+def test_errors_are_logged_not_raised(monkeypatch, caplog):
+    monkeypatch.setattr(telemetry, "MAX_DATAGRAM", 10)
+    bridge = bridge_with(FakeTransport(), peers=[("127.0.0.1", 1)])
+    bridge.publish([0] * 9)
+    bridge._flush()
+    assert bridge.errors == 1 and bridge.sent == 0
+    assert "couldn't send" in caplog.text
+
+    # and it keeps going afterwards
+    monkeypatch.setattr(telemetry, "MAX_DATAGRAM", 60000)
+    bridge.publish([0] * 9)
+    bridge._flush()
+    assert bridge.sent == 1
+
+
+def test_round_trip():
+    async def run():
+        with TelemetryBridge(port=0, interval=0.01) as bridge:
+            client = await TelemetryClient(port=bridge.port).connect()
+            client.send(x=1, y=2)
+            for _ in range(100):
+                if bridge.inbox:
+                    break
+                await asyncio.sleep(0.01)
+            bridge.publish([0, 1, 2, 3, 4, 5, 6, 7, 8])
+            batch = await asyncio.wait_for(client.states(), 2)
+            client.close()
+            return bridge.commands(), batch
+
+    commands, batch = asyncio.run(run())
+    assert commands == [{"x": 1.0, "y": 2.0}]
+    assert batch["states"] == [[0, 1, 2, 3, 4, 5, 6, 7, 8]]
+
+
+def test_quiet_peers_expire(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(telemetry.time, "monotonic", lambda: clock[0])
+    bridge = bridge_with(FakeTransport(), peers=[("127.0.0.1", 1)], peer_timeout=5, max_peers=3)
+
+    bridge._receive(b'{"type":"hello"}\n', ("10.0.0.1", 2))
+    clock[0] += 3
+    bridge._receive(b'{"type":"hello"}\n', ("10.0.0.2", 2))
+    clock[0] += 3
+    bridge._flush()
+    assert list(bridge.peers) == [("127.0.0.1", 1), ("10.0.0.2", 2)]
+
+    # the fixed peers never expire
+    clock[0] += 60
+    bridge._flush()
+    assert list(bridge.peers) == [("127.0.0.1", 1)]
+
+
+def test_peers_are_capped():
+    bridge = bridge_with(FakeTransport(), peers=[("127.0.0.1", 1)], max_peers=3)
+    for port in range(10):
+        bridge._receive(b'{"type":"hello"}\n', ("10.0.0.1", port))
+        # hearing from the first one again keeps it around
+        bridge._receive(b'{"type":"hello"}\n', ("10.0.0.1", 0))
+    assert list(bridge.peers) == [("127.0.0.1", 1), ("10.0.0.1", 8), ("10.0.0.1", 9), ("10.0.0.1", 0)]
+
+
+def test_commands_are_finite_and_clamped():
+    bridge = TelemetryBridge()
+    bridge._receive(b'{"type":"command","x":NaN,"y":Infinity,"heading":-Infinity,"velocity_angle":45}\n')
+    bridge._receive(b'{"type":"command","velocity":1e9,"turn_velocity":-50,"acceleration":-3,'
+                    b'"turn_acceleration":0.5}\n')
+    robot = RobotModel(x=1, y=2, heading=30)
+    assert bridge.apply(robot) == 2
+
+    assert (robot.x, robot.y, robot.heading, robot.velocity_angle) == (1, 2, 30, 45)
+    assert robot.velocity == robot.MAX_VELOCITY
+    assert robot.turn_velocity == -robot.MAX_TURN_VELOCITY
+    assert robot.acceleration == -robot.MAX_ACCELERATION
+    assert robot.turn_acceleration == 0.5
+
+
+def test_package_import_leaves_out_asyncio():
+    # a fresh interpreter, since this one already imported it
+    loaded = subprocess.run([sys.executable, "-c", "import sys, pure_pursuit; print('asyncio' in sys.modules)"],
+                            capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == "False"
@@ -0,0 +1,89 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.collections import LineCollection
+
+from pure_pursuit.visualization.trail import Trail, velocity_colormap
+
+
+def render(fig, collection):
+    """The pixels of the figure with only one collection on it."""
+    ax = fig.axes[0]
+    for other in list(ax.collections):
+        other.set_visible(other is collection)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+@pytest.mark.parametrize("max_length, ring", [(None, False), (50, False), (50, True), (7, False), (1, False)])
+def test_draws_the_live_segments(max_length, ring):
+    fig, ax = plt.subplots(figsize=(3, 3), dpi=50)
+    ax.set_xlim(-2, 2)
+    ax.set_ylim(-2, 2)
+    trail = Trail(ax, velocity_colormap(), max_length=max_length, ring=ring, capacity=16, linewidth=3)
+
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.normal(0, 0.1, (333, 2)), axis=0)
+    values = rng.uniform(0, 1, len(points))
+    for count, (point, value) in enumerate(zip(points, values), 1):
+        trail.add_point(*point, value)
+        if count % 111:
+            continue
+
+        # what should be drawn: the last max_length segments, in order
+        starts = np.concatenate(([(0, 0)], points[:count - 1]))
+        segments = np.stack((starts, points[:count]), axis=1)
+        colors = trail.lut[np.clip((values[:count] * (len(trail.lut) - 1)).astype(int), 0, len(trail.lut) - 1)]
+        if max_length is not None:
+            segments, colors = segments[-max_length:], colors[-max_length:]
+        if ring:
+            # ring mode draws them in slot order
+            order = np.argsort(np.arange(count)[-max_length:] % max_length)
+            segments, colors = segments[order], colors[order]
+        expected = LineCollection(segments, colors=colors, linewidth=3)
+        ax.add_collection(expected)
+
+        assert len(trail) == len(segments)
+        assert np.array_equal(render(fig, trail.collection), render(fig, expected))
+        expected.remove()
+        trail.collection.set_visible(True)
+    plt.close(fig)
+
+
+def test_reset():
+    fig, ax = plt.subplots()
+    trail = Trail(ax, velocity_colormap(), max_length=10)
+    for index in range(30):
+        trail.add_point(index, index, 0.5)
+    trail.reset(0, 0)
+    assert len(trail) == 0 and len(trail.collection.get_paths()) == 0
+    trail.add_point(1, 1, 0)
+    assert len(trail.collection.get_paths()) == 1
+    assert np.allclose(trail.collection.get_edgecolor()[0], trail.lut[0])
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("max_length, ring", [(None, False), (10, False), (10, True)])
+def test_collection_arrays_are_shared(max_length, ring):
+    # the trail writes straight into the collection's color array and paths list instead of setting them,
+    # which only works while matplotlib hands out those and not copies (and doesn't make them again when drawing)
+    fig, ax = plt.subplots()
+    trail = Trail(ax, velocity_colormap(), max_length=max_length, ring=ring, capacity=4)
+    paths = trail.collection.get_paths()
+    for index in range(25):
+        trail.add_point(index, index, index / 25)
+        fig.canvas.draw()
+        assert trail.collection.get_edgecolor() is trail.shown
+        assert trail.collection.get_paths() is paths
+
+    # and what's drawn is what was written after the last draw
+    trail.add_point(30, 30, 1)
+    fig.canvas.draw()
+    newest = trail.start - 1 if ring else len(trail.collection.get_paths()) - 1
+    assert np.allclose(trail.collection.get_edgecolor()[newest], trail.lut[-1])
+    assert np.allclose(trail.collection.get_paths()[newest].vertices[-1], (30, 30))
+    plt.close(fig)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from pure_pursuit import SplinePath, VelocityProfile, WaypointArray
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("scale, count, max_acceleration", [(1, 60, 1), (3, 200, 5), (1, 20, 0.1)])
+def test_patch_matches_compute(closed, scale, count, max_acceleration):
+    rng = np.random.default_rng(count)
+    points = np.cumsum(rng.normal(size=(count, 2)) * scale, axis=0)
+    waypoints = WaypointArray(np.column_stack((points, np.zeros(count), rng.choice([-1, -1, -1, 5], count))),
+                              closed=closed)
+    spline = SplinePath(waypoints, 16)
+    settings = {"max_acceleration": max_acceleration, "start_speed": None if closed else 0, "end_speed": 2}
+    profile = VelocityProfile(spline, **settings)
+    profile.speeds
+
+    patched = 0
+    for _ in range(100):
+        index = int(rng.integers(len(waypoints)))
+        operation = rng.integers(3)
+        if operation == 0:
+            waypoints.data["x"][index] += rng.normal() * scale
+            waypoints.changed()
+            changed = spline.resample(index, 1, 1)
+        elif operation == 1:
+            waypoints.insert(index, (waypoints.data["x"][index] + 0.3, waypoints.data["y"][index], 0, -1))
+            changed = spline.resample(index, 0, 1)
+        elif len(waypoints) > 6:
+            del waypoints[index]
+            changed = spline.resample(index, 1, 0)
+        else:
+            continue
+
+        geometry = spline.geometry
+        if changed is not None:
+            patched += profile.patch(geometry, *changed)
+        expected = VelocityProfile(spline, **settings).compute(geometry)
+        np.testing.assert_allclose(profile.speeds, expected, atol=1e-9)
+
+    # a slow robot on a short path can change the speeds all along it, so that one is rarely patched
+    if count > 20:
+        assert patched > 50